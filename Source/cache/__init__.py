@@ -0,0 +1,17 @@
+"""
+Cache package for code review.
+Provides on-disk caches that let repeated runs skip work already done.
+"""
+
+from .store import SQLiteStore
+from .review_cache import ReviewCache, ReviewCacheKey, ruleset_digest, content_id
+from .response_cache import ResponseCache
+
+__all__ = [
+    'SQLiteStore',
+    'ReviewCache',
+    'ReviewCacheKey',
+    'ruleset_digest',
+    'content_id',
+    'ResponseCache',
+]
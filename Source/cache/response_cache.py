@@ -0,0 +1,77 @@
+"""
+Content-addressed cache of LLM responses keyed by the exact request.
+"""
+
+import hashlib
+import json
+from typing import Dict, Any, List, Optional
+from .store import SQLiteStore
+from .review_cache import canonical_json
+
+DEFAULT_TTL = 7 * 24 * 3600
+
+class ResponseCache:
+    """
+    On-disk cache of LLM responses.
+    
+    Sits below the ReviewCache: where that one is keyed by what was
+    reviewed, this one is keyed by what was sent (provider, model,
+    temperature, the canonical JSON of the messages, and the endpoint and
+    other request options such as max_tokens), so any identical request is
+    answered from disk. Stored responses keep the token usage and
+    cost of the original call, so cache hits can be reported as saved spend.
+    """
+    
+    def __init__(self, path: str = ".codereview/cache/responses.sqlite", ttl: Optional[float] = DEFAULT_TTL,
+                 max_bytes: int = 256 * 1024 * 1024):
+        """
+        Open the cache.
+        
+        Args:
+            path: SQLite database file, safe to share between processes
+            ttl: Seconds a response stays valid; None never expires
+            max_bytes: Total size of stored responses before LRU eviction
+        """
+        self._store = SQLiteStore(path, max_bytes, ttl=ttl)
+        self.hits = 0
+        self.misses = 0
+        
+    @staticmethod
+    def key(provider: str, model: str, temperature: float, messages: List[Dict[str, Any]],
+            options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Digest of everything that determines a response.
+        
+        Args:
+            options: Endpoint and request settings besides the messages
+                (``BaseBackend.request_options``)
+        """
+        request = {'provider': provider, 'model': model, 'temperature': temperature, 'messages': messages,
+                   'options': options or {}}
+        return hashlib.sha256(canonical_json(request).encode('utf-8')).hexdigest()
+        
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a stored response.
+        
+        Returns:
+            The response dict, or None on a miss or expired entry
+        """
+        value = self._store.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+        
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        """Store a successful response with its original usage and cost."""
+        self._store.put(key, canonical_json(response).encode('utf-8'))
+        
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counts and store size."""
+        return {'hits': self.hits, 'misses': self.misses, **self._store.stats()}
+        
+    def close(self) -> None:
+        """Close the underlying store."""
+        self._store.close()
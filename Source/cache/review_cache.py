@@ -0,0 +1,151 @@
+"""
+Persistent cache of review findings keyed by content, rule set and model.
+"""
+
+import json
+import hashlib
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional
+from .store import SQLiteStore
+from ..utils.hashing import digest_text
+
+def canonical_json(value: Any) -> str:
+    """Serialize a value with sorted keys and no whitespace, for hashing."""
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    
+def ruleset_digest(rules: List[Dict[str, Any]]) -> str:
+    """
+    Digest the rules resolved for a path, independent of their order.
+    
+    Args:
+        rules: Rule definitions (dicts with at least an 'id')
+        
+    Returns:
+        str: Hex digest
+    """
+    ordered = sorted(rules, key=lambda rule: str(rule.get('id', '')))
+    return digest_text(canonical_json(ordered))
+    
+def content_id(context: Dict[str, Any]) -> str:
+    """
+    Identify the reviewed content of a context.
+    
+    Uses the Git blob id or file digest when the collector provided one, and
+    only hashes the content otherwise. Diff contexts also include their hunks,
+    since the same blob reviewed against a different base is a different
+    review, and windowed contexts their window ranges, since pieces of one
+    file share its digest. Directory batches are identified by the path,
+    position and content of every file.
+    
+    Args:
+        context: Context built by one of the context builders
+        
+    Returns:
+        str: Content identifier
+    """
+    if context.get('review_type') == 'directory':
+        files = [
+            [f['file'], f.get('start_line', 1), f.get('digest') or digest_text(f.get('content') or '')]
+            for f in context['files']
+        ]
+        return f"dir:{digest_text(canonical_json(files))}"
+        
+    base = context.get('blob_id') or context.get('digest')
+    windows = context.get('windows')
+    if base is None:
+        base = digest_text(context.get('full_content') or context.get('content') or '')
+        if windows:
+            base = f"{base}:{digest_text(''.join(w['content'] for w in windows))}"
+    if windows:
+        base = f"{base}:{digest_text(canonical_json([[w['start_line'], w['end_line']] for w in windows]))}"
+    changes = context.get('changes')
+    if changes:
+        base = f"{base}:{digest_text(canonical_json(changes.get('hunks', [])))}"
+    return base
+    
+@dataclass(frozen=True)
+class ReviewCacheKey:
+    """Everything that determines the findings of one review unit."""
+    content_id: str
+    ruleset_digest: str
+    provider: str
+    model: str
+    prompt_version: str
+    
+    def digest(self) -> str:
+        """Stable key used in the store."""
+        return hashlib.sha256(canonical_json(asdict(self)).encode('utf-8')).hexdigest()
+        
+    @classmethod
+    def for_context(cls, context: Dict[str, Any], rules: List[Dict[str, Any]],
+                    provider: str, model: str, prompt_version: str) -> 'ReviewCacheKey':
+        """Build the key for a context reviewed against rules by provider/model."""
+        return cls(
+            content_id=content_id(context),
+            ruleset_digest=ruleset_digest(rules),
+            provider=provider,
+            model=model,
+            prompt_version=prompt_version
+        )
+        
+class ReviewCache:
+    """
+    On-disk cache of findings per review unit.
+    
+    A hit means the unit's content, resolved rule set, provider/model and
+    prompt version are all unchanged, so its stored findings can be replayed
+    instead of calling the LLM.
+    """
+    
+    def __init__(self, path: str = ".codereview/cache/reviews.sqlite", max_bytes: int = 256 * 1024 * 1024):
+        """
+        Open the cache.
+        
+        Args:
+            path: SQLite database file
+            max_bytes: Total size of stored findings before LRU eviction
+        """
+        self._store = SQLiteStore(path, max_bytes)
+        self.hits = 0
+        self.misses = 0
+        
+    def get(self, key: ReviewCacheKey) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up stored findings.
+        
+        Returns:
+            List of finding dicts, or None on a miss
+        """
+        value = self._store.get(key.digest())
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+        
+    def put(self, key: ReviewCacheKey, findings: List[Dict[str, Any]]) -> None:
+        """Store the findings of a completed review."""
+        self._store.put(key.digest(), canonical_json(findings).encode('utf-8'))
+        
+    def replay(self, key: ReviewCacheKey, file_path: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up stored findings and attribute them to file_path.
+        
+        The same content may have been reviewed under another path (e.g.
+        before a rename), so each finding's 'file' is rewritten.
+        
+        Returns:
+            List of finding dicts, or None on a miss
+        """
+        findings = self.get(key)
+        if findings is None:
+            return None
+        return [{**finding, 'file': file_path} for finding in findings]
+        
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counts and store size."""
+        return {'hits': self.hits, 'misses': self.misses, **self._store.stats()}
+        
+    def close(self) -> None:
+        """Close the underlying store."""
+        self._store.close()
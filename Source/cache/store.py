@@ -0,0 +1,151 @@
+"""
+SQLite-backed key/value store with size-based LRU eviction.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Dict, Any
+
+class SQLiteStore:
+    """
+    Persistent byte store shared by the on-disk caches.
+    
+    Entries are evicted least-recently-used first once their total size
+    exceeds ``max_bytes``, and expire ``ttl`` seconds after they were
+    written if a TTL is set. The database runs in WAL mode, so several
+    processes can read and write the same file concurrently.
+    """
+    
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, ttl: Optional[float] = None):
+        """
+        Open (or create) a store.
+        
+        Args:
+            path: SQLite database file
+            max_bytes: Total size of stored values before eviction starts
+            ttl: Seconds an entry stays valid after it is written; None keeps
+                entries until they are evicted
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            ' key TEXT PRIMARY KEY,'
+            ' value BLOB NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' created_at REAL NOT NULL,'
+            ' accessed_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS entries_created ON entries (created_at)')
+        # Running total of entries.size, kept by triggers so writers never scan the table
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS meta ('
+                ' id INTEGER PRIMARY KEY CHECK (id = 0),'
+                ' total_bytes INTEGER NOT NULL)'
+            )
+            self._conn.execute(
+                'INSERT OR IGNORE INTO meta (id, total_bytes) SELECT 0, COALESCE(SUM(size), 0) FROM entries'
+            )
+            self._conn.execute(
+                'CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN'
+                ' UPDATE meta SET total_bytes = total_bytes + NEW.size WHERE id = 0; END'
+            )
+            self._conn.execute(
+                'CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN'
+                ' UPDATE meta SET total_bytes = total_bytes - OLD.size WHERE id = 0; END'
+            )
+            self._conn.execute(
+                'CREATE TRIGGER IF NOT EXISTS entries_resize AFTER UPDATE OF size ON entries BEGIN'
+                ' UPDATE meta SET total_bytes = total_bytes - OLD.size + NEW.size WHERE id = 0; END'
+            )
+            self._conn.execute('COMMIT')
+        except Exception:
+            self._conn.execute('ROLLBACK')
+            raise
+            
+            
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up a value and mark it as recently used.
+        
+        Returns:
+            The stored bytes, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute('SELECT value, created_at FROM entries WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            if self.ttl is not None and now - row[1] > self.ttl:
+                self._conn.execute('DELETE FROM entries WHERE key = ? AND created_at = ?', (key, row[1]))
+                return None
+            self._conn.execute('UPDATE entries SET accessed_at = ? WHERE key = ?', (now, key))
+            return row[0]
+            
+    def put(self, key: str, value: bytes) -> None:
+        """Store a value, evicting least-recently-used entries if over budget."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                # An upsert rather than INSERT OR REPLACE, whose implicit delete skips the triggers
+                self._conn.execute(
+                    'INSERT INTO entries (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)'
+                    ' ON CONFLICT (key) DO UPDATE SET value = excluded.value, size = excluded.size,'
+                    ' created_at = excluded.created_at, accessed_at = excluded.accessed_at',
+                    (key, value, len(value), now, now)
+                )
+                self._evict(now)
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+                
+    def delete(self, key: str) -> None:
+        """Remove a value if present."""
+        with self._lock:
+            self._conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+            
+    def _evict(self, now: float) -> None:
+        """Delete expired entries, then least-recently-used ones until the total size fits."""
+        if self.ttl is not None:
+            self._conn.execute('DELETE FROM entries WHERE created_at < ?', (now - self.ttl,))
+        total = self._total()
+        while total > self.max_bytes:
+            rows = self._conn.execute('SELECT key, size FROM entries ORDER BY accessed_at LIMIT 64').fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+                total -= size
+            
+    def _total(self) -> int:
+        return self._conn.execute('SELECT total_bytes FROM meta WHERE id = 0').fetchone()[0]
+        
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of entries and their total size."""
+        with self._lock:
+            count = self._conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+            total = self._total()
+        return {'entries': count, 'bytes': total, 'max_bytes': self.max_bytes, 'ttl': self.ttl}
+        
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,47 @@
+import multiprocessing
+import time
+from ..response_cache import ResponseCache
+
+MESSAGES = [{'role': 'system', 'content': 'rules'}, {'role': 'user', 'content': 'x = 1'}]
+RESPONSE = {'findings': [], 'tokens_prompt': 120, 'tokens_completion': 8, 'cost_usd': 0.001, 'cached_tokens': None}
+
+def test_key_covers_request_parameters():
+    key = ResponseCache.key('openai', 'gpt-4o', 0.0, MESSAGES)
+    
+    assert key == ResponseCache.key('openai', 'gpt-4o', 0.0, [dict(reversed(list(m.items()))) for m in MESSAGES])
+    assert key != ResponseCache.key('openai', 'gpt-4o', 0.2, MESSAGES)
+    assert key != ResponseCache.key('openai', 'gpt-4o-mini', 0.0, MESSAGES)
+    assert key != ResponseCache.key('local', 'gpt-4o', 0.0, MESSAGES)
+    assert key != ResponseCache.key('openai', 'gpt-4o', 0.0, MESSAGES, {'endpoint': 'http://proxy/v1/chat/completions'})
+    
+def test_round_trip_and_ttl(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'responses.sqlite'), ttl=0.2)
+    key = ResponseCache.key('openai', 'gpt-4o', 0.0, MESSAGES)
+    cache.put(key, RESPONSE)
+    
+    assert cache.get(key) == RESPONSE
+    time.sleep(0.3)
+    assert cache.get(key) is None
+    assert cache.stats()['entries'] == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+    
+def write_entries(path, worker):
+    cache = ResponseCache(path)
+    for i in range(25):
+        key = ResponseCache.key('openai', 'gpt-4o', 0.0, [{'role': 'user', 'content': str(i)}])
+        cache.put(key, {**RESPONSE, 'tokens_prompt': i})
+        assert cache.get(key)['tokens_prompt'] == i
+    cache.close()
+    
+def test_concurrent_writers(tmp_path):
+    path = str(tmp_path / 'responses.sqlite')
+    ResponseCache(path).close()
+    context = multiprocessing.get_context('fork')
+    workers = [context.Process(target=write_entries, args=(path, worker)) for worker in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(30)
+        
+    assert [worker.exitcode for worker in workers] == [0] * 4
+    assert ResponseCache(path).stats()['entries'] == 25
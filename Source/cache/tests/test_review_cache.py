@@ -0,0 +1,90 @@
+import sqlite3
+from ..review_cache import ReviewCache, ReviewCacheKey, ruleset_digest, content_id
+from ..store import SQLiteStore
+from ...context.splitter import split_context
+
+RULES = [
+    {'id': 'SEC-001', 'severity': 'error'},
+    {'id': 'STYLE-001', 'severity': 'warning'}
+]
+
+def make_key(context, model='gpt-4o'):
+    return ReviewCacheKey.for_context(context, RULES, 'openai', model, 'v1')
+    
+def test_ruleset_digest_ignores_rule_order():
+    assert ruleset_digest(RULES) == ruleset_digest(list(reversed(RULES)))
+    assert ruleset_digest(RULES) != ruleset_digest(RULES[:1])
+    
+def test_content_id_prefers_blob_id_and_includes_hunks():
+    file_context = {'file': 'a.py', 'full_content': 'x = 1', 'digest': 'abc'}
+    diff_context = {'file': 'a.py', 'blob_id': 'f00', 'changes': {'hunks': [{'start_line': 1}]}}
+    other_diff = {'file': 'a.py', 'blob_id': 'f00', 'changes': {'hunks': [{'start_line': 2}]}}
+    
+    assert content_id(file_context) == 'abc'
+    assert content_id(diff_context).startswith('f00:')
+    assert content_id(diff_context) != content_id(other_diff)
+    
+def test_content_id_of_directory_batches():
+    batch = {'review_type': 'directory', 'files': [{'file': 'a.py', 'content': 'a = 1'}]}
+    other = {'review_type': 'directory', 'files': [{'file': 'b.py', 'content': 'b = 1'}]}
+    
+    assert content_id(batch) != content_id(other)
+    assert content_id(batch) == content_id({'review_type': 'directory', 'files': [{'file': 'a.py', 'content': 'a = 1'}]})
+    
+def test_content_id_of_split_pieces():
+    content = ''.join(f"line_{i} = {i}\n" for i in range(1, 101))
+    context = {'file': 'a.py', 'language': 'python', 'full_content': content, 'digest': 'abc'}
+    first, second = split_context(context)
+    
+    assert len({content_id(context), content_id(first), content_id(second)}) == 3
+    assert content_id(first).startswith('abc:')
+    
+def test_hits_replay_findings_for_new_path(tmp_path):
+    cache = ReviewCache(str(tmp_path / 'reviews.sqlite'))
+    context = {'file': 'old/a.py', 'full_content': 'password = "x"'}
+    findings = [{'file': 'old/a.py', 'line': 1, 'rule_id': 'SEC-001', 'severity': 'error', 'message': 'secret'}]
+    
+    assert cache.get(make_key(context)) is None
+    cache.put(make_key(context), findings)
+    
+    moved = {'file': 'new/a.py', 'full_content': 'password = "x"'}
+    assert cache.replay(make_key(moved), 'new/a.py') == [{**findings[0], 'file': 'new/a.py'}]
+    assert cache.get(make_key(context, model='gpt-4o-mini')) is None
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 2
+    cache.close()
+    
+    reopened = ReviewCache(str(tmp_path / 'reviews.sqlite'))
+    assert reopened.get(make_key(context)) == findings
+    
+def test_store_evicts_least_recently_used(tmp_path):
+    store = SQLiteStore(str(tmp_path / 'store.sqlite'), max_bytes=25)
+    store.put('a', b'x' * 10)
+    store.put('b', b'x' * 10)
+    store.get('a')
+    store.put('c', b'x' * 10)
+    
+    assert store.get('a') is not None
+    assert store.get('b') is None
+    assert store.get('c') is not None
+    assert store.stats()['bytes'] == 20
+    
+def test_store_keeps_running_total_without_scanning(tmp_path):
+    store = SQLiteStore(str(tmp_path / 'store.sqlite'), max_bytes=100)
+    statements = []
+    store._conn.set_trace_callback(statements.append)
+    
+    store.put('a', b'x' * 10)
+    store.put('b', b'x' * 20)
+    store.put('a', b'x' * 5)
+    store.delete('b')
+    
+    assert not any('SUM(' in statement for statement in statements)
+    assert store.stats()['bytes'] == 5
+    store.close()
+    
+    conn = sqlite3.connect(str(tmp_path / 'store.sqlite'))
+    conn.execute('DROP TABLE meta')
+    conn.commit()
+    conn.close()
+    assert SQLiteStore(str(tmp_path / 'store.sqlite')).stats()['bytes'] == 5
@@ -0,0 +1,71 @@
+"""
+Benchmark for PathMatcher against per-pattern fnmatch matching.
+
+Run from the repository root:
+    python -m Source.collector.bench_path_matcher --paths 100000
+"""
+
+import argparse
+import fnmatch
+import random
+import time
+from typing import List
+from .path_matcher import PathMatcher
+
+INCLUDE = ['*.py', '*.js', '*.ts', '*.swift', 'src/**']
+EXCLUDE = ['tests/*', 'node_modules/*', '*.test.*', 'build/*', 'dist/*']
+
+DIRS = ['src', 'lib', 'tests', 'node_modules', 'build', 'dist', 'docs', 'app', 'pkg', 'internal']
+EXTENSIONS = ['py', 'js', 'ts', 'swift', 'md', 'json', 'test.js', 'go', 'txt']
+
+def synthetic_paths(count: int, seed: int, files_per_dir: int = 12) -> List[str]:
+    """Generate a reproducible set of relative file paths."""
+    rng = random.Random(seed)
+    dirs = ['']
+    for i in range(max(1, count // files_per_dir)):
+        parent = rng.choice(dirs)
+        name = rng.choice(DIRS) if not parent else f"d{i}"
+        if parent.count('/') < 5:
+            dirs.append(f"{parent}/{name}" if parent else name)
+            
+    paths = []
+    for i in range(count):
+        directory = rng.choice(dirs)
+        name = f"file{i}.{rng.choice(EXTENSIONS)}"
+        paths.append(f"{directory}/{name}" if directory else name)
+    return paths
+    
+def fnmatch_included(path: str) -> bool:
+    """Per-pattern fnmatch loop used by the scanner before PathMatcher."""
+    for pattern in EXCLUDE:
+        if fnmatch.fnmatch(path, pattern):
+            return False
+    for pattern in INCLUDE:
+        if fnmatch.fnmatch(path, pattern):
+            return True
+    return False
+    
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark include/exclude path matching')
+    parser.add_argument('--paths', type=int, default=100000, help='Number of synthetic paths')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+    
+    paths = synthetic_paths(args.paths, args.seed)
+    
+    start = time.perf_counter()
+    legacy = sum(1 for path in paths if fnmatch_included(path))
+    legacy_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    matcher = PathMatcher(INCLUDE, EXCLUDE)
+    compiled = sum(1 for path in paths if matcher.is_included(path))
+    compiled_time = time.perf_counter() - start
+    
+    print(f"Paths: {len(paths)}")
+    print(f"fnmatch loop:  {legacy_time:.3f}s ({legacy} included)")
+    print(f"PathMatcher:   {compiled_time:.3f}s ({compiled} included)")
+    print(f"Speed-up:      {legacy_time / compiled_time:.1f}x")
+    
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Batched blob retrieval through a persistent `git cat-file --batch` process.
+"""
+
+import subprocess
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Iterable
+
+@dataclass
+class Blob:
+    """A blob read from the object database."""
+    sha: str
+    size: int
+    data: bytes
+    
+    def text(self) -> str:
+        """Decode the blob as UTF-8, replacing undecodable bytes."""
+        return self.data.decode('utf-8', errors='replace')
+        
+class GitBlobReader:
+    """
+    Reads file contents at any ref without a process spawn per file.
+    
+    One `git cat-file --batch` process is started on first use and kept for
+    the lifetime of the reader, so a run costs a single spawn however many
+    files it reads.
+    """
+    
+    def __init__(self, repo_path: str = "."):
+        """
+        Initialize the reader.
+        
+        Args:
+            repo_path: Path inside the Git repository
+        """
+        self.repo_path = repo_path
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        
+    def __enter__(self) -> 'GitBlobReader':
+        return self
+        
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+        
+    def __del__(self):
+        self.close()
+        
+    def _ensure_process(self) -> subprocess.Popen:
+        """Start the batch process if it isn't running."""
+        if self._process is None or self._process.poll() is not None:
+            try:
+                self._process = subprocess.Popen(
+                    ['git', 'cat-file', '--batch'],
+                    cwd=self.repo_path,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL
+                )
+            except OSError as e:
+                raise RuntimeError(f"Failed to start git cat-file: {e}")
+        return self._process
+        
+    def read(self, ref: str, path: str) -> Optional[Blob]:
+        """
+        Read a file at a ref.
+        
+        Args:
+            ref: Commit-ish, e.g. "HEAD" or "feature-branch"
+            path: Path relative to the repository root
+            
+        Returns:
+            Blob, or None if the path doesn't exist at ref or isn't a file
+        """
+        return self.read_object(f"{ref}:{path}")
+        
+    def read_object(self, object_name: str) -> Optional[Blob]:
+        """
+        Read an object by name (blob SHA or "<ref>:<path>").
+        
+        Returns:
+            Blob, or None if the object is missing or isn't a blob
+        """
+        return self._read_batch([object_name])[0]
+        
+    def read_many(self, ref: str, paths: Iterable[str]) -> Dict[str, Optional[Blob]]:
+        """
+        Read many files at a ref in one pipelined batch.
+        
+        Args:
+            ref: Commit-ish, e.g. "HEAD" or "feature-branch"
+            paths: Paths relative to the repository root
+            
+        Returns:
+            Dict mapping each path to its Blob, or None if it isn't a file at ref
+        """
+        paths = list(paths)
+        blobs = self._read_batch([f"{ref}:{path}" for path in paths])
+        return dict(zip(paths, blobs))
+        
+    def _read_batch(self, object_names: List[str]) -> List[Optional[Blob]]:
+        """Send all requests from a writer thread while reading responses in order."""
+        results: List[Optional[Blob]] = []
+        with self._lock:
+            process = self._ensure_process()
+            requests = [name for name in object_names if '\n' not in name]
+            request_data = ''.join(f"{name}\n" for name in requests).encode('utf-8')
+            
+            # Writing everything before reading could deadlock once both pipe
+            # buffers fill up, so writes happen on their own thread.
+            writer = threading.Thread(target=self._write, args=(process, request_data))
+            writer.start()
+            try:
+                for name in object_names:
+                    results.append(None if '\n' in name else self._read_response(process))
+            finally:
+                writer.join()
+        return results
+        
+    @staticmethod
+    def _write(process: subprocess.Popen, data: bytes) -> None:
+        """Write batch requests to the process."""
+        try:
+            process.stdin.write(data)
+            process.stdin.flush()
+        except (BrokenPipeError, ValueError):
+            pass
+            
+    @staticmethod
+    def _read_response(process: subprocess.Popen) -> Optional[Blob]:
+        """Read one `<sha> <type> <size>` response from the process."""
+        header = process.stdout.readline()
+        if not header:
+            raise RuntimeError("git cat-file exited unexpectedly")
+            
+        fields = header.decode('utf-8', errors='replace').rstrip('\n').rsplit(' ', 2)
+        if len(fields) != 3 or not fields[2].isdigit():
+            # "<name> missing" or "<name> ambiguous"
+            return None
+            
+        sha, object_type, size = fields[0], fields[1], int(fields[2])
+        data = process.stdout.read(size)
+        process.stdout.read(1)  # trailing newline
+        if object_type != 'blob':
+            return None
+        return Blob(sha=sha, size=size, data=data)
+        
+    def close(self) -> None:
+        """Stop the batch process."""
+        process = getattr(self, '_process', None)
+        if process is None:
+            return
+        self._process = None
+        try:
+            process.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        process.stdout.close()
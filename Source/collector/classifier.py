@@ -0,0 +1,231 @@
+"""
+Classifier for generated, minified, lockfile and vendored files.
+"""
+
+import os
+import re
+import threading
+from typing import Dict, List, Optional
+from .models import FileContent
+from .path_matcher import PathSpec
+from ..utils.hashing import digest_text
+
+# File classes, also used as FileContent.metadata['skipped']['reason']
+CLASS_GENERATED = 'generated'
+CLASS_MINIFIED = 'minified'
+CLASS_LOCKFILE = 'lockfile'
+CLASS_VENDORED = 'vendored'
+CLASSES = (CLASS_GENERATED, CLASS_MINIFIED, CLASS_LOCKFILE, CLASS_VENDORED)
+
+# Values of classify.<class>
+POLICY_SKIP = 'skip'
+POLICY_SUMMARIZE = 'summarize'
+POLICY_REVIEW = 'review'
+POLICIES = (POLICY_SKIP, POLICY_SUMMARIZE, POLICY_REVIEW)
+
+LOCKFILE_NAMES = frozenset([
+    'package-lock.json', 'npm-shrinkwrap.json', 'yarn.lock', 'pnpm-lock.yaml', 'bun.lockb',
+    'poetry.lock', 'pipfile.lock', 'uv.lock', 'pdm.lock', 'cargo.lock', 'gemfile.lock',
+    'composer.lock', 'go.sum', 'podfile.lock', 'package.resolved', 'mix.lock', 'flake.lock',
+    'packages.lock.json', 'gradle.lockfile', 'pubspec.lock'
+])
+
+VENDORED_PATTERNS = [
+    'vendor/', 'vendors/', 'node_modules/', 'bower_components/', 'third_party/', 'third-party/',
+    'thirdparty/', 'Pods/', 'Carthage/', '.yarn/'
+]
+
+GENERATED_PATTERNS = [
+    '*.pb.go', '*.pb.h', '*.pb.cc', '*.pb.swift', '*_pb2.py', '*_pb2_grpc.py', '*_pb2.pyi',
+    '*_grpc.pb.go', '*.pb.ts', '*_pb.js', '*_pb.d.ts', '*.g.dart', '*.freezed.dart',
+    '*.designer.cs', '*.g.cs', '*.generated.*', '__snapshots__/', '*.snap', '*.js.map', '*.css.map'
+]
+
+MINIFIED_PATTERNS = ['*.min.js', '*.min.mjs', '*.min.css', '*-min.js', '*.bundle.js']
+
+# Markers looked for near the top of a file
+GENERATED_MARKER = re.compile(
+    r'@generated\b|(?-i:\bDO NOT EDIT\b)|\bauto-?generated\b|'
+    r'^\W*(?:code |this (?:file|code) (?:is|was) )?(?:automatically )?generated (?:by|from)\b',
+    re.IGNORECASE | re.MULTILINE
+)
+MARKER_CHARS = 1024
+
+# Minification heuristics, applied to files of at least MINIFIED_MIN_SIZE bytes
+MINIFIED_MIN_SIZE = 1024
+MINIFIED_AVG_LINE = 200
+MINIFIED_MAX_LINE = 2000
+
+DEFAULT_POLICY = {name: POLICY_SKIP for name in CLASSES}
+
+class FileClassifier:
+    """
+    Marks low-value inputs so they can be skipped or summarised before review.
+    
+    Signals, cheapest first: ``.gitattributes`` ``linguist-generated`` and
+    ``linguist-vendored``, vendored directories, lockfile names, generated and
+    minified filename patterns, "generated" header markers, and finally line
+    length statistics for minified code.
+    """
+    
+    def __init__(self, policy: Optional[Dict[str, str]] = None):
+        """
+        Initialize the classifier.
+        
+        Args:
+            policy: Action per class ('skip', 'summarize' or 'review'); missing
+                classes default to 'skip'
+                
+        Raises:
+            ValueError: If a class or action is unknown
+        """
+        self.policy = dict(DEFAULT_POLICY)
+        for name, action in (policy or {}).items():
+            if name not in CLASSES:
+                raise ValueError(f"Unknown file class: {name}")
+            if action not in POLICIES:
+                raise ValueError(f"Unknown policy for {name}: {action}")
+            self.policy[name] = action
+        self.counts: Dict[str, int] = {name: 0 for name in CLASSES}
+        self._lock = threading.Lock()
+        self._vendored = PathSpec(VENDORED_PATTERNS)
+        self._generated = PathSpec(GENERATED_PATTERNS)
+        self._minified = PathSpec(MINIFIED_PATTERNS)
+        self._attr_generated = PathSpec([])
+        self._attr_vendored = PathSpec([])
+        
+    def load_gitattributes(self, directory: str) -> None:
+        """
+        Read ``linguist-generated`` / ``linguist-vendored`` from directory/.gitattributes.
+        
+        An unset or false attribute (``-linguist-generated``,
+        ``linguist-generated=false``) overrides the built-in signals.
+        """
+        path = os.path.join(directory, '.gitattributes')
+        if not os.path.isfile(path):
+            return
+        generated: List[str] = []
+        vendored: List[str] = []
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    fields = line.split()
+                    if not fields or fields[0].startswith('#'):
+                        continue
+                    pattern, attributes = fields[0], fields[1:]
+                    for attribute in attributes:
+                        for name, patterns in (('linguist-generated', generated), ('linguist-vendored', vendored)):
+                            if attribute in (name, f"{name}=true"):
+                                patterns.append(pattern)
+                            elif attribute in (f"-{name}", f"{name}=false"):
+                                patterns.append(f"!{pattern}")
+        except OSError as e:
+            print(f"Warning: Could not read {path}: {e}")
+            return
+        self._attr_generated = PathSpec(generated)
+        self._attr_vendored = PathSpec(vendored)
+        
+    def classify(self, rel_path: str, content: Optional[str] = None, size: Optional[int] = None) -> Optional[str]:
+        """
+        Classify a file.
+        
+        Args:
+            rel_path: Path relative to the scanned directory, with '/' separators
+            content: File content, if loaded
+            size: File size in bytes, if known
+            
+        Returns:
+            One of CLASSES, or None for ordinary source
+        """
+        generated_attr = self._attr_generated.match(rel_path)
+        if generated_attr:
+            return CLASS_GENERATED
+        vendored_attr = self._attr_vendored.match(rel_path)
+        if vendored_attr or (vendored_attr is None and self._vendored.match(rel_path)):
+            return CLASS_VENDORED
+        if rel_path.rsplit('/', 1)[-1].lower() in LOCKFILE_NAMES:
+            return CLASS_LOCKFILE
+        if generated_attr is None and self._generated.match(rel_path):
+            return CLASS_GENERATED
+        if self._minified.match(rel_path):
+            return CLASS_MINIFIED
+        if not content:
+            return None
+        if generated_attr is None and GENERATED_MARKER.search(content, 0, MARKER_CHARS):
+            return CLASS_GENERATED
+        if self._looks_minified(content, size):
+            return CLASS_MINIFIED
+        return None
+        
+    @staticmethod
+    def _looks_minified(content: str, size: Optional[int]) -> bool:
+        """Check line length statistics for minified or bundled code."""
+        length = size if size is not None else len(content)
+        if length < MINIFIED_MIN_SIZE:
+            return False
+        lines = content.count('\n') + 1
+        if length / lines > MINIFIED_AVG_LINE:
+            return True
+        return max(map(len, content.split('\n'))) > MINIFIED_MAX_LINE
+        
+    def apply(self, file_content: FileContent, rel_path: str) -> FileContent:
+        """
+        Classify a loaded file and apply the policy for its class.
+        
+        Sets ``metadata['classification']``. Skipped files get empty content
+        and a ``skipped`` entry, like files the loader skips; summarised files
+        have their content replaced by a one-line summary. Either way the
+        loader's digest no longer describes the content: skipped files lose
+        it and summarised files get the digest of their summary, so token
+        memos and review caches keyed on it never mix the two.
+        
+        Args:
+            file_content: File from FileLoader
+            rel_path: Path relative to the scanned directory
+            
+        Returns:
+            The same FileContent, updated in place
+        """
+        metadata = file_content.metadata
+        if metadata.get('skipped'):
+            return file_content
+        classification = self.classify(rel_path, file_content.content, metadata.get('size'))
+        if classification is None:
+            return file_content
+            
+        metadata['classification'] = classification
+        action = self.record(classification)
+        if action == POLICY_SKIP:
+            file_content.content = ''
+            metadata.pop('digest', None)
+            metadata['skipped'] = {'reason': classification}
+        elif action == POLICY_SUMMARIZE:
+            details = []
+            if metadata.get('line_count') is not None:
+                details.append(f"{metadata['line_count']} lines")
+            if metadata.get('size') is not None:
+                details.append(f"{metadata['size']} bytes")
+            file_content.content = summarize(classification, details)
+            metadata['digest'] = digest_text(file_content.content)
+            metadata['summarized'] = True
+        return file_content
+        
+    def record(self, classification: str) -> str:
+        """
+        Count a classified file.
+        
+        Returns:
+            The policy action for its class
+        """
+        with self._lock:
+            self.counts[classification] += 1
+        return self.policy[classification]
+        
+    def stats(self) -> Dict[str, int]:
+        """Return the number of files found per class."""
+        return dict(self.counts)
+        
+def summarize(classification: str, details: List[str]) -> str:
+    """One-line stand-in for the content of a summarised file."""
+    suffix = f" ({', '.join(details)})" if details else ''
+    return f"[{classification} file{suffix}; content omitted from review]\n"
@@ -1,19 +1,40 @@
 from abc import ABC, abstractmethod
-from typing import List
-from models import FileContent
-from git_diff import GitDiffCollector
-from file_loader import FileLoader
-from directory_scanner import DirectoryScanner
+from typing import List, Dict, Any, Iterator, Optional
+from .models import FileContent
+from .git_diff import GitDiffCollector
+from .file_loader import FileLoader
+from .directory_scanner import DirectoryScanner
+from .scan_index import ScanIndex
+from .classifier import FileClassifier
 
 class BaseCollector(ABC):
     @abstractmethod
     def collect(self) -> List[FileContent]:
         """Collect files for review."""
         pass
-
+        
 class GitDiff(BaseCollector):
-    def __init__(self, repo_path: str = "."):
-        self._collector = GitDiffCollector(repo_path)
+    def __init__(self, repo_path: str = ".", full_content: bool = False, classify: bool = True):
+        """
+        Initialize diff collector.
+        
+        Args:
+            repo_path: Path to the Git repository
+            full_content: Attach each changed file's content at the target ref
+            classify: Skip generated, minified, lockfile and vendored files;
+                skipped files are listed in `skipped`
+        """
+        classifier = FileClassifier() if classify else None
+        self._collector = GitDiffCollector(repo_path, full_content=full_content, classifier=classifier)
+        
+    @property
+    def skipped(self) -> List[Dict[str, Any]]:
+        """Files skipped by the classifier during the last collection."""
+        return self._collector.skipped
+        
+    def skip_counts(self) -> Dict[str, int]:
+        """Count the files skipped during the last collection, per reason."""
+        return self._collector.skip_counts()
         
     def collect(self, ref_spec: str):
         """
@@ -26,7 +47,19 @@ class GitDiff(BaseCollector):
             List of JSON objects containing the changes
         """
         return self._collector.collect(ref_spec)
-
+        
+    def iter_collect(self, ref_spec: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream changes between Git references, one file at a time.
+        
+        Args:
+            ref_spec: Git reference spec (e.g., "main..feature-branch")
+            
+        Returns:
+            Iterator of JSON objects, yielded as each file's hunks are parsed
+        """
+        return self._collector.iter_collect(ref_spec)
+        
 class File(BaseCollector):
     def __init__(self):
         self._loader = FileLoader()
@@ -46,16 +79,21 @@ class File(BaseCollector):
             PermissionError: If file can't be read
         """
         return self._loader.load(file_path)
-
+        
 class Directory(BaseCollector):
-    def __init__(self, config_path: str = "codereview.yaml"):
+    def __init__(self, config_path: str = "codereview.yaml", index_path: Optional[str] = None):
         """
         Initialize directory collector.
         
         Args:
             config_path: Path to codereview.yaml config file
+            index_path: Optional scan index file (e.g. ".codereview/scan_index.json").
+                When set, collect() only returns files that are new or modified
+                since the previous run; see `index` for hit/miss counts and
+                deleted files.
         """
-        self._scanner = DirectoryScanner(config_path)
+        self.index = ScanIndex(index_path) if index_path else None
+        self._scanner = DirectoryScanner(config_path, index=self.index)
         
     def collect(self, directory: str) -> List[FileContent]:
         """
@@ -71,4 +109,27 @@ class Directory(BaseCollector):
             FileNotFoundError: If directory doesn't exist
             PermissionError: If directory can't be accessed
         """
-        return self._scanner.scan(directory)
\ No newline at end of file
+        return self._scanner.scan(directory)
+        
+    def skip_counts(self) -> Dict[str, int]:
+        """Count the files skipped during the last collection, per reason."""
+        return self._scanner.skip_counts()
+        
+    def iter_collect(self, directory: str) -> Iterator[FileContent]:
+        """
+        Lazily collect files from directory based on patterns.
+        
+        Files are yielded as soon as they are read, with a bounded read-ahead,
+        so downstream stages can start on the first file and memory stays flat.
+        
+        Args:
+            directory: Path to directory to scan
+            
+        Returns:
+            Iterator of FileContent objects for matching files
+            
+        Raises:
+            FileNotFoundError: If directory doesn't exist
+            PermissionError: If directory can't be accessed
+        """
+        return self._scanner.iter_scan(directory)
\ No newline at end of file
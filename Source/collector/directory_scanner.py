@@ -3,27 +3,54 @@ Directory scanner for collecting multiple files.
 """
 
 import os
+import subprocess
 import yaml
-from typing import List, Dict, Any
-from models import FileContent
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator, Tuple, Optional
+from .models import FileContent
+from .file_loader import FileLoader, LoadPolicy
+from .path_matcher import PathMatcher
+from .scan_index import ScanIndex
+from .classifier import FileClassifier
+
+DEFAULT_WORKERS = 8
+DEFAULT_PREFETCH = 32
+
+# Values of scan.enumerator
+ENUMERATOR_AUTO = 'auto'
+ENUMERATOR_GIT = 'git'
+ENUMERATOR_FILESYSTEM = 'filesystem'
 
 class DirectoryScanner:
     """Scans directories and collects files based on patterns."""
     
-    def __init__(self, config_path: str = "codereview.yaml"):
+    def __init__(self, config_path: str = "codereview.yaml", index: Optional[ScanIndex] = None):
         """
         Initialize scanner with config file.
         
         Args:
             config_path: Path to codereview.yaml config file
+            index: Optional scan index; when set, only new and modified files
+                are yielded and unchanged files are not read
         """
         self.config_path = config_path
+        self.index = index
         self.include_patterns = []
         self.exclude_patterns = []
+        self.workers = DEFAULT_WORKERS
+        self.prefetch = DEFAULT_PREFETCH
+        self.use_gitignore = False
+        self.enumerator = ENUMERATOR_AUTO
+        self.include_untracked = True
+        self.load_policy = LoadPolicy()
+        self.classifier: Optional[FileClassifier] = FileClassifier()
+        self.skipped: List[FileContent] = []
         self._load_config()
+        self.matcher = PathMatcher(self.include_patterns, self.exclude_patterns)
         
     def _load_config(self):
-        """Load include/exclude patterns from config file."""
+        """Load include/exclude patterns and scan options from config file."""
         if not os.path.exists(self.config_path):
             return
             
@@ -33,32 +60,157 @@ class DirectoryScanner:
                 
             self.include_patterns = config.get('include', [])
             self.exclude_patterns = config.get('exclude', [])
+            
+            scan_config = config.get('scan') or {}
+            self.workers = max(1, int(scan_config.get('workers', DEFAULT_WORKERS)))
+            self.prefetch = max(1, int(scan_config.get('prefetch', DEFAULT_PREFETCH)))
+            self.use_gitignore = bool(scan_config.get('gitignore', False))
+            self.enumerator = scan_config.get('enumerator', ENUMERATOR_AUTO)
+            self.include_untracked = bool(scan_config.get('untracked', True))
+            self.load_policy = LoadPolicy(
+                max_size=int(scan_config.get('max_file_size', self.load_policy.max_size)),
+                mmap_threshold=int(scan_config.get('mmap_threshold', self.load_policy.mmap_threshold)),
+                fallback_encoding=scan_config.get('fallback_encoding')
+            )
+            
+            classify_config = dict(config.get('classify') or {})
+            if classify_config.pop('enabled', True):
+                self.classifier = FileClassifier(classify_config)
+            else:
+                self.classifier = None
         except Exception as e:
             print(f"Warning: Could not load config: {e}")
             
+    def _build_matcher(self, directory: str) -> PathMatcher:
+        """Get the matcher for a scan, adding .gitignore rules if enabled."""
+        if not self.use_gitignore:
+            return self.matcher
+        matcher = PathMatcher(self.include_patterns, self.exclude_patterns)
+        matcher.use_gitignore(directory)
+        return matcher
+        
     def _should_include(self, file_path: str) -> bool:
         """Check if file should be included based on patterns."""
-        # Check exclude patterns first
-        for pattern in self.exclude_patterns:
-            if self._matches_pattern(file_path, pattern):
-                return False
-                
-        # If no include patterns, include all non-excluded files
-        if not self.include_patterns:
-            return True
+        return self.matcher.is_included(file_path)
+        
+    def _walk(self, directory: str, matcher: PathMatcher, rel_dir: str = '') -> Iterator[Tuple[str, str]]:
+        """
+        Yield (absolute path, relative path) for candidate files.
+        
+        Entries are visited in name order so results are deterministic, and
+        directories the matcher rules out are never descended into.
+        """
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except (FileNotFoundError, PermissionError) as e:
+            print(f"Warning: Could not read {directory}: {e}")
+            return
             
-        # Check include patterns
-        for pattern in self.include_patterns:
-            if self._matches_pattern(file_path, pattern):
-                return True
+        if self.use_gitignore:
+            for entry in entries:
+                if entry.name == '.gitignore':
+                    matcher.load_gitignore(entry.path, rel_dir)
+                    
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if self.use_gitignore and entry.name == '.git':
+                        continue
+                    if matcher.could_match_below(rel_path):
+                        yield from self._walk(entry.path, matcher, rel_path)
+                elif entry.is_file() and matcher.is_included(rel_path):
+                    yield entry.path, rel_path
+            except OSError as e:
+                print(f"Warning: Could not read {entry.path}: {e}")
+                
+    def _enumerate(self, directory: str, matcher: PathMatcher) -> Iterator[Tuple[str, str]]:
+        """
+        Yield (absolute path, relative path) for candidate files.
+        
+        Inside a Git work tree the candidates come from the Git index (plus
+        untracked, non-ignored files if ``scan.untracked``), so build output,
+        virtualenvs and caches are never enumerated. Otherwise, or with
+        ``scan.enumerator: filesystem``, the directory is walked.
+        """
+        if self.enumerator != ENUMERATOR_FILESYSTEM:
+            rel_paths = self._git_files(directory)
+            if rel_paths is not None:
+                for rel_path in rel_paths:
+                    file_path = os.path.join(directory, rel_path)
+                    # Skips tracked files deleted from the work tree and submodules
+                    if matcher.is_included(rel_path) and os.path.isfile(file_path):
+                        yield file_path, rel_path
+                return
+            if self.enumerator == ENUMERATOR_GIT:
+                print(f"Warning: {directory} is not in a Git work tree; walking the filesystem")
                 
-        return False
+        yield from self._walk(directory, matcher)
+        
+    def _git_files(self, directory: str) -> Optional[List[str]]:
+        """
+        List files below directory with `git ls-files`.
         
-    def _matches_pattern(self, file_path: str, pattern: str) -> bool:
-        """Check if file matches glob pattern."""
-        import fnmatch
-        return fnmatch.fnmatch(file_path, pattern)
+        Returns:
+            Paths relative to directory in walk order, or None outside a Git work tree
+        """
+        command = ['git', 'ls-files', '-z', '--cached']
+        if self.include_untracked:
+            command += ['--others', '--exclude-standard']
+        try:
+            result = subprocess.run(command, cwd=directory, capture_output=True)
+        except OSError:
+            return None
+        if result.returncode != 0:
+            return None
+            
+        rel_paths = set(os.fsdecode(path) for path in result.stdout.split(b'\0') if path)
+        return sorted(rel_paths, key=lambda path: path.split('/'))
         
+    def _load(self, loader: FileLoader, file_path: str, rel_path: str):
+        """Load and classify a single file, returning None if it can't be read."""
+        try:
+            file_content = loader.load(file_path)
+        except OSError as e:
+            print(f"Warning: Could not read {file_path}: {e}")
+            return None
+        if self.classifier is not None:
+            self.classifier.apply(file_content, rel_path)
+        return file_content
+        
+    def _accept(self, file_content) -> bool:
+        """Check a loaded file, recording it in the index, or in self.skipped if skipped."""
+        if file_content is None:
+            return False
+        if file_content.metadata.get('skipped'):
+            if self.index is not None:
+                self.index.forget(file_content.path)
+            self.skipped.append(file_content)
+            return False
+        if self.index is not None:
+            status = self.index.record(file_content.path, file_content.metadata)
+            if status is None:
+                # Touched but identical content
+                return False
+            file_content.metadata['scan_status'] = status
+        return True
+        
+    def skip_counts(self) -> Dict[str, int]:
+        """Count the files skipped by the last scan, per reason."""
+        counts: Dict[str, int] = {}
+        for file_content in self.skipped:
+            reason = file_content.metadata['skipped']['reason']
+            counts[reason] = counts.get(reason, 0) + 1
+        return counts
+        
+    def _unchanged(self, file_path: str) -> bool:
+        """Check the scan index without reading the file."""
+        try:
+            return self.index.is_unchanged(file_path, os.stat(file_path))
+        except OSError:
+            return False
+            
     def scan(self, directory: str) -> List[FileContent]:
         """
         Scan directory and collect files.
@@ -73,26 +225,73 @@ class DirectoryScanner:
             FileNotFoundError: If directory doesn't exist
             PermissionError: If directory can't be accessed
         """
-        from collector import File
-        file_collector = File()
+        return list(self.iter_scan(directory))
         
+    def iter_scan(self, directory: str) -> Iterator[FileContent]:
+        """
+        Scan directory and lazily yield files in walk order.
+        
+        Files the loader skips (binary, too large, undecodable) and files the
+        classifier skips (generated, minified, lockfile, vendored) are not
+        yielded; they are collected in ``self.skipped`` with their reason.
+        
+        With a scan index, files whose size, mtime and inode are unchanged are
+        not read at all and only new or modified files are yielded, with
+        ``metadata['scan_status']`` set to 'added' or 'modified'. Once the
+        iteration completes, deleted files are in ``index.deleted`` and the
+        index is saved.
+        
+        File contents are read on a pool of ``scan.workers`` threads. At most
+        ``scan.prefetch`` files are read ahead of the consumer, so memory stays
+        bounded and a slow consumer slows the readers down. Closing the
+        generator early cancels any reads that have not started yet.
+        
+        Args:
+            directory: Path to directory to scan
+            
+        Returns:
+            Iterator of FileContent objects for matching files
+            
+        Raises:
+            FileNotFoundError: If directory doesn't exist
+            PermissionError: If directory can't be accessed
+        """
         if not os.path.exists(directory):
             raise FileNotFoundError(f"Directory not found: {directory}")
             
         if not os.path.isdir(directory):
             raise NotADirectoryError(f"Not a directory: {directory}")
             
-        files = []
-        for root, _, filenames in os.walk(directory):
-            for filename in filenames:
-                file_path = os.path.join(root, filename)
-                rel_path = os.path.relpath(file_path, directory)
-                
-                if self._should_include(rel_path):
-                    try:
-                        file_content = file_collector.collect(file_path)
-                        files.append(file_content)
-                    except (FileNotFoundError, PermissionError) as e:
-                        print(f"Warning: Could not read {file_path}: {e}")
+        return self._iter_loaded(directory)
+        
+    def _iter_loaded(self, directory: str) -> Iterator[FileContent]:
+        """Read walked files on the thread pool, keeping a bounded read-ahead window."""
+        loader = FileLoader(self.load_policy)
+        self.skipped = []
+        if self.classifier is not None:
+            self.classifier.load_gitattributes(directory)
+        if self.index is not None:
+            self.index.begin()
+        pending = deque()
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            for file_path, rel_path in self._enumerate(directory, self._build_matcher(directory)):
+                if self.index is not None and self._unchanged(file_path):
+                    continue
+                pending.append(executor.submit(self._load, loader, file_path, rel_path))
+                if len(pending) >= self.prefetch:
+                    file_content = pending.popleft().result()
+                    if self._accept(file_content):
+                        yield file_content
                         
-        return files
\ No newline at end of file
+            while pending:
+                file_content = pending.popleft().result()
+                if self._accept(file_content):
+                    yield file_content
+                    
+            if self.index is not None:
+                self.index.finish(directory)
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
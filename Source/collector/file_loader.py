@@ -3,17 +3,60 @@ File loader for single file collection.
 """
 
 import os
-from typing import Dict, Any
-from models import FileContent
-from ..utils.language_utils import get_language_from_extension
+import mmap
+import stat
+import codecs
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+from .models import FileContent
+from ..utils.language_utils import detect_language
+from ..utils.hashing import digest_bytes
 
+# Skip reasons recorded in FileContent.metadata['skipped']['reason']
+SKIP_NOT_REGULAR = 'not_regular'
+SKIP_TOO_LARGE = 'too_large'
+SKIP_BINARY = 'binary'
+SKIP_UNDECODABLE = 'undecodable'
+
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+@dataclass
+class LoadPolicy:
+    """Limits applied before a file's content is read."""
+    max_size: int = 1024 * 1024           # larger files are skipped (bytes)
+    mmap_threshold: int = 256 * 1024      # files at least this large are memory-mapped
+    sniff_size: int = 8192                # bytes inspected for binary/encoding detection
+    fallback_encoding: Optional[str] = None  # used when a file is not valid UTF-8
+    
 class FileLoader:
     """Handles loading and parsing of single files with metadata."""
     
+    def __init__(self, policy: Optional[LoadPolicy] = None):
+        """
+        Initialize the loader.
+        
+        Args:
+            policy: Size and encoding limits; defaults to LoadPolicy()
+        """
+        self.policy = policy or LoadPolicy()
+        
     def load(self, file_path: str) -> FileContent:
         """
         Load a single file and its metadata.
         
+        The file is read once; size, mtime, inode, content digest and line
+        count are all derived from that read and the initial ``stat``.
+        
+        Files that are too large, binary or undecodable are not read in full;
+        they come back with empty content and a ``skipped`` entry in metadata,
+        e.g. ``{'reason': 'binary'}``.
+        
         Args:
             file_path: Path to the file to load
             
@@ -24,29 +67,110 @@ class FileLoader:
             FileNotFoundError: If file doesn't exist
             PermissionError: If file can't be read
         """
-        if not os.path.exists(file_path):
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
             raise FileNotFoundError(f"File not found: {file_path}")
+        except PermissionError:
+            raise PermissionError(f"Cannot read file: {file_path}")
+            
+        if not stat.S_ISREG(st.st_mode):
+            return self._skipped(file_path, st, SKIP_NOT_REGULAR)
+            
+        if st.st_size > self.policy.max_size:
+            return self._skipped(file_path, st, SKIP_TOO_LARGE, max_size=self.policy.max_size)
             
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            metadata = self._get_metadata(file_path, content)
-            return FileContent(
-                path=file_path,
-                content=content,
-                metadata=metadata
-            )
+            with open(file_path, 'rb') as f:
+                head = f.read(self.policy.sniff_size)
+                encoding = self._detect_encoding(head)
+                if encoding is None:
+                    return self._skipped(file_path, st, SKIP_BINARY)
+                    
+                content, encoding, digest = self._read_text(f, head, st.st_size, encoding)
+                if content is None:
+                    return self._skipped(file_path, st, SKIP_UNDECODABLE)
         except PermissionError:
             raise PermissionError(f"Cannot read file: {file_path}")
             
-    def _get_metadata(self, file_path: str, content: str) -> Dict[str, Any]:
+        metadata = self._get_metadata(file_path, content, st, head)
+        metadata['encoding'] = encoding
+        metadata['digest'] = digest
+        return FileContent(
+            path=file_path,
+            content=content,
+            metadata=metadata
+        )
+        
+    def _detect_encoding(self, head: bytes) -> Optional[str]:
+        """Pick an encoding from the first bytes, or None if the data looks binary."""
+        for bom, encoding in _BOMS:
+            if head.startswith(bom):
+                return encoding
+        if b'\x00' in head:
+            return None
+        return 'utf-8'
+        
+    def _read_text(self, f, head: bytes, size: int, encoding: str) -> Tuple[Optional[str], str, str]:
+        """
+        Read the rest of the file, then decode and hash the same bytes.
+        
+        Large files are memory-mapped instead of copied into a bytes object.
+        
+        Returns:
+            (content or None if undecodable, encoding used, digest of the raw bytes)
+        """
+        if size >= self.policy.mmap_threshold:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                digest = digest_bytes(data)
+                content, encoding = self._decode(data, encoding)
+        else:
+            data = head + f.read()
+            digest = digest_bytes(data)
+            content, encoding = self._decode(data, encoding)
+            
+        if content is not None and '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content, encoding, digest
+        
+    def _decode(self, data, encoding: str) -> Tuple[Optional[str], str]:
+        """Decode bytes, trying the fallback encoding if UTF-8 fails."""
+        try:
+            return str(data, encoding), encoding
+        except UnicodeDecodeError:
+            fallback = self.policy.fallback_encoding
+            if encoding != 'utf-8' or not fallback:
+                return None, encoding
+        try:
+            return str(data, fallback), fallback
+        except UnicodeDecodeError:
+            return None, fallback
+            
+    def _skipped(self, file_path: str, st: os.stat_result, reason: str, **details) -> FileContent:
+        """Build an empty FileContent recording why the file was not read."""
+        metadata = self._get_stat_metadata(file_path, st)
+        metadata['skipped'] = {'reason': reason, **details}
+        return FileContent(
+            path=file_path,
+            content='',
+            metadata=metadata
+        )
+        
+    def _get_metadata(self, file_path: str, content: str, st: os.stat_result, head: bytes) -> Dict[str, Any]:
         """Extract metadata from file."""
+        metadata = self._get_stat_metadata(file_path, st, head)
+        metadata['line_count'] = content.count('\n') + (1 if content and not content.endswith('\n') else 0)
+        return metadata
+        
+    def _get_stat_metadata(self, file_path: str, st: os.stat_result, head: Optional[bytes] = None) -> Dict[str, Any]:
+        """Extract the metadata available without reading the file (plus its first bytes, if read)."""
         return {
-            'language': self._get_language(file_path),
-            'size': len(content.encode('utf-8'))
+            'language': self._get_language(file_path, head),
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'inode': st.st_ino
         }
         
-    def _get_language(self, file_path: str) -> str:
-        """Get the programming language based on file extension."""
-        return get_language_from_extension(file_path) 
\ No newline at end of file
+    def _get_language(self, file_path: str, head: Optional[bytes] = None) -> str:
+        """Get the programming language from the file name, or its first bytes."""
+        return detect_language(file_path, head)
\ No newline at end of file
@@ -1,14 +1,277 @@
-from typing import List, Dict, Any
+import re
+import subprocess
+import tempfile
+from typing import IO, List, Dict, Any, Iterator, Optional, Tuple
 import git
-from collections import defaultdict
-from models import DiffHunk
+from .models import DiffHunk
+from .blob_reader import GitBlobReader
+from .classifier import FileClassifier, POLICY_SKIP, POLICY_SUMMARIZE, summarize
+from ..utils.language_utils import detect_language
 
+HUNK_HEADER = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+C_ESCAPES = {'a': 7, 'b': 8, 't': 9, 'n': 10, 'v': 11, 'f': 12, 'r': 13, '"': 34, '\\': 92}
+
+def _unquote_path(path: str) -> str:
+    """
+    Undo git's C-style quoting of a path (`"caf\\303\\251.py"`).
+    
+    Unquoted paths are returned unchanged.
+    """
+    if len(path) < 2 or not (path.startswith('"') and path.endswith('"')):
+        return path
+    result = bytearray()
+    i, end = 1, len(path) - 1
+    while i < end:
+        char = path[i]
+        if char != '\\' or i + 1 >= end:
+            result.extend(char.encode('utf-8'))
+            i += 1
+        elif path[i + 1] in C_ESCAPES:
+            result.append(C_ESCAPES[path[i + 1]])
+            i += 2
+        else:
+            # Octal byte, e.g. one byte of a UTF-8 sequence
+            digits = re.match(r'[0-7]{1,3}', path[i + 1:])
+            if digits:
+                result.append(int(digits.group(), 8) & 0xFF)
+                i += 1 + len(digits.group())
+            else:
+                result.extend(path[i + 1].encode('utf-8'))
+                i += 2
+    return result.decode('utf-8', errors='replace')
+    
+def _strip_prefix(path: str, prefix: str) -> str:
+    """Unquote a diff header path and remove its `a/` or `b/` prefix."""
+    path = _unquote_path(path)
+    return path[len(prefix):] if path.startswith(prefix) else path
+    
+def _split_git_paths(paths: str) -> Tuple[str, str]:
+    """Split the `a/<old> b/<new>` part of a `diff --git` line into its two (possibly quoted) paths."""
+    if paths.startswith('"'):
+        # The closing quote is the first one not escaped by a backslash
+        match = re.match(r'"(?:[^"\\]|\\.)*"', paths)
+        if match:
+            return match.group(), paths[match.end():].lstrip(' ')
+    if paths.endswith('"') and ' "' in paths:
+        # An unquoted path never contains a quote, so the last ` "` opens the new path
+        split = paths.rindex(' "')
+        return paths[:split], paths[split + 1:]
+    # Unchanged paths repeat, so `a/<path> b/<path>` splits in the middle
+    middle = len(paths) // 2
+    if len(paths) % 2 == 1 and paths[middle] == ' ' and paths[2:middle] == paths[middle + 3:]:
+        return paths[:middle], paths[middle + 1:]
+    old_path, _, new_path = paths.partition(' b/')
+    return old_path, 'b/' + new_path
+    
+    
+class DiffParser:
+    """
+    Incremental parser for unified `git diff` output.
+    
+    Lines are fed one at a time and each file's result is returned as soon as
+    the next file starts, so a diff never has to be held in memory whole.
+    """
+    
+    def __init__(self):
+        self._file: Optional[Dict[str, Any]] = None
+        self._hunks: List[DiffHunk] = []
+        self._hunk: Optional[DiffHunk] = None
+        self._old_lines: List[str] = []
+        self._new_lines: List[str] = []
+        self._old_remaining = 0
+        self._new_remaining = 0
+        self._current_line = 0
+        self._old_line = 0
+        self._last_origin = None
+        
+    def feed(self, line: str) -> Iterator[Dict[str, Any]]:
+        """
+        Parse one line of diff output (without its line ending).
+        
+        Returns:
+            Iterator over the files completed by this line (at most one)
+        """
+        if self._hunk is not None and (self._old_remaining > 0 or self._new_remaining > 0):
+            self._hunk_line(line)
+            return iter(())
+            
+        if line.startswith('diff --git '):
+            finished = self._finish_file()
+            self._start_file(line)
+            return iter([finished] if finished else [])
+            
+        if self._file is None:
+            return iter(())
+            
+        if line.startswith('@@'):
+            self._start_hunk(line)
+        elif line.startswith('\\'):
+            self._no_newline()
+        elif self._hunk is None:
+            self._header_line(line)
+        return iter(())
+        
+    def finish(self) -> Iterator[Dict[str, Any]]:
+        """Flush the last file once the diff output has ended."""
+        finished = self._finish_file()
+        return iter([finished] if finished else [])
+        
+    def _start_file(self, line: str) -> None:
+        """
+        Start a file from its `diff --git a/<old> b/<new>` line.
+        
+        The paths here are a first guess only: they are ambiguous when a path
+        contains ` b/`, so the `---`/`+++` and rename/copy headers replace them.
+        """
+        old_path, new_path = _split_git_paths(line[len('diff --git '):])
+        self._file = {
+            'file_path': _strip_prefix(new_path, 'b/'),
+            'old_path': _strip_prefix(old_path, 'a/'),
+            'status': 'modified',
+            'binary': False
+        }
+        self._hunks = []
+        
+    def _header_line(self, line: str) -> None:
+        """Parse extended header lines between `diff --git` and the first hunk."""
+        if line.startswith('--- '):
+            path = line[len('--- '):].rstrip('\t')
+            if path != '/dev/null':
+                self._file['old_path'] = _strip_prefix(path, 'a/')
+        elif line.startswith('+++ '):
+            path = line[len('+++ '):].rstrip('\t')
+            if path != '/dev/null':
+                self._file['file_path'] = _strip_prefix(path, 'b/')
+        elif line.startswith('new file mode'):
+            self._file['status'] = 'added'
+        elif line.startswith('deleted file mode'):
+            self._file['status'] = 'deleted'
+        elif line.startswith('rename from '):
+            self._file['status'] = 'renamed'
+            self._file['old_path'] = _unquote_path(line[len('rename from '):])
+        elif line.startswith('rename to '):
+            self._file['file_path'] = _unquote_path(line[len('rename to '):])
+        elif line.startswith('copy from '):
+            self._file['status'] = 'copied'
+            self._file['old_path'] = _unquote_path(line[len('copy from '):])
+        elif line.startswith('copy to '):
+            self._file['file_path'] = _unquote_path(line[len('copy to '):])
+        elif line.startswith('Binary files ') or line == 'GIT binary patch':
+            self._file['binary'] = True
+            
+    def _start_hunk(self, line: str) -> None:
+        """Start a hunk from its `@@ -a,b +c,d @@` header."""
+        self._finish_hunk()
+        match = HUNK_HEADER.match(line)
+        if not match:
+            # Without its counts the hunk body can't be told apart from headers
+            raise ValueError(f"Failed to parse hunk header: {line}")
+            
+        old_start, old_count, new_start, new_count = match.groups()
+        old_count = 1 if old_count is None else int(old_count)
+        new_count = 1 if new_count is None else int(new_count)
+        new_start = int(new_start)
+        
+        self._hunk = DiffHunk(
+            file_path=self._file['file_path'],
+            start_line=new_start,
+            end_line=new_start,  # Updated as added lines are seen
+            old_lines="",
+            new_lines="",
+            old_start=int(old_start),
+            old_count=old_count,
+            new_count=new_count
+        )
+        self._old_remaining = old_count
+        self._new_remaining = new_count
+        self._current_line = new_start
+        self._old_line = int(old_start)
+        self._last_origin = None
+        
+    def _hunk_line(self, line: str) -> None:
+        """Consume one body line of the current hunk."""
+        origin = line[:1]
+        if origin == '-':
+            self._old_lines.append(line[1:] + '\n')
+            self._hunk.removed_lines.append(self._old_line)
+            self._old_line += 1
+            self._old_remaining -= 1
+        elif origin == '+':
+            self._new_lines.append(line[1:] + '\n')
+            self._hunk.added_lines.append(self._current_line)
+            self._hunk.end_line = self._current_line
+            self._current_line += 1
+            self._new_remaining -= 1
+        elif origin == '\\':
+            self._no_newline()
+            return
+        else:
+            # Context line
+            self._current_line += 1
+            self._old_line += 1
+            self._old_remaining -= 1
+            self._new_remaining -= 1
+        self._last_origin = origin
+        
+    def _no_newline(self) -> None:
+        """Apply a `\\ No newline at end of file` marker to the previous line."""
+        if self._last_origin == '-' and self._old_lines:
+            self._old_lines[-1] = self._old_lines[-1][:-1]
+        elif self._last_origin == '+' and self._new_lines:
+            self._new_lines[-1] = self._new_lines[-1][:-1]
+            
+    def _finish_hunk(self) -> None:
+        """Store the current hunk with its accumulated lines."""
+        if self._hunk is None:
+            return
+        self._hunk.old_lines = ''.join(self._old_lines)
+        self._hunk.new_lines = ''.join(self._new_lines)
+        self._hunks.append(self._hunk)
+        self._hunk = None
+        self._old_lines = []
+        self._new_lines = []
+        
+    def _finish_file(self) -> Optional[Dict[str, Any]]:
+        """Return the current file's result, if any."""
+        self._finish_hunk()
+        if self._file is None:
+            return None
+        result = self._file
+        result['hunks'] = [h.to_dict() for h in self._hunks]
+        self._file = None
+        self._hunks = []
+        return result
+        
 class GitDiffCollector:
     """Collects and parses Git diffs."""
     
-    def __init__(self, repo_path: str = "."):
-        self.repo = git.Repo(repo_path)
+    def __init__(self, repo_path: str = ".", full_content: bool = False,
+                 classifier: Optional[FileClassifier] = None):
+        """
+        Initialize the collector.
         
+        Args:
+            repo_path: Path to the Git repository
+            full_content: Attach each changed file's content at the target ref
+                as `full_content` (and its `blob_id`), read through one
+                persistent `git cat-file --batch` process
+            classifier: Classifier for generated, minified, lockfile and
+                vendored files; its .gitattributes are read from the work tree root
+        """
+        self.repo = git.Repo(repo_path)
+        self.full_content = full_content
+        self.classifier = classifier
+        self.skipped: List[Dict[str, Any]] = []
+        self._blob_reader: Optional[GitBlobReader] = None
+        if classifier is not None:
+            classifier.load_gitattributes(self.repo.working_tree_dir)
+            
+    def close(self) -> None:
+        """Stop the blob reader process, if one was started."""
+        if self._blob_reader is not None:
+            self._blob_reader.close()
+            self._blob_reader = None
+            
     def collect(self, ref_spec: str) -> List[Dict[str, Any]]:
         """
         Collect changes between Git references.
@@ -19,95 +282,136 @@ class GitDiffCollector:
         Returns:
             List of JSON objects containing the changes
         """
-        try:
-            # Parse ref_spec into target and source
-            if ".." in ref_spec:
-                source, target = ref_spec.split("..")
-            else:
-                source = "HEAD~1"  # Default to previous commit
-                target = ref_spec
-                
-            # Get the diff using git diff command
-            diff_output = self.repo.git.diff(source, target, unified=3)
+        return list(self.iter_collect(ref_spec))
+        
+    def iter_collect(self, ref_spec: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream changes between Git references, one file at a time.
+        
+        `git diff` output is read line by line from a subprocess and each
+        file is yielded as soon as its hunks are complete. Files the
+        classifier skips are not yielded; they are collected in
+        ``self.skipped``.
+        
+        Args:
+            ref_spec: Git reference spec (e.g., "main..feature-branch")
             
-            # Parse hunks from diff output
-            hunks_by_file = defaultdict(list)
-            current_file = None
-            current_hunk = None
-            old_lines = []
-            new_lines = []
-            current_line = 0
+        Returns:
+            Iterator of JSON objects with `file_path`, `old_path`, `status`
+            (added, deleted, modified, renamed, copied), `binary`, `language`
+            and `hunks`
             
-            for line in diff_output.splitlines():
-                if line.startswith('diff --git'):
-                    # New file
-                    if current_hunk:
-                        current_hunk.old_lines = ''.join(old_lines)
-                        current_hunk.new_lines = ''.join(new_lines)
-                        hunks_by_file[current_file].append(current_hunk)
-                        current_hunk = None
-                        old_lines = []
-                        new_lines = []
-                        current_line = 0
-                    # Extract new file path
-                    current_file = line.split(' b/')[-1]
-                    
-                elif line.startswith('@@'):
-                    # New hunk
-                    if current_hunk:
-                        current_hunk.old_lines = ''.join(old_lines)
-                        current_hunk.new_lines = ''.join(new_lines)
-                        hunks_by_file[current_file].append(current_hunk)
-                        old_lines = []
-                        new_lines = []
-                    
-                    try:
-                        # Parse hunk header
-                        # Format: @@ -start,count +start,count @@
-                        header = line.split('@@')[1].strip()
-                        old_info, new_info = header.split(' ')
-                        new_start = int(new_info.split(',')[0][1:])
-                        current_line = new_start
-                        
-                        current_hunk = DiffHunk(
-                            file_path=current_file,
-                            start_line=new_start,
-                            end_line=new_start,  # Will be updated
-                            old_lines="",
-                            new_lines=""
-                        )
-                    except (IndexError, ValueError) as e:
-                        print(f"Warning: Failed to parse hunk header: {line}")
-                        continue
-                        
-                elif current_hunk and line:
-                    if line.startswith('-'):
-                        old_lines.append(line[1:] + '\n')
-                    elif line.startswith('+'):
-                        new_lines.append(line[1:] + '\n')
-                        current_hunk.end_line = current_line
-                        current_line += 1
-                    else:
-                        # Context line
-                        current_line += 1
+        Raises:
+            ValueError: If a Git reference is invalid or a hunk header can't be parsed
+            RuntimeError: If the diff can't be collected
+        """
+        # Parse ref_spec into target and source
+        if ".." in ref_spec:
+            source, target = ref_spec.split("..")
+        else:
+            source = "HEAD~1"  # Default to previous commit
+            target = ref_spec
             
-            # Add the last hunk
-            if current_hunk:
-                current_hunk.old_lines = ''.join(old_lines)
-                current_hunk.new_lines = ''.join(new_lines)
-                hunks_by_file[current_file].append(current_hunk)
+        # Fixed prefixes and unescaped non-ASCII paths, whatever the user's
+        # diff.noprefix, diff.mnemonicPrefix and core.quotePath settings
+        command = ['git', '-c', 'core.quotePath=false', 'diff', '--no-color', '--no-ext-diff',
+                   '--src-prefix=a/', '--dst-prefix=b/', '-M', '--unified=3', source, target, '--']
+        # stderr goes to a file rather than a pipe: it is only read once stdout
+        # is exhausted, and a full stderr pipe would block git before that
+        stderr = tempfile.TemporaryFile()
+        try:
+            process = subprocess.Popen(
+                command,
+                cwd=self.repo.working_tree_dir,
+                stdout=subprocess.PIPE,
+                stderr=stderr
+            )
+        except OSError as e:
+            stderr.close()
+            raise RuntimeError(f"Failed to collect Git diff: {e}")
             
-            # Convert to final format
-            result = []
-            for file_path, hunks in hunks_by_file.items():
-                result.append({
-                    'file_path': file_path,
-                    'hunks': [h.to_dict() for h in hunks]
-                })
+        return self._iter_parsed(process, stderr, target)
+        
+    def _iter_parsed(self, process: subprocess.Popen, stderr: IO[bytes], target: str) -> Iterator[Dict[str, Any]]:
+        """Feed the subprocess output through a DiffParser; stderr is the file git's errors go to."""
+        parser = DiffParser()
+        self.skipped = []
+        completed = False
+        try:
+            for raw_line in process.stdout:
+                line = raw_line.decode('utf-8', errors='replace').rstrip('\r\n')
+                yield from self._complete(parser.feed(line), target)
+                
+            returncode = process.wait()
+            if returncode != 0:
+                stderr.seek(0)
+                error = stderr.read().decode('utf-8', errors='replace').strip()
+                raise ValueError(f"Invalid Git reference: {error}")
+                
+            yield from self._complete(parser.finish(), target)
+            completed = True
+        finally:
+            if not completed and process.poll() is None:
+                process.kill()
+            process.stdout.close()
+            process.wait()
+            stderr.close()
             
-            return result
+    def _complete(self, file_diffs: Iterator[Dict[str, Any]], target: str) -> Iterator[Dict[str, Any]]:
+        """Attach content and language to parsed files, then classify them."""
+        for file_diff in file_diffs:
+            file_diff = self._with_content(file_diff, target)
+            if self.classifier is None or self._classify(file_diff):
+                yield file_diff
+                
+    def _classify(self, file_diff: Dict[str, Any]) -> bool:
+        """
+        Apply the classifier policy to a file diff.
+        
+        Returns:
+            False if the file is skipped
+        """
+        content = file_diff.get('full_content')
+        if content is None:
+            content = ''.join(hunk['after'] for hunk in file_diff['hunks'])
+        classification = self.classifier.classify(file_diff['file_path'], content)
+        if classification is None:
+            return True
+        file_diff['classification'] = classification
+        action = self.classifier.record(classification)
+        if action == POLICY_SKIP:
+            file_diff['skipped'] = {'reason': classification}
+            self.skipped.append(file_diff)
+            return False
+        if action == POLICY_SUMMARIZE:
+            added = sum(hunk['after'].count('\n') for hunk in file_diff['hunks'])
+            removed = sum(hunk['before'].count('\n') for hunk in file_diff['hunks'])
+            file_diff['summary'] = summarize(classification, [f"{added} lines added", f"{removed} lines removed"])
+            file_diff['hunks'] = []
+            file_diff.pop('full_content', None)
+            # The blob id identifies the real content, not the summary
+            file_diff.pop('blob_id', None)
+        return True
+        
+    def skip_counts(self) -> Dict[str, int]:
+        """Count the files skipped by the last collection, per reason."""
+        counts: Dict[str, int] = {}
+        for file_diff in self.skipped:
+            reason = file_diff['skipped']['reason']
+            counts[reason] = counts.get(reason, 0) + 1
+        return counts
+        
+    def _with_content(self, file_diff: Dict[str, Any], target: str) -> Dict[str, Any]:
+        """Attach the file's language, and its content at the target ref if full_content is enabled."""
+        if not self.full_content or file_diff['status'] == 'deleted' or file_diff['binary']:
+            file_diff['language'] = detect_language(file_diff['file_path'])
+            return file_diff
             
-        except git.GitCommandError as e:
-            raise ValueError(f"Invalid Git reference: {e}")
-        except Exception as e:
-            raise RuntimeError(f"Failed to collect Git diff: {e}")
+        if self._blob_reader is None:
+            self._blob_reader = GitBlobReader(self.repo.working_tree_dir)
+        blob = self._blob_reader.read(target, file_diff['file_path'])
+        if blob is not None:
+            file_diff['blob_id'] = blob.sha
+            file_diff['full_content'] = blob.text()
+        file_diff['language'] = detect_language(file_diff['file_path'], file_diff.get('full_content'))
+        return file_diff
@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import Dict, Any
+from dataclasses import dataclass, field
+from typing import Dict, Any, List
 
 @dataclass
 class FileContent:
@@ -7,7 +7,7 @@ class FileContent:
     path: str
     content: str
     metadata: dict
-
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert file content to dictionary format."""
         return {
@@ -15,7 +15,7 @@ class FileContent:
             "content": self.content,
             "metadata": self.metadata
         }
-
+        
 @dataclass
 class DiffHunk:
     """Represents a chunk of changes in a file."""
@@ -24,12 +24,22 @@ class DiffHunk:
     end_line: int
     old_lines: str
     new_lines: str
-
+    old_start: int = 0
+    old_count: int = 0
+    new_count: int = 0
+    added_lines: List[int] = field(default_factory=list)    # new-file line of each added line
+    removed_lines: List[int] = field(default_factory=list)  # old-file line of each removed line
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert hunk to dictionary format."""
         return {
             "start_line": self.start_line,
             "end_line": self.end_line,
+            "old_start": self.old_start,
+            "old_count": self.old_count,
+            "new_count": self.new_count,
             "before": self.old_lines,
-            "after": self.new_lines
+            "after": self.new_lines,
+            "added_lines": list(self.added_lines),
+            "removed_lines": list(self.removed_lines)
         }
@@ -0,0 +1,348 @@
+"""
+Gitignore-style path matching for include/exclude patterns.
+"""
+
+import os
+import re
+from typing import List, Dict, Optional, Iterable, Tuple
+
+# Marker segments used when checking whether a rule can match below a directory
+_ANY_DEPTH = None   # a '**' segment
+_ANY_NAME = '*'     # a '*' segment
+
+class _Rule:
+    """A single compiled gitignore pattern."""
+    
+    def __init__(self, pattern: str, base: str = ''):
+        """
+        Compile a gitignore pattern.
+        
+        Args:
+            pattern: Pattern line, e.g. "src/**", "!keep.py", "build/"
+            base: Directory the pattern is relative to ('' for the root)
+        """
+        self.negate = pattern.startswith('!')
+        if self.negate:
+            pattern = pattern[1:]
+        elif pattern.startswith('\\!') or pattern.startswith('\\#'):
+            pattern = pattern[1:]
+            
+        self.dir_only = pattern.endswith('/')
+        pattern = pattern.rstrip('/')
+        
+        # A slash anywhere but the end anchors the pattern to its base directory
+        anchored = '/' in pattern
+        pattern = pattern.lstrip('/')
+        
+        segments = pattern.split('/')
+        if not anchored:
+            segments = ['**'] + segments
+        if base:
+            segments = base.split('/') + segments
+            
+        self.segments = [self._compile_segment(segment) for segment in segments]
+        # Matching a directory matches everything below it, so the regex also
+        # accepts any suffix; directories are queried with a trailing '/'.
+        self.regex = self._translate(segments) + ('/.*' if self.dir_only else '(?:/.*)?')
+        
+    @staticmethod
+    def _translate_segment(segment: str) -> str:
+        """Translate one path segment (no slashes) to a regex."""
+        if re.fullmatch(r'\*+', segment):
+            # A path segment is never empty
+            return '[^/]+'
+        result = []
+        i, n = 0, len(segment)
+        while i < n:
+            c = segment[i]
+            i += 1
+            if c == '*':
+                while i < n and segment[i] == '*':
+                    i += 1
+                result.append('[^/]*')
+            elif c == '?':
+                result.append('[^/]')
+            elif c == '\\' and i < n:
+                result.append(re.escape(segment[i]))
+                i += 1
+            elif c == '[':
+                end = segment.find(']', i + 1 if i < n and segment[i] in '!^' else i)
+                if end == -1:
+                    result.append('\\[')
+                    continue
+                body = segment[i:end]
+                if body[:1] in ('!', '^'):
+                    body = '^' + body[1:]
+                result.append(f'(?!/)[{body}]')
+                i = end + 1
+            else:
+                result.append(re.escape(c))
+        return ''.join(result)
+        
+    def _translate(self, segments: List[str]) -> str:
+        """Translate path segments to a regex matching the whole path."""
+        parts = []
+        last = len(segments) - 1
+        for index, segment in enumerate(segments):
+            if segment == '**':
+                if index == last:
+                    parts.append('.+')
+                else:
+                    parts.append('(?:.*/)?')
+            else:
+                parts.append(self._translate_segment(segment) + ('' if index == last else '/'))
+        return ''.join(parts)
+        
+    def _compile_segment(self, segment: str):
+        """Compile a segment for directory-level checks."""
+        if segment == '**':
+            return _ANY_DEPTH
+        if re.fullmatch(r'\*+', segment):
+            return _ANY_NAME
+        return re.compile(self._translate_segment(segment))
+        
+    def _match_prefix(self, dir_parts: List[str]) -> Tuple[str, int]:
+        """
+        Walk the rule's segments along a directory path.
+        
+        Returns:
+            ('mismatch', i), ('any_depth', i) when a '**' segment is reached,
+            ('covered', i) when the rule is exhausted by an ancestor, or
+            ('open', i) when the directory is exhausted first
+        """
+        for i, part in enumerate(dir_parts):
+            if i >= len(self.segments):
+                return 'covered', i
+            segment = self.segments[i]
+            if segment is _ANY_DEPTH:
+                return 'any_depth', i
+            if segment is not _ANY_NAME and not segment.fullmatch(part):
+                return 'mismatch', i
+        return 'open', len(dir_parts)
+        
+    def could_match_below(self, dir_parts: List[str]) -> bool:
+        """Check if the rule can match some path below the directory."""
+        state, _ = self._match_prefix(dir_parts)
+        return state != 'mismatch'
+        
+    def covers_below(self, dir_parts: List[str]) -> bool:
+        """Check if the rule matches every path below the directory."""
+        state, i = self._match_prefix(dir_parts)
+        if state == 'covered':
+            return True
+        if state == 'any_depth':
+            return i == len(self.segments) - 1
+        if state == 'open':
+            rest = self.segments[i:]
+            return len(rest) == 1 and rest[0] in (_ANY_NAME, _ANY_DEPTH) and not self.dir_only
+        return False
+        
+class PathSpec:
+    """A list of gitignore patterns compiled into a single regex."""
+    
+    def __init__(self, patterns: Iterable[str], base: str = ''):
+        """
+        Compile patterns.
+        
+        Args:
+            patterns: Pattern lines; blank lines and '#' comments are ignored
+            base: Directory the patterns are relative to ('' for the root)
+        """
+        self.base = base
+        self.rules = []
+        for pattern in patterns:
+            pattern = pattern.rstrip('\r\n')
+            if not pattern.endswith('\\ '):
+                pattern = pattern.rstrip(' ')
+            if not pattern or pattern.startswith('#'):
+                continue
+            self.rules.append(_Rule(pattern, base))
+            
+        self._has_negation = any(rule.negate for rule in self.rules)
+        self._dir_cache: Dict[str, bool] = {}
+        
+        # Later rules win, so the alternation lists them last-to-first and the
+        # first alternative that matches is the rule that decides.
+        if self.rules:
+            alternatives = '|'.join(
+                f'(?P<r{index}>{self.rules[index].regex})'
+                for index in reversed(range(len(self.rules)))
+            )
+            self._regex = re.compile(f'(?:{alternatives})', re.DOTALL)
+        else:
+            self._regex = None
+            
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+        
+    def match(self, path: str, is_dir: bool = False) -> Optional[bool]:
+        """
+        Find the rule deciding a path.
+        
+        Rules matching a parent directory also match the path, but a negated
+        rule can still override them here; matches() applies the gitignore
+        rule that an excluded directory's contents stay excluded.
+        
+        Returns:
+            True if the deciding rule is positive, False if it is negated,
+            None if no rule matches
+        """
+        if self._regex is None:
+            return None
+        m = self._regex.fullmatch(path + '/' if is_dir else path)
+        if m is None:
+            return None
+        if not self._has_negation:
+            return True
+        return not self.rules[int(m.lastgroup[1:])].negate
+        
+    def matches_dir(self, dir_path: str) -> bool:
+        """Check if a directory, or one of its parents, is matched."""
+        if not self._has_negation:
+            return self._regex is not None and self._regex.fullmatch(dir_path + '/') is not None
+        cached = self._dir_cache.get(dir_path)
+        if cached is not None:
+            return cached
+        parent = dir_path.rpartition('/')[0]
+        result = (bool(parent) and self.matches_dir(parent)) or self.match(dir_path, is_dir=True) is True
+        self._dir_cache[dir_path] = result
+        return result
+        
+    def matches(self, path: str) -> bool:
+        """Check if a file is matched, directly or through a parent directory."""
+        if not self._has_negation:
+            return self._regex is not None and self._regex.fullmatch(path) is not None
+        parent = path.rpartition('/')[0]
+        if parent and self.matches_dir(parent):
+            return True
+        return self.match(path) is True
+        
+    def could_match_below(self, dir_path: str) -> bool:
+        """Check if any path below the directory could be matched."""
+        if self.matches_dir(dir_path):
+            return True
+        dir_parts = dir_path.split('/')
+        return any(not rule.negate and rule.could_match_below(dir_parts) for rule in self.rules)
+        
+    def covers_below(self, dir_path: str) -> bool:
+        """Check if every path below the directory is matched."""
+        if self.matches_dir(dir_path):
+            return True
+        dir_parts = dir_path.split('/')
+        for index in reversed(range(len(self.rules))):
+            rule = self.rules[index]
+            if rule.negate:
+                if rule.could_match_below(dir_parts):
+                    return False
+            elif rule.covers_below(dir_parts):
+                return True
+        return False
+        
+class PathMatcher:
+    """Decides which relative paths are reviewed, using gitignore semantics."""
+    
+    def __init__(self, include: Iterable[str] = (), exclude: Iterable[str] = ()):
+        """
+        Compile include/exclude patterns once.
+        
+        Args:
+            include: Patterns a file must match (all files if empty)
+            exclude: Patterns that reject a file; checked before include
+        """
+        self.include_spec = PathSpec(include)
+        self.exclude_spec = PathSpec(exclude)
+        self.ignore_specs: List[PathSpec] = []
+        self._ignore_prefix = ''
+        
+    def use_gitignore(self, directory: str) -> None:
+        """
+        Honour .gitignore files for paths relative to directory.
+        
+        Loads the .gitignore files of the enclosing repository between its
+        root and directory; nested ones are added with load_gitignore() as
+        the tree is walked.
+        
+        Args:
+            directory: Directory that matched paths are relative to
+        """
+        directory = os.path.abspath(directory)
+        repo_root = directory
+        while not os.path.exists(os.path.join(repo_root, '.git')):
+            parent = os.path.dirname(repo_root)
+            if parent == repo_root:
+                repo_root = directory
+                break
+            repo_root = parent
+            
+        prefix = os.path.relpath(directory, repo_root).replace(os.sep, '/')
+        self._ignore_prefix = '' if prefix == '.' else prefix + '/'
+        
+        ancestor = repo_root
+        parts = [] if not self._ignore_prefix else self._ignore_prefix.rstrip('/').split('/')
+        for depth in range(len(parts) + 1):
+            if depth:
+                ancestor = os.path.join(ancestor, parts[depth - 1])
+            if depth < len(parts):
+                self._add_ignore_file(os.path.join(ancestor, '.gitignore'), '/'.join(parts[:depth]))
+                
+    def load_gitignore(self, gitignore_path: str, rel_dir: str = '') -> None:
+        """
+        Add the rules of a .gitignore file found while walking.
+        
+        Args:
+            gitignore_path: Path to the .gitignore file
+            rel_dir: Directory containing it, relative to the walked directory
+        """
+        base = (self._ignore_prefix + rel_dir).rstrip('/')
+        self._add_ignore_file(gitignore_path, base)
+        
+    def _add_ignore_file(self, gitignore_path: str, base: str) -> None:
+        """Compile a .gitignore file if it exists."""
+        try:
+            with open(gitignore_path, 'r', encoding='utf-8') as f:
+                spec = PathSpec(f.read().splitlines(), base)
+        except (FileNotFoundError, PermissionError, UnicodeDecodeError):
+            return
+        if spec:
+            self.ignore_specs.append(spec)
+            
+    def _ignored(self, path: str, is_dir: bool) -> bool:
+        """Check path against the loaded .gitignore rules."""
+        if not self.ignore_specs:
+            return False
+        path = self._ignore_prefix + path
+        for spec in self.ignore_specs:
+            if spec.base and not path.startswith(spec.base + '/'):
+                continue
+            if spec.matches_dir(path) if is_dir else spec.matches(path):
+                return True
+        return False
+        
+    def is_excluded(self, path: str) -> bool:
+        """Check if a file is rejected by exclude patterns or .gitignore rules."""
+        return self.exclude_spec.matches(path) or self._ignored(path, is_dir=False)
+        
+    def is_included(self, path: str) -> bool:
+        """
+        Check if a file should be reviewed.
+        
+        Args:
+            path: File path relative to the scanned directory, '/'-separated
+        """
+        if self.is_excluded(path):
+            return False
+        return not self.include_spec or self.include_spec.matches(path)
+        
+    def could_match_below(self, dir_path: str) -> bool:
+        """
+        Check if any file below a directory could be included.
+        
+        Returns False when the whole directory is excluded or no include
+        pattern can reach it, so a walker can skip it without descending.
+        
+        Args:
+            dir_path: Directory path relative to the scanned directory
+        """
+        if self.exclude_spec.covers_below(dir_path) or self._ignored(dir_path, is_dir=True):
+            return False
+        return not self.include_spec or self.include_spec.could_match_below(dir_path)
@@ -0,0 +1,150 @@
+"""
+Persisted scan index for incremental directory scans.
+"""
+
+import os
+import json
+from typing import Dict, Any, List, Optional, Set
+
+INDEX_VERSION = 1
+
+# Values of FileContent.metadata['scan_status'] for files reported by an indexed scan
+STATUS_ADDED = 'added'
+STATUS_MODIFIED = 'modified'
+
+class ScanIndex:
+    """
+    Remembers (size, mtime_ns, inode, digest) per file between scans.
+    
+    A file whose stat signature matches the index is neither re-read nor
+    re-hashed. A file whose signature changed is re-read, but only reported
+    as modified if its digest changed too.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Open an index file; a missing or unreadable file starts an empty index.
+        
+        Args:
+            path: JSON file the index is stored in
+        """
+        self.path = path
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._seen: Set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        self.deleted: List[str] = []
+        self._load()
+        
+    def _load(self) -> None:
+        """Read the index file if it exists."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                self._entries = data.get('entries', {})
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load scan index {self.path}: {e}")
+            
+    def begin(self) -> None:
+        """Reset per-scan counters."""
+        self._seen = set()
+        self.hits = 0
+        self.misses = 0
+        self.deleted = []
+        
+    def is_unchanged(self, file_path: str, st: os.stat_result) -> bool:
+        """
+        Check a file's stat signature against the index.
+        
+        Args:
+            file_path: Path of the file as scanned
+            st: Result of os.stat for the file
+            
+        Returns:
+            True if the file can be skipped without reading it
+        """
+        key = os.path.abspath(file_path)
+        self._seen.add(key)
+        entry = self._entries.get(key)
+        if (entry is not None and entry['size'] == st.st_size
+                and entry['mtime_ns'] == st.st_mtime_ns and entry['inode'] == st.st_ino):
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+        
+    def record(self, file_path: str, metadata: Dict[str, Any]) -> Optional[str]:
+        """
+        Store a freshly read file's signature.
+        
+        Args:
+            file_path: Path of the file as scanned
+            metadata: FileContent.metadata from FileLoader
+            
+        Returns:
+            'added' or 'modified', or None if the content is unchanged
+        """
+        key = os.path.abspath(file_path)
+        self._seen.add(key)
+        previous = self._entries.get(key)
+        digest = metadata.get('digest')
+        self._entries[key] = {
+            'size': metadata.get('size'),
+            'mtime_ns': metadata.get('mtime_ns'),
+            'inode': metadata.get('inode'),
+            'digest': digest
+        }
+        if previous is None:
+            return STATUS_ADDED
+        if digest is not None and previous.get('digest') == digest:
+            return None
+        return STATUS_MODIFIED
+        
+    def forget(self, file_path: str) -> None:
+        """
+        Drop a file that was read but skipped.
+        
+        Skipped files are not indexed, so they are re-read on the next scan
+        and a change to the loader or classifier settings takes effect
+        without the file being touched. The file still counts as seen.
+        """
+        key = os.path.abspath(file_path)
+        self._seen.add(key)
+        self._entries.pop(key, None)
+        
+    def finish(self, directory: str) -> List[str]:
+        """
+        Close a completed scan of directory and save the index.
+        
+        Entries under directory that were not seen are dropped and reported
+        as deleted.
+        
+        Returns:
+            List of deleted file paths
+        """
+        prefix = os.path.join(os.path.abspath(directory), '')
+        self.deleted = sorted(
+            key for key in self._entries
+            if key.startswith(prefix) and key not in self._seen
+        )
+        for key in self.deleted:
+            del self._entries[key]
+        self.save()
+        return self.deleted
+        
+    def save(self) -> None:
+        """Write the index atomically."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'entries': self._entries}, f)
+        os.replace(tmp_path, self.path)
+        
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/deleted counts for the last scan."""
+        return {'hits': self.hits, 'misses': self.misses, 'deleted': len(self.deleted)}
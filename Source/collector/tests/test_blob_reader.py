@@ -0,0 +1,33 @@
+import subprocess
+from ..blob_reader import GitBlobReader
+
+def git(repo, *args):
+    return subprocess.run(['git', *args], cwd=repo, check=True, capture_output=True, text=True).stdout
+    
+def test_read_many_at_refs(tmp_path):
+    git(tmp_path, 'init', '-q')
+    git(tmp_path, 'config', 'user.email', 'test@example.com')
+    git(tmp_path, 'config', 'user.name', 'Test')
+    for i in range(200):
+        (tmp_path / f'f{i}.py').write_text(f'x = {i}\n' * 500)
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'sub' / 'a b.py').write_text('spaced\n')
+    git(tmp_path, 'add', '.')
+    git(tmp_path, 'commit', '-q', '-m', 'first')
+    (tmp_path / 'f0.py').write_text('changed\n')
+    git(tmp_path, 'commit', '-q', '-am', 'second')
+    
+    with GitBlobReader(str(tmp_path)) as reader:
+        paths = [f'f{i}.py' for i in range(200)] + ['sub/a b.py', 'missing.py', 'sub']
+        blobs = reader.read_many('HEAD~1', paths)
+        
+        assert blobs['f0.py'].text() == 'x = 0\n' * 500
+        assert blobs['f199.py'].text() == 'x = 199\n' * 500
+        assert blobs['sub/a b.py'].text() == 'spaced\n'
+        assert blobs['missing.py'] is None
+        assert blobs['sub'] is None
+        
+        head = reader.read('HEAD', 'f0.py')
+        assert head.text() == 'changed\n'
+        assert head.sha == git(tmp_path, 'rev-parse', 'HEAD:f0.py').strip()
+        assert reader.read_object(head.sha).data == b'changed\n'
@@ -0,0 +1,153 @@
+import subprocess
+import pytest
+import yaml
+from ..classifier import FileClassifier, CLASS_GENERATED, CLASS_MINIFIED, CLASS_LOCKFILE, CLASS_VENDORED
+from ..directory_scanner import DirectoryScanner
+from ..git_diff import GitDiffCollector
+from ..models import FileContent
+from ..file_loader import FileLoader
+from ...cache.review_cache import content_id
+from ...context.file_context_builder import FileContextBuilder
+from ...utils.token_estimator import TokenEstimator
+
+def test_filename_signals():
+    classifier = FileClassifier()
+    
+    assert classifier.classify('package-lock.json') == CLASS_LOCKFILE
+    assert classifier.classify('backend/poetry.lock') == CLASS_LOCKFILE
+    assert classifier.classify('vendor/github.com/x/y.go') == CLASS_VENDORED
+    assert classifier.classify('web/node_modules/react/index.js') == CLASS_VENDORED
+    assert classifier.classify('api/service.pb.go') == CLASS_GENERATED
+    assert classifier.classify('proto/service_pb2.py') == CLASS_GENERATED
+    assert classifier.classify('src/__snapshots__/app.test.js.snap') == CLASS_GENERATED
+    assert classifier.classify('static/app.min.js') == CLASS_MINIFIED
+    assert classifier.classify('src/main.py', 'def main():\n    pass\n') is None
+    
+def test_content_signals():
+    classifier = FileClassifier()
+    
+    assert classifier.classify('api/client.go', '// Code generated by openapi-gen. DO NOT EDIT.\npackage api\n') == CLASS_GENERATED
+    assert classifier.classify('schema.ts', '/* @generated */\nexport type A = 1;\n') == CLASS_GENERATED
+    assert classifier.classify('bundle.js', 'var a=1;' * 500) == CLASS_MINIFIED
+    assert classifier.classify('data.js', 'x = 1\n' * 300 + 'y = "' + 'z' * 3000 + '"\n') == CLASS_MINIFIED
+    assert classifier.classify('notes.py', '# values generated by the lexer\n' * 50) is None
+    
+def test_gitattributes_override(tmp_path):
+    (tmp_path / '.gitattributes').write_text(
+        'gen/** linguist-generated\n'
+        'api/*.pb.go -linguist-generated\n'
+        'libs/** linguist-vendored=true\n'
+        'vendor/** linguist-vendored=false\n'
+    )
+    classifier = FileClassifier()
+    classifier.load_gitattributes(str(tmp_path))
+    
+    assert classifier.classify('gen/models.py') == CLASS_GENERATED
+    assert classifier.classify('api/service.pb.go', 'package api\n') is None
+    assert classifier.classify('libs/jquery.js') == CLASS_VENDORED
+    assert classifier.classify('vendor/our_code.py') is None
+    
+def test_policy_skip_and_summarize():
+    classifier = FileClassifier({'lockfile': 'summarize', 'minified': 'review'})
+    lockfile = FileContent(path='/r/yarn.lock', content='a\nb\n', metadata={'line_count': 2, 'size': 4})
+    generated = FileContent(path='/r/x_pb2.py', content='x = 1\n', metadata={})
+    minified = FileContent(path='/r/a.min.js', content='var a', metadata={})
+    
+    classifier.apply(lockfile, 'yarn.lock')
+    classifier.apply(generated, 'x_pb2.py')
+    classifier.apply(minified, 'a.min.js')
+    
+    assert lockfile.content == '[lockfile file (2 lines, 4 bytes); content omitted from review]\n'
+    assert lockfile.metadata['summarized'] is True
+    assert generated.content == '' and generated.metadata['skipped'] == {'reason': 'generated'}
+    assert minified.content == 'var a' and minified.metadata['classification'] == 'minified'
+    assert classifier.stats() == {'generated': 1, 'minified': 1, 'lockfile': 1, 'vendored': 0}
+    
+def test_summary_does_not_share_digest_with_identical_source(tmp_path):
+    body = ''.join(f"def function_{i}(value):\n    return value * {i}\n" for i in range(200))
+    for rel_path in ('vendor/lib.py', 'src/lib.py'):
+        (tmp_path / rel_path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel_path).write_text(body)
+    classifier = FileClassifier({'vendored': 'summarize'})
+    
+    def load():
+        loader = FileLoader()
+        files = {}
+        for rel_path in ('vendor/lib.py', 'src/lib.py'):
+            files[rel_path] = classifier.apply(loader.load(str(tmp_path / rel_path)), rel_path)
+        return files
+        
+    files = load()
+    assert files['vendor/lib.py'].metadata['summarized'] is True
+    assert files['vendor/lib.py'].metadata['digest'] != files['src/lib.py'].metadata['digest']
+    
+    counts = []
+    for order in (['vendor/lib.py', 'src/lib.py'], ['src/lib.py', 'vendor/lib.py']):
+        estimator, files = TokenEstimator(), load()
+        counts.append({rel_path: estimator.count_file(files[rel_path]) for rel_path in order})
+    assert counts[0] == counts[1]
+    assert counts[0]['src/lib.py'] > 10 * counts[0]['vendor/lib.py']
+    
+    builder = FileContextBuilder()
+    contexts = [
+        builder.build({'file_path': f.path, 'content': f.content, 'metadata': f.metadata}) for f in files.values()
+    ]
+    assert content_id(contexts[0]) != content_id(contexts[1])
+    
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        FileClassifier({'lockfile': 'ignore'})
+    with pytest.raises(ValueError):
+        FileClassifier({'huge': 'skip'})
+        
+def test_scanner_skips_classified_files(tmp_path):
+    files = {
+        'src/main.js': 'console.log(1);\n',
+        'src/app.min.js': 'var a=1;',
+        'package-lock.json': '{}\n',
+        'third_party/lib.js': 'x = 1;\n'
+    }
+    for rel_path, content in files.items():
+        path = tmp_path / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    config_path = tmp_path / 'codereview.yaml'
+    config_path.write_text(yaml.dump({'include': ['*.js', '*.json'], 'scan': {'enumerator': 'filesystem'}}))
+    
+    scanner = DirectoryScanner(str(config_path))
+    results = scanner.scan(str(tmp_path))
+    
+    assert [r.path for r in results] == [str(tmp_path / 'src' / 'main.js')]
+    assert scanner.skip_counts() == {'lockfile': 1, 'minified': 1, 'vendored': 1}
+    
+def test_scanner_classification_can_be_disabled(tmp_path):
+    (tmp_path / 'yarn.lock').write_text('x\n')
+    config_path = tmp_path / 'codereview.yaml'
+    config_path.write_text(yaml.dump({'exclude': ['*.yaml'], 'classify': {'enabled': False}}))
+    
+    assert len(DirectoryScanner(str(config_path)).scan(str(tmp_path))) == 1
+    
+def test_diff_collector_skips_classified_files(tmp_path):
+    def git(*args):
+        subprocess.run(['git', *args], cwd=tmp_path, check=True, capture_output=True)
+    git('init', '-q')
+    git('config', 'user.email', 'dev@example.com')
+    git('config', 'user.name', 'Dev')
+    (tmp_path / 'main.py').write_text('x = 1\n')
+    git('add', '.')
+    git('commit', '-q', '-m', 'first')
+    (tmp_path / 'main.py').write_text('x = 2\n')
+    (tmp_path / 'Cargo.lock').write_text('[[package]]\nname = "a"\n')
+    git('add', '.')
+    git('commit', '-q', '-m', 'second')
+    
+    collector = GitDiffCollector(str(tmp_path), classifier=FileClassifier())
+    results = collector.collect('HEAD~1..HEAD')
+    
+    assert [r['file_path'] for r in results] == ['main.py']
+    assert collector.skip_counts() == {'lockfile': 1}
+    
+    summarizing = GitDiffCollector(str(tmp_path), classifier=FileClassifier({'lockfile': 'summarize'}))
+    lockfile = summarizing.collect('HEAD~1..HEAD')[0]
+    assert lockfile['hunks'] == []
+    assert lockfile['summary'] == '[lockfile file (2 lines added, 0 lines removed); content omitted from review]\n'
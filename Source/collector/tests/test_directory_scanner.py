@@ -0,0 +1,174 @@
+import subprocess
+import pytest
+import yaml
+from ..directory_scanner import DirectoryScanner
+from ..collector import Directory
+
+def write_files(root, files):
+    for rel_path, content in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        
+def write_config(root, config):
+    config_path = root / 'codereview.yaml'
+    config_path.write_text(yaml.dump(config))
+    return str(config_path)
+    
+def test_scan_returns_files_in_walk_order(tmp_path):
+    write_files(tmp_path, {
+        'src/b.py': 'b = 1',
+        'src/a.py': 'a = 1',
+        'src/pkg/c.py': 'c = 1',
+        'main.py': 'main = 1',
+        'README.md': '# readme'
+    })
+    config_path = write_config(tmp_path, {'include': ['*.py'], 'scan': {'workers': 3}})
+    
+    scanner = DirectoryScanner(config_path)
+    results = scanner.scan(str(tmp_path))
+    
+    assert scanner.workers == 3
+    assert [r.path for r in results] == [
+        str(tmp_path / 'main.py'),
+        str(tmp_path / 'src' / 'a.py'),
+        str(tmp_path / 'src' / 'b.py'),
+        str(tmp_path / 'src' / 'pkg' / 'c.py')
+    ]
+    assert results[1].content == 'a = 1'
+    
+def test_scan_prunes_excluded_directories(tmp_path, monkeypatch):
+    write_files(tmp_path, {
+        'src/main.py': 'x = 1',
+        'node_modules/lib/index.py': 'y = 1',
+        'build/out.py': 'z = 1'
+    })
+    config_path = write_config(tmp_path, {
+        'include': ['*.py'],
+        'exclude': ['node_modules/*', 'build/*']
+    })
+    
+    scanner = DirectoryScanner(config_path)
+    visited = []
+    original_walk = scanner._walk
+    
+    def tracking_walk(directory, matcher, rel_dir=''):
+        visited.append(rel_dir)
+        return original_walk(directory, matcher, rel_dir)
+        
+    monkeypatch.setattr(scanner, '_walk', tracking_walk)
+    results = scanner.scan(str(tmp_path))
+    
+    assert [r.path for r in results] == [str(tmp_path / 'src' / 'main.py')]
+    assert 'node_modules' not in visited
+    assert 'build' not in visited
+    
+def test_scan_honours_gitignore(tmp_path):
+    write_files(tmp_path, {
+        '.gitignore': 'generated/\n*.log\n',
+        'src/.gitignore': '/local.py\n',
+        'src/main.py': 'x = 1',
+        'src/local.py': 'y = 1',
+        'src/pkg/local.py': 'z = 1',
+        'generated/out.py': 'g = 1',
+        'debug.log': 'log'
+    })
+    config_path = write_config(tmp_path, {'exclude': ['*.yaml', '.gitignore'], 'scan': {'gitignore': True}})
+    
+    results = DirectoryScanner(config_path).scan(str(tmp_path))
+    
+    assert [r.path for r in results] == [
+        str(tmp_path / 'src' / 'main.py'),
+        str(tmp_path / 'src' / 'pkg' / 'local.py')
+    ]
+    
+def test_scan_missing_directory(tmp_path):
+    scanner = DirectoryScanner('missing.yaml')
+    with pytest.raises(FileNotFoundError):
+        scanner.scan(str(tmp_path / 'missing'))
+        
+def test_iter_scan_reads_ahead_at_most_prefetch_files(tmp_path, monkeypatch):
+    write_files(tmp_path, {f'f{i:02d}.py': f'x = {i}' for i in range(20)})
+    config_path = write_config(tmp_path, {'include': ['*.py'], 'scan': {'workers': 2, 'prefetch': 3}})
+    
+    scanner = DirectoryScanner(config_path)
+    loaded = []
+    original_load = scanner._load
+    
+    def tracking_load(loader, file_path, rel_path):
+        loaded.append(file_path)
+        return original_load(loader, file_path, rel_path)
+        
+    monkeypatch.setattr(scanner, '_load', tracking_load)
+    files = scanner.iter_scan(str(tmp_path))
+    
+    first = next(files)
+    assert first.path == str(tmp_path / 'f00.py')
+    assert len(loaded) <= 3
+    
+    files.close()
+    assert len(loaded) <= 4
+    
+def test_iter_scan_matches_scan(tmp_path):
+    write_files(tmp_path, {'a.py': 'a', 'b/c.py': 'c', 'b/d.txt': 'd'})
+    config_path = write_config(tmp_path, {'include': ['*.py']})
+    
+    collector = Directory(config_path)
+    
+    assert [f.path for f in collector.iter_collect(str(tmp_path))] == \
+        [f.path for f in collector.collect(str(tmp_path))]
+        
+def test_iter_scan_validates_directory_eagerly(tmp_path):
+    scanner = DirectoryScanner('missing.yaml')
+    with pytest.raises(FileNotFoundError):
+        scanner.iter_scan(str(tmp_path / 'missing'))
+        
+def test_scan_skips_binary_files_without_aborting(tmp_path):
+    write_files(tmp_path, {'a.py': 'a = 1', 'c.py': 'c = 1'})
+    (tmp_path / 'b.so').write_bytes(b'\x7fELF\x00\x00\xff\xfe')
+    config_path = write_config(tmp_path, {'exclude': ['*.yaml']})
+    
+    scanner = DirectoryScanner(config_path)
+    results = scanner.scan(str(tmp_path))
+    
+    assert [r.path for r in results] == [str(tmp_path / 'a.py'), str(tmp_path / 'c.py')]
+    assert [(s.path, s.metadata['skipped']['reason']) for s in scanner.skipped] == [
+        (str(tmp_path / 'b.so'), 'binary')
+    ]
+    
+def git(repo, *args):
+    subprocess.run(['git', *args], cwd=repo, check=True, capture_output=True)
+    
+def test_scan_enumerates_git_index_inside_work_tree(tmp_path, monkeypatch):
+    git(tmp_path, 'init', '-q')
+    write_files(tmp_path, {
+        '.gitignore': 'venv/\nbuild/\n',
+        'src/main.py': 'x = 1',
+        'src/new.py': 'n = 1',
+        'venv/lib/site.py': 's = 1',
+        'build/out.py': 'o = 1'
+    })
+    git(tmp_path, 'add', '.gitignore', 'src/main.py')
+    config_path = write_config(tmp_path, {'include': ['*.py']})
+    
+    scanner = DirectoryScanner(config_path)
+    monkeypatch.setattr(scanner, '_walk', lambda *args: pytest.fail('filesystem walked'))
+    
+    assert [r.path for r in scanner.scan(str(tmp_path))] == [
+        str(tmp_path / 'src' / 'main.py'),
+        str(tmp_path / 'src' / 'new.py')
+    ]
+    assert [r.path for r in scanner.scan(str(tmp_path / 'src'))] == [
+        str(tmp_path / 'src' / 'main.py'),
+        str(tmp_path / 'src' / 'new.py')
+    ]
+    
+    scanner.include_untracked = False
+    assert [r.path for r in scanner.scan(str(tmp_path))] == [str(tmp_path / 'src' / 'main.py')]
+    
+def test_scan_filesystem_enumerator_walks_inside_work_tree(tmp_path):
+    git(tmp_path, 'init', '-q')
+    write_files(tmp_path, {'.gitignore': 'venv/\n', 'venv/site.py': 's = 1'})
+    config_path = write_config(tmp_path, {'include': ['*.py'], 'scan': {'enumerator': 'filesystem'}})
+    
+    assert [r.path for r in DirectoryScanner(config_path).scan(str(tmp_path))] == [str(tmp_path / 'venv' / 'site.py')]
@@ -0,0 +1,81 @@
+import pytest
+from ..file_loader import FileLoader, LoadPolicy, SKIP_BINARY, SKIP_TOO_LARGE, SKIP_UNDECODABLE
+from ...utils.hashing import digest_bytes
+
+def test_load_text_file(tmp_path):
+    path = tmp_path / 'main.py'
+    path.write_bytes(b'def main():\r\n    pass\r\n')
+    
+    result = FileLoader().load(str(path))
+    
+    assert result.content == 'def main():\n    pass\n'
+    assert result.metadata['language'] == 'python'
+    assert result.metadata['encoding'] == 'utf-8'
+    assert 'skipped' not in result.metadata
+    
+def test_binary_file_is_skipped(tmp_path):
+    path = tmp_path / 'image.png'
+    path.write_bytes(b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR')
+    
+    result = FileLoader().load(str(path))
+    
+    assert result.content == ''
+    assert result.metadata['skipped'] == {'reason': SKIP_BINARY}
+    
+def test_large_file_is_skipped_without_reading(tmp_path):
+    path = tmp_path / 'bundle.js'
+    path.write_text('x' * 2048)
+    
+    result = FileLoader(LoadPolicy(max_size=1024)).load(str(path))
+    
+    assert result.metadata['size'] == 2048
+    assert result.metadata['skipped'] == {'reason': SKIP_TOO_LARGE, 'max_size': 1024}
+    
+def test_mmap_read_matches_buffered_read(tmp_path):
+    path = tmp_path / 'big.py'
+    path.write_text('print("héllo")\n' * 1000, encoding='utf-8')
+    
+    mapped = FileLoader(LoadPolicy(mmap_threshold=1)).load(str(path))
+    buffered = FileLoader(LoadPolicy(mmap_threshold=10 ** 9)).load(str(path))
+    
+    assert mapped.content == buffered.content == path.read_text(encoding='utf-8')
+    
+def test_encoding_detection(tmp_path):
+    bom_path = tmp_path / 'bom.py'
+    bom_path.write_bytes('\ufeffx = "ü"\n'.encode('utf-8'))
+    utf16_path = tmp_path / 'wide.txt'
+    utf16_path.write_text('hello', encoding='utf-16')
+    latin_path = tmp_path / 'legacy.py'
+    latin_path.write_bytes('x = "café"\n'.encode('latin-1'))
+    
+    assert FileLoader().load(str(bom_path)).content == 'x = "ü"\n'
+    assert FileLoader().load(str(utf16_path)).content == 'hello'
+    assert FileLoader().load(str(latin_path)).metadata['skipped'] == {'reason': SKIP_UNDECODABLE}
+    
+    fallback = FileLoader(LoadPolicy(fallback_encoding='latin-1')).load(str(latin_path))
+    assert fallback.content == 'x = "café"\n'
+    assert fallback.metadata['encoding'] == 'latin-1'
+    
+def test_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        FileLoader().load(str(tmp_path / 'missing.py'))
+        
+def test_metadata_is_derived_from_a_single_read(tmp_path):
+    path = tmp_path / 'main.py'
+    raw = 'a = 1\nb = "é"\nc = 3'.encode('utf-8')
+    path.write_bytes(raw)
+    st = path.stat()
+    
+    metadata = FileLoader().load(str(path)).metadata
+    
+    assert metadata['size'] == len(raw)
+    assert metadata['mtime_ns'] == st.st_mtime_ns
+    assert metadata['inode'] == st.st_ino
+    assert metadata['digest'] == digest_bytes(raw)
+    assert metadata['line_count'] == 3
+    
+def test_language_sniffed_from_loaded_bytes(tmp_path):
+    path = tmp_path / 'deploy'
+    path.write_text('#!/usr/bin/env bash\necho hi\n')
+    
+    assert FileLoader().load(str(path)).metadata['language'] == 'shell'
@@ -0,0 +1,173 @@
+import subprocess
+import pytest
+from ..git_diff import DiffParser, GitDiffCollector
+
+SAMPLE_DIFF = """diff --git a/src/main.py b/src/main.py
+index 1111111..2222222 100644
+--- a/src/main.py
++++ b/src/main.py
+@@ -10,4 +10,4 @@ def main():
+ context = 1
+--- removed comment
++-- added comment
+ more = 2
+-old_last
+\\ No newline at end of file
++new_last
+\\ No newline at end of file
+diff --git a/old_name.py b/new_name.py
+similarity index 90%
+rename from old_name.py
+rename to new_name.py
+index 3333333..4444444 100644
+--- a/old_name.py
++++ b/new_name.py
+@@ -1 +1 @@
+-x = 1
++x = 2
+diff --git a/logo.png b/logo.png
+new file mode 100644
+index 0000000..5555555
+Binary files /dev/null and b/logo.png differ
+"""
+
+def parse(text):
+    parser = DiffParser()
+    results = []
+    for line in text.splitlines():
+        results.extend(parser.feed(line))
+    results.extend(parser.finish())
+    return results
+    
+def test_parser_reads_full_hunk_header_and_markers():
+    main, renamed, binary = parse(SAMPLE_DIFF)
+    
+    hunk = main['hunks'][0]
+    assert main['file_path'] == 'src/main.py'
+    assert main['status'] == 'modified'
+    assert (hunk['old_start'], hunk['old_count']) == (10, 4)
+    assert (hunk['start_line'], hunk['new_count']) == (10, 4)
+    assert hunk['end_line'] == 13
+    assert hunk['before'] == '-- removed comment\nold_last'
+    assert hunk['after'] == '-- added comment\nnew_last'
+    assert (hunk['added_lines'], hunk['removed_lines']) == ([11, 13], [11, 13])
+    
+    assert renamed['status'] == 'renamed'
+    assert (renamed['old_path'], renamed['file_path']) == ('old_name.py', 'new_name.py')
+    assert renamed['hunks'][0]['old_count'] == 1
+    
+    assert binary['status'] == 'added'
+    assert binary['binary'] is True
+    assert binary['hunks'] == []
+    
+def test_parser_yields_each_file_when_the_next_one_starts():
+    parser = DiffParser()
+    lines = SAMPLE_DIFF.splitlines()
+    second_file = lines.index('diff --git a/old_name.py b/new_name.py')
+    
+    for line in lines[:second_file]:
+        assert list(parser.feed(line)) == []
+    assert [f['file_path'] for f in parser.feed(lines[second_file])] == ['src/main.py']
+    
+def test_parser_takes_paths_from_file_headers():
+    diff = """diff --git a/docs b/x.md b/docs b/x.md
+index 1111111..2222222 100644
+--- a/docs b/x.md\t
++++ b/docs b/x.md\t
+@@ -1 +1 @@
+-a
++b
+diff --git "a/caf\\303\\251.py" "b/caf\\303\\251 \\"new\\".py"
+similarity index 90%
+rename from "caf\\303\\251.py"
+rename to "caf\\303\\251 \\"new\\".py"
+diff --git a/my b/file.bin b/my b/file.bin
+new file mode 100644
+index 0000000..5555555
+Binary files /dev/null and "b/my b/file.bin" differ
+"""
+    spaced, renamed, binary = parse(diff)
+    
+    assert (spaced['old_path'], spaced['file_path']) == ('docs b/x.md', 'docs b/x.md')
+    assert (renamed['old_path'], renamed['file_path']) == ('caf\u00e9.py', 'caf\u00e9 "new".py')
+    assert binary['file_path'] == 'my b/file.bin'
+    
+def test_parser_rejects_unparseable_hunk_header():
+    lines = ['diff --git a/x.py b/x.py', '--- a/x.py', '+++ b/x.py', '@@ -one +1 @@', '-a', '+b']
+    
+    with pytest.raises(ValueError, match="Failed to parse hunk header"):
+        parse('\n'.join(lines))
+        
+def git(repo, *args):
+    subprocess.run(['git', *args], cwd=repo, check=True, capture_output=True)
+    
+@pytest.fixture
+def repo(tmp_path):
+    git(tmp_path, 'init', '-q')
+    git(tmp_path, 'config', 'user.email', 'test@example.com')
+    git(tmp_path, 'config', 'user.name', 'Test')
+    (tmp_path / 'a.py').write_text('a = 1\nb = 2\n')
+    git(tmp_path, 'add', '.')
+    git(tmp_path, 'commit', '-q', '-m', 'first')
+    (tmp_path / 'a.py').write_text('a = 1\nb = 3\n')
+    (tmp_path / 'c.py').write_text('c = 1\n')
+    git(tmp_path, 'add', '.')
+    git(tmp_path, 'commit', '-q', '-m', 'second')
+    return tmp_path
+    
+def test_collector_streams_git_diff(repo):
+    collector = GitDiffCollector(str(repo))
+    
+    results = list(collector.iter_collect('HEAD~1..HEAD'))
+    
+    assert [(r['file_path'], r['status']) for r in results] == [('a.py', 'modified'), ('c.py', 'added')]
+    assert results[0]['hunks'][0]['after'] == 'b = 3\n'
+    assert collector.collect('HEAD~1..HEAD') == results
+    
+def test_collector_invalid_ref(repo):
+    with pytest.raises(ValueError, match="Invalid Git reference"):
+        GitDiffCollector(str(repo)).collect('missing..HEAD')
+        
+def test_collector_survives_noisy_stderr(repo, monkeypatch):
+    popen = subprocess.Popen
+    
+    def noisy_popen(command, **kwargs):
+        # Write more than a pipe buffer of warnings before running git
+        script = 'head -c 262144 /dev/zero | tr "\\0" w >&2; exec "$@"'
+        return popen(['sh', '-c', script, 'sh', *command], **kwargs)
+        
+    monkeypatch.setattr(subprocess, 'Popen', noisy_popen)
+    
+    results = GitDiffCollector(str(repo)).collect('HEAD~1..HEAD')
+    
+    assert [r['file_path'] for r in results] == ['a.py', 'c.py']
+    
+def test_collector_attaches_full_content_with_one_reader(repo):
+    collector = GitDiffCollector(str(repo), full_content=True)
+    
+    results = collector.collect('HEAD~1..HEAD')
+    
+    assert results[0]['full_content'] == 'a = 1\nb = 3\n'
+    assert results[1]['full_content'] == 'c = 1\n'
+    assert len(results[0]['blob_id']) == 40
+    reader_process = collector._blob_reader._process
+    collector.collect('HEAD~1..HEAD')
+    assert collector._blob_reader._process is reader_process
+    collector.close()
+    
+def test_collector_ignores_user_prefix_and_quoting_settings(repo):
+    git(repo, 'config', 'diff.noprefix', 'true')
+    git(repo, 'config', 'core.quotePath', 'true')
+    (repo / 'docs b').mkdir()
+    (repo / 'docs b' / 'caf\u00e9.py').write_text('x = 1\n')
+    git(repo, 'add', '.')
+    git(repo, 'commit', '-q', '-m', 'third')
+    
+    results = GitDiffCollector(str(repo)).collect('HEAD~1..HEAD')
+    
+    assert [(r['file_path'], r['old_path']) for r in results] == [('docs b/caf\u00e9.py', 'docs b/caf\u00e9.py')]
+    
+def test_collector_attaches_language(repo):
+    results = GitDiffCollector(str(repo)).collect('HEAD~1..HEAD')
+    
+    assert [r['language'] for r in results] == ['python', 'python']
@@ -0,0 +1,54 @@
+from ..path_matcher import PathMatcher, PathSpec
+
+def test_unanchored_patterns_match_at_any_depth():
+    spec = PathSpec(['*.py'])
+    
+    assert spec.matches('main.py')
+    assert spec.matches('src/pkg/main.py')
+    assert not spec.matches('src/main.js')
+    
+def test_anchored_patterns_and_double_star():
+    spec = PathSpec(['/build', 'src/**/test_*.py', 'docs/**'])
+    
+    assert spec.matches('build/out.js')
+    assert not spec.matches('lib/build/out.js')
+    assert spec.matches('src/test_a.py')
+    assert spec.matches('src/a/b/test_a.py')
+    assert not spec.matches('lib/test_a.py')
+    assert spec.matches('docs/a/b.md')
+    assert not spec.match('docs', is_dir=True)
+    
+def test_negation_and_directory_only_rules():
+    spec = PathSpec(['*.log', '!keep.log', 'tmp/'])
+    
+    assert spec.matches('a/debug.log')
+    assert not spec.matches('a/keep.log')
+    assert spec.matches('tmp/file.txt')
+    assert not spec.matches('src/tmp')
+    
+def test_matcher_include_and_exclude():
+    matcher = PathMatcher(include=['src/**', '*.md'], exclude=['tests/*', '*.test.*'])
+    
+    assert matcher.is_included('src/main.py')
+    assert matcher.is_included('README.md')
+    assert not matcher.is_included('lib/main.py')
+    assert not matcher.is_included('src/main.test.js')
+    assert not matcher.is_included('tests/a/b.md')
+    
+def test_could_match_below():
+    matcher = PathMatcher(include=['src/**', 'tools/*.py'], exclude=['node_modules/*', '*/dist/*'])
+    
+    assert matcher.could_match_below('src')
+    assert matcher.could_match_below('src/pkg')
+    assert matcher.could_match_below('tools')
+    assert not matcher.could_match_below('tools/sub')
+    assert not matcher.could_match_below('docs')
+    assert not matcher.could_match_below('node_modules')
+    assert not matcher.could_match_below('src/dist')
+    
+def test_could_match_below_respects_negation():
+    matcher = PathMatcher(exclude=['vendor/*', '!vendor/ours'])
+    
+    assert matcher.could_match_below('vendor')
+    assert matcher.is_included('vendor/ours/a.py')
+    assert not matcher.is_included('vendor/theirs/a.py')
@@ -0,0 +1,60 @@
+import os
+from ..collector import Directory
+from ..scan_index import ScanIndex
+
+def test_second_scan_reads_only_changed_files(tmp_path):
+    source = tmp_path / 'src'
+    source.mkdir()
+    for name in ('a.py', 'b.py', 'c.py'):
+        (source / name).write_text(f'{name} = 1\n')
+    index_path = str(tmp_path / 'index' / 'scan_index.json')
+    
+    first = Directory('missing.yaml', index_path=index_path)
+    results = first.collect(str(source))
+    assert [r.metadata['scan_status'] for r in results] == ['added'] * 3
+    assert first.index.stats() == {'hits': 0, 'misses': 3, 'deleted': 0}
+    
+    (source / 'b.py').write_text('b = 2  # changed\n')
+    (source / 'c.py').unlink()
+    (source / 'd.py').write_text('d = 1\n')
+    
+    second = Directory('missing.yaml', index_path=index_path)
+    results = second.collect(str(source))
+    
+    assert [(os.path.basename(r.path), r.metadata['scan_status']) for r in results] == [
+        ('b.py', 'modified'),
+        ('d.py', 'added')
+    ]
+    assert second.index.stats() == {'hits': 1, 'misses': 2, 'deleted': 1}
+    assert second.index.deleted == [str(source / 'c.py')]
+    
+def test_touched_file_with_same_content_is_not_reported(tmp_path):
+    path = tmp_path / 'a.py'
+    path.write_text('a = 1\n')
+    index = ScanIndex(str(tmp_path / 'index.json'))
+    
+    Directory('missing.yaml', index_path=index.path).collect(str(tmp_path))
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    
+    collector = Directory('missing.yaml', index_path=index.path)
+    assert [r.path for r in collector.collect(str(tmp_path)) if r.path.endswith('a.py')] == []
+    assert collector.index.stats()['misses'] >= 1
+    
+def test_skipped_files_are_rechecked_after_policy_change(tmp_path):
+    source = tmp_path / 'src'
+    source.mkdir()
+    (source / 'a.py').write_text('a = 1\n')
+    (source / 'api_pb2.py').write_text('message = 1\n')
+    index_path = str(tmp_path / 'index.json')
+    config_path = tmp_path / 'codereview.yaml'
+    config_path.write_text('classify:\n  generated: skip\n')
+    
+    first = Directory(str(config_path), index_path=index_path)
+    assert [os.path.basename(r.path) for r in first.collect(str(source))] == ['a.py']
+    
+    config_path.write_text('classify:\n  generated: review\n')
+    second = Directory(str(config_path), index_path=index_path)
+    
+    assert [os.path.basename(r.path) for r in second.collect(str(source))] == ['api_pb2.py']
+    assert second.index.deleted == []
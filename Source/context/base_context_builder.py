@@ -1,15 +1,40 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Callable, Iterable, Iterator
 from ..utils.language_utils import get_language_from_extension
+from .windowing import ContextWindower, estimate_tokens
 
 class BaseContextBuilder(ABC):
     """Base class for all context builders"""
     
+    def __init__(self, token_budget: Optional[int] = None, context_lines: int = 20,
+                 estimator: Optional[Callable[[str], int]] = None):
+        """
+        Initialize the builder.
+        
+        Args:
+            token_budget: Maximum content tokens per request; None disables windowing
+            context_lines: Lines of context kept around each changed range
+            estimator: Token counter, e.g. a TokenEstimator; defaults to 4 characters per token
+        """
+        self.windower = None
+        if token_budget:
+            self.windower = ContextWindower(token_budget, context_lines, estimator=estimator or estimate_tokens)
+            
     @abstractmethod
     def build(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Build context from input data"""
         pass
-
+        
+    def build_all(self, items: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Build contexts lazily, one per input item.
+        
+        Pairs with a collector's iter_collect() and SpoolWriter.write_all() to
+        stream contexts to disk without holding them in memory.
+        """
+        for item in items:
+            yield self.build(item)
+            
     def _get_language(self, file_path: str) -> str:
         """Determine language from file extension"""
-        return get_language_from_extension(file_path) 
\ No newline at end of file
+        return get_language_from_extension(file_path)
\ No newline at end of file
@@ -0,0 +1,140 @@
+"""
+Content-addressed deduplication of review units before LLM dispatch.
+"""
+
+import bisect
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Tuple, Optional
+from ..cache.review_cache import canonical_json, ruleset_digest
+from ..utils.hashing import digest_text
+
+# A segment is a contiguous piece of reviewed code: (start_line, normalized text)
+Segment = Tuple[int, str]
+
+def normalize(text: str) -> str:
+    """Normalize line endings and trailing whitespace so cosmetic differences don't split keys."""
+    return '\n'.join(line.rstrip() for line in text.replace('\r\n', '\n').split('\n'))
+    
+def segments(context: Dict[str, Any]) -> Optional[List[Segment]]:
+    """
+    Split a context into the code segments it reviews, in prompt order.
+    
+    Returns:
+        List of segments, or None for contexts that aren't deduplicated
+        (directory batches)
+    """
+    if context.get('review_type') == 'directory':
+        return None
+    result: List[Segment] = []
+    changes = context.get('changes')
+    if changes:
+        for hunk in changes['hunks']:
+            text = f"{normalize(hunk.get('before') or '')}\x00{normalize(hunk.get('after') or '')}"
+            result.append((hunk['start_line'], text))
+    if 'windows' in context:
+        result.extend((w['start_line'], normalize(w['content'])) for w in context['windows'])
+    elif context.get('full_content') is not None:
+        result.append((1, normalize(context['full_content'])))
+    return result
+    
+@dataclass
+class ReviewUnit:
+    """One representative context plus the contexts with identical content."""
+    key: str
+    context: Dict[str, Any]
+    rules: List[Dict[str, Any]]
+    duplicates: List[Dict[str, Any]] = field(default_factory=list)
+    
+class Deduplicator:
+    """
+    Collapses review units with identical content and rule set.
+    
+    Each unit is keyed on its normalized code (without paths or line
+    numbers), its language and the digest of its resolved rules. Only the
+    first context per key is sent; ``expand`` maps the representative's
+    findings back to every duplicate, shifting line numbers by the offset
+    between the matching segments.
+    """
+    
+    def __init__(self):
+        self._units: Dict[str, ReviewUnit] = {}
+        self._unique: List[ReviewUnit] = []
+        self.total = 0
+        
+    @staticmethod
+    def key(context: Dict[str, Any], rules: List[Dict[str, Any]]) -> Optional[str]:
+        """
+        Compute the dedup key of a context reviewed against rules.
+        
+        Returns:
+            str key, or None if the context is never deduplicated
+            (directory batches, and contexts without code such as binary
+            diffs, pure renames and classifier summaries)
+        """
+        parts = segments(context)
+        if not parts:
+            return None
+        content = canonical_json({
+            'language': context.get('language'),
+            'segments': [text for _, text in parts]
+        })
+        return f"{digest_text(content)}:{ruleset_digest(rules)}"
+        
+    def add(self, context: Dict[str, Any], rules: List[Dict[str, Any]]) -> bool:
+        """
+        Add a context.
+        
+        Returns:
+            True if it is a new representative, False if it duplicates one
+        """
+        self.total += 1
+        key = self.key(context, rules)
+        if key is None:
+            self._unique.append(ReviewUnit(key='', context=context, rules=rules))
+            return True
+        unit = self._units.get(key)
+        if unit is not None:
+            unit.duplicates.append(context)
+            return False
+        unit = ReviewUnit(key=key, context=context, rules=rules)
+        self._units[key] = unit
+        self._unique.append(unit)
+        return True
+        
+    def units(self) -> List[ReviewUnit]:
+        """Representative units in the order they were first added."""
+        return list(self._unique)
+        
+    def expand(self, unit: ReviewUnit, findings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Attribute a representative's findings to all of its contexts.
+        
+        Args:
+            unit: Unit returned by ``units()``
+            findings: Finding dicts for the representative context
+            
+        Returns:
+            The representative's findings followed by a copy for each
+            duplicate, with 'file' and 'line' rewritten
+        """
+        result = list(findings)
+        if not unit.duplicates:
+            return result
+        source = [start for start, _ in segments(unit.context)]
+        for duplicate in unit.duplicates:
+            # (representative start, duplicate start) of each matching segment, by line
+            offsets = sorted(zip(source, (start for start, _ in segments(duplicate))))
+            starts = [start for start, _ in offsets]
+            for finding in findings:
+                mapped = {**finding, 'file': duplicate['file']}
+                line = finding.get('line')
+                if isinstance(line, int) and offsets:
+                    source_start, target_start = offsets[max(0, bisect.bisect_right(starts, line) - 1)]
+                    mapped['line'] = line + target_start - source_start
+                result.append(mapped)
+        return result
+        
+    def stats(self) -> Dict[str, int]:
+        """Return how many units were added and how many will be sent."""
+        sent = len(self._unique)
+        return {'units': self.total, 'sent': sent, 'duplicates': self.total - sent}
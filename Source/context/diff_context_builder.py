@@ -1,5 +1,6 @@
 from typing import Dict, Any
 from .base_context_builder import BaseContextBuilder
+from .windowing import hunk_line_ranges
 
 class DiffContextBuilder(BaseContextBuilder):
     """Builds context for git diffs"""
@@ -8,11 +9,23 @@ class DiffContextBuilder(BaseContextBuilder):
         file_path = data['file_path']
         hunks = data['hunks']
         
-        return {
+        context = {
             'file': file_path,
-            'language': self._get_language(file_path),
+            'language': data.get('language') or self._get_language(file_path),
             'changes': {
                 'type': 'diff',
                 'hunks': hunks
             }
-        } 
\ No newline at end of file
+        }
+        if 'full_content' in data:
+            if self.windower is not None:
+                # Only the changed regions and their surroundings are sent
+                windows = self.windower.window_changes(data['full_content'], hunk_line_ranges(hunks))
+                context['windows'] = [w.to_dict() for w in windows]
+            else:
+                context['full_content'] = data['full_content']
+        if 'blob_id' in data:
+            context['blob_id'] = data['blob_id']
+        if 'summary' in data:
+            context['summary'] = data['summary']
+        return context
\ No newline at end of file
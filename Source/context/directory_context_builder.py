@@ -1,5 +1,7 @@
 from typing import Dict, Any, List
+from ..collector.models import FileContent
 from .base_context_builder import BaseContextBuilder
+from .request_planner import RequestPlanner, RequestPlan
 
 class DirectoryContextBuilder(BaseContextBuilder):
     """Builds context for directory contents"""
@@ -12,9 +14,42 @@ class DirectoryContextBuilder(BaseContextBuilder):
             'files': [
                 {
                     'file': f['path'],
-                    'language': f.get('metadata', {}).get('language', self._get_language(f['path'])),
+                    'language': f.get('metadata', {}).get('language') or self._get_language(f['path']),
                     'content': f['content']
                 }
                 for f in files
             ]
-        } 
\ No newline at end of file
+        }
+        
+    def plan(self, data: Dict[str, Any]) -> RequestPlan:
+        """
+        Plan how the directory's files are packed into requests.
+        
+        Raises:
+            ValueError: If the builder has no token budget
+        """
+        if self.windower is None:
+            raise ValueError("Request planning requires a token_budget")
+        files = [FileContent(path=f['path'], content=f['content'], metadata=f.get('metadata', {}))
+                 for f in data['files']]
+        return RequestPlanner(self.windower.token_budget, estimator=self.windower.estimator).plan(files)
+        
+    def build_requests(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build one directory context per planned request."""
+        files = {f['path']: f for f in data['files']}
+        contexts = []
+        for request in self.plan(data).requests:
+            entries = []
+            for item in request.files:
+                f = files[item.path]
+                entry = {
+                    'file': item.path,
+                    'language': f.get('metadata', {}).get('language') or self._get_language(item.path),
+                    'content': f['content'] if item.window is None else item.window.content
+                }
+                if item.window is not None:
+                    entry['start_line'] = item.window.start_line
+                    entry['end_line'] = item.window.end_line
+                entries.append(entry)
+            contexts.append({'review_type': 'directory', 'files': entries})
+        return contexts
\ No newline at end of file
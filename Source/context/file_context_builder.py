@@ -9,9 +9,15 @@ class FileContextBuilder(BaseContextBuilder):
         content = data['content']
         metadata = data.get('metadata', {})
         
-        return {
+        context = {
             'file': file_path,
-            'language': metadata.get('language', self._get_language(file_path)),
+            'language': metadata.get('language') or self._get_language(file_path),
             'review_type': 'file',
             'full_content': content
-        } 
\ No newline at end of file
+        }
+        if self.windower is not None and not self.windower.fits(content):
+            del context['full_content']
+            context['windows'] = [w.to_dict() for w in self.windower.window_file(content)]
+        if 'digest' in metadata:
+            context['digest'] = metadata['digest']
+        return context
\ No newline at end of file
@@ -0,0 +1,148 @@
+"""
+Packs directory files into LLM requests within a token budget.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Callable
+from ..collector.models import FileContent
+from .windowing import ContextWindower, ContextWindow, estimate_tokens
+
+# Tokens reserved per file for its path/language header in the prompt
+DEFAULT_FILE_OVERHEAD = 16
+
+@dataclass
+class PlannedFile:
+    """A file, or one window of a split file, assigned to a request."""
+    path: str
+    tokens: int
+    window: Optional[ContextWindow] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert planned file to dictionary format."""
+        result = {'path': self.path, 'tokens': self.tokens}
+        if self.window is not None:
+            result['start_line'] = self.window.start_line
+            result['end_line'] = self.window.end_line
+        return result
+        
+@dataclass
+class PlannedRequest:
+    """Files sent together in one request."""
+    files: List[PlannedFile] = field(default_factory=list)
+    tokens: int = 0
+    
+    def add(self, item: PlannedFile) -> None:
+        """Add a file to the request."""
+        self.files.append(item)
+        self.tokens += item.tokens
+        
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert request to dictionary format."""
+        return {'tokens': self.tokens, 'files': [f.to_dict() for f in self.files]}
+        
+@dataclass
+class RequestPlan:
+    """The requests a directory review will make."""
+    token_budget: int
+    requests: List[PlannedRequest] = field(default_factory=list)
+    split_files: List[str] = field(default_factory=list)
+    skipped_files: List[str] = field(default_factory=list)
+    
+    @property
+    def total_tokens(self) -> int:
+        """Tokens across all requests."""
+        return sum(request.tokens for request in self.requests)
+        
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert plan to dictionary format."""
+        return {
+            'token_budget': self.token_budget,
+            'request_count': len(self.requests),
+            'total_tokens': self.total_tokens,
+            'split_files': self.split_files,
+            'skipped_files': self.skipped_files,
+            'requests': [r.to_dict() for r in self.requests]
+        }
+        
+class RequestPlanner:
+    """
+    Packs files into as few requests as fit a token budget.
+    
+    Files are placed first-fit-decreasing: largest first, each into the first
+    request with room left. A file larger than the budget is split into
+    overlapping windows, which are then packed like any other file.
+    """
+    
+    def __init__(self, token_budget: int, file_overhead: int = DEFAULT_FILE_OVERHEAD,
+                 overlap_lines: int = 10, estimator: Callable[[str], int] = estimate_tokens):
+        """
+        Initialize the planner.
+        
+        Args:
+            token_budget: Maximum tokens of file content per request
+            file_overhead: Tokens added per file or window for its header
+            overlap_lines: Lines shared by consecutive windows of a split file
+            estimator: Function returning the token count of a string
+            
+        Raises:
+            ValueError: If the budget can't hold even the per-file overhead
+        """
+        if token_budget <= file_overhead:
+            raise ValueError(f"Token budget must exceed the per-file overhead of {file_overhead}")
+        self.token_budget = token_budget
+        self.file_overhead = file_overhead
+        self.estimator = estimator
+        self.windower = ContextWindower(token_budget - file_overhead, overlap_lines=overlap_lines,
+                                        estimator=estimator)
+                                        
+    def plan(self, files: List[FileContent]) -> RequestPlan:
+        """
+        Plan the requests for a list of files.
+        
+        Files skipped by the collector or with empty content are left out and
+        listed in ``skipped_files``.
+        
+        Args:
+            files: Collected files
+            
+        Returns:
+            RequestPlan with requests in packing order
+        """
+        plan = RequestPlan(token_budget=self.token_budget)
+        items: List[PlannedFile] = []
+        for file_content in files:
+            if file_content.metadata.get('skipped') or not file_content.content:
+                plan.skipped_files.append(file_content.path)
+                continue
+            items.extend(self._items(file_content, plan))
+            
+        items.sort(key=lambda item: item.tokens, reverse=True)
+        for item in items:
+            for request in plan.requests:
+                if request.tokens + item.tokens <= self.token_budget:
+                    request.add(item)
+                    break
+            else:
+                request = PlannedRequest()
+                request.add(item)
+                plan.requests.append(request)
+        return plan
+        
+    def _count(self, file_content: FileContent) -> int:
+        """Count a file's tokens, letting a TokenEstimator reuse the loader's digest."""
+        count_file = getattr(self.estimator, 'count_file', None)
+        if count_file is not None:
+            return count_file(file_content)
+        return self.estimator(file_content.content)
+        
+    def _items(self, file_content: FileContent, plan: RequestPlan) -> List[PlannedFile]:
+        """Turn a file into one item, or one item per window if it's too large."""
+        tokens = self._count(file_content) + self.file_overhead
+        if tokens <= self.token_budget:
+            return [PlannedFile(file_content.path, tokens)]
+            
+        plan.split_files.append(file_content.path)
+        return [
+            PlannedFile(file_content.path, self.estimator(window.content) + self.file_overhead, window)
+            for window in self.windower.window_file(file_content.content)
+        ]
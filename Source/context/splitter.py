@@ -0,0 +1,161 @@
+"""
+Splitting of review contexts into smaller units along hunk and window boundaries.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+from .windowing import ContextWindow, ContextWindower, estimate_tokens, hunk_line_ranges
+
+Range = Tuple[int, int]
+
+def _halves(items: List[Any]) -> List[List[Any]]:
+    middle = (len(items) + 1) // 2
+    return [items[:middle], items[middle:]]
+    
+def _overlaps(start: int, end: int, ranges: List[Range]) -> bool:
+    return any(start <= range_end and range_start <= end for range_start, range_end in ranges)
+    
+def _window_range(window: Dict[str, Any]) -> Range:
+    return window['start_line'], window['end_line']
+    
+def context_lines(context: Dict[str, Any]) -> int:
+    """Number of code lines a context sends for review (hunks, windows or content)."""
+    if context.get('review_type') == 'directory':
+        return sum(len(f['content'].splitlines()) for f in context['files'])
+    total = 0
+    for hunk in (context.get('changes') or {}).get('hunks', []):
+        total += len((hunk.get('before') or '').splitlines()) + len((hunk.get('after') or '').splitlines())
+    if 'windows' in context:
+        total += sum(len(w['content'].splitlines()) for w in context['windows'])
+    elif context.get('full_content') is not None:
+        total += len(context['full_content'].splitlines())
+    return total
+    
+def split_context(context: Dict[str, Any], min_lines: int = 20) -> Optional[List[Dict[str, Any]]]:
+    """
+    Split a context into two smaller contexts covering the same code.
+    
+    Boundaries are tried from coarsest to finest: directory batches by file,
+    diffs by hunk, windowed contexts by window, and finally a single hunk,
+    window or file by line, as long as each half keeps at least min_lines
+    lines. Line numbers are preserved, so findings from the pieces refer to
+    the original file.
+    
+    Args:
+        context: Context from one of the context builders
+        min_lines: Smallest piece worth sending on its own
+        
+    Returns:
+        Two contexts, or None if the context can't be split further
+    """
+    if context.get('review_type') == 'directory':
+        return _split_directory(context, min_lines)
+        
+    hunks = (context.get('changes') or {}).get('hunks') or []
+    if len(hunks) > 1:
+        return [_with_hunks(context, half) for half in _halves(hunks)]
+    windows = context.get('windows')
+    if windows and len(windows) > 1:
+        return [_with_windows(context, half) for half in _halves(windows)]
+    if hunks:
+        halves = _split_hunk(hunks[0], min_lines)
+        if halves is not None:
+            return [_with_hunks(context, [half]) for half in halves]
+            
+    if windows:
+        start, content = windows[0]['start_line'], windows[0]['content']
+    elif context.get('full_content') is not None:
+        start, content = 1, context['full_content']
+    else:
+        return None
+    halves = _split_lines(content, start, min_lines)
+    if halves is None:
+        return None
+    return [_with_windows(context, [half.to_dict()]) for half in halves]
+    
+def _split_lines(content: str, start: int, min_lines: int) -> Optional[List[ContextWindow]]:
+    """Split content starting at line start into two windows."""
+    lines = content.splitlines(keepends=True)
+    if len(lines) < 2 * min_lines:
+        return None
+    middle = len(lines) // 2
+    return [
+        ContextWindow(start, start + middle - 1, ''.join(lines[:middle])),
+        ContextWindow(start + middle, start + len(lines) - 1, ''.join(lines[middle:]))
+    ]
+    
+def _split_hunk(hunk: Dict[str, Any], min_lines: int) -> Optional[List[Dict[str, Any]]]:
+    """
+    Split one hunk in two, halving its old and new lines separately.
+    
+    Line numbers come from the hunk's ``added_lines``/``removed_lines``
+    (recorded by DiffParser), since context lines and deletions sit between
+    the added lines; hunks without them are taken to be contiguous.
+    """
+    before = (hunk.get('before') or '').splitlines(keepends=True)
+    after = (hunk.get('after') or '').splitlines(keepends=True)
+    if len(before) + len(after) < 2 * min_lines:
+        return None
+    start, old_start = hunk['start_line'], hunk.get('old_start', 0)
+    added = hunk.get('added_lines') or list(range(start, start + len(after)))
+    removed = hunk.get('removed_lines') or list(range(old_start, old_start + len(before)))
+    old_middle, new_middle = (len(before) + 1) // 2, (len(after) + 1) // 2
+    
+    def piece(old: slice, new: slice, piece_start: int, piece_old_start: int) -> Dict[str, Any]:
+        return {
+            **hunk,
+            'start_line': piece_start,
+            'end_line': added[new][-1] if added[new] else piece_start,
+            'old_start': piece_old_start,
+            'before': ''.join(before[old]),
+            'after': ''.join(after[new]),
+            'old_count': len(before[old]),
+            'new_count': len(after[new]),
+            'added_lines': added[new],
+            'removed_lines': removed[old]
+        }
+        
+    first = piece(slice(None, old_middle), slice(None, new_middle), start, old_start)
+    second_start = added[new_middle] if new_middle < len(added) else hunk.get('end_line', start)
+    second_old_start = removed[old_middle] if old_middle < len(removed) else old_start
+    second = piece(slice(old_middle, None), slice(new_middle, None), second_start, second_old_start)
+    return [first, second]
+    
+def _with_hunks(context: Dict[str, Any], hunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Copy of context reviewing only hunks, with the code around them."""
+    piece = {**context, 'changes': {**context['changes'], 'hunks': hunks}}
+    ranges = hunk_line_ranges(hunks)
+    if 'windows' in context:
+        piece['windows'] = [w for w in context['windows'] if _overlaps(*_window_range(w), ranges)]
+    elif context.get('full_content') is not None:
+        content = piece.pop('full_content')
+        # A budget the whole file fits in keeps the default context around each hunk
+        windower = ContextWindower(token_budget=estimate_tokens(content) + 1)
+        piece['windows'] = [w.to_dict() for w in windower.window_changes(content, ranges)]
+    return piece
+    
+def _with_windows(context: Dict[str, Any], windows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Copy of context reviewing only windows, with the hunks inside them."""
+    piece = {**context, 'windows': windows}
+    piece.pop('full_content', None)
+    changes = context.get('changes')
+    if changes and changes.get('hunks'):
+        ranges = [_window_range(w) for w in windows]
+        hunks = [h for h, (start, end) in zip(changes['hunks'], hunk_line_ranges(changes['hunks']))
+                 if _overlaps(start, end, ranges)]
+        piece['changes'] = {**changes, 'hunks': hunks}
+    return piece
+    
+def _split_directory(context: Dict[str, Any], min_lines: int) -> Optional[List[Dict[str, Any]]]:
+    files = context['files']
+    if len(files) > 1:
+        return [{**context, 'files': half} for half in _halves(files)]
+    if not files:
+        return None
+    entry = files[0]
+    halves = _split_lines(entry['content'], entry.get('start_line', 1), min_lines)
+    if halves is None:
+        return None
+    return [
+        {**context, 'files': [{**entry, 'content': half.content, 'start_line': half.start_line}]}
+        for half in halves
+    ]
@@ -0,0 +1,155 @@
+"""
+Newline-delimited JSON spool for handing contexts between processes.
+"""
+
+import os
+import io
+import gzip
+import json
+from typing import Dict, Any, Iterator, Iterable, Optional
+
+SPOOL_FORMAT = 'codereview-spool'
+SPOOL_VERSION = 1
+
+def _is_gzip(path: str) -> bool:
+    """Check a file's magic bytes for gzip."""
+    with open(path, 'rb') as f:
+        return f.read(2) == b'\x1f\x8b'
+        
+class SpoolWriter:
+    """
+    Writes contexts to a spool file one record per line.
+    
+    The first line is a header. Records are written as they arrive and the
+    file only appears at its final path once the writer is closed, so a
+    reader never sees a partial spool.
+    """
+    
+    def __init__(self, path: str, compress: Optional[bool] = None, metadata: Optional[Dict[str, Any]] = None):
+        """
+        Open a spool for writing.
+        
+        Args:
+            path: Spool file path
+            compress: gzip the spool; defaults to True for paths ending in ".gz"
+            metadata: Extra fields stored in the header, e.g. the ref spec
+        """
+        self.path = path
+        self.compress = path.endswith('.gz') if compress is None else compress
+        self.count = 0
+        self._tmp_path = f"{path}.tmp"
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        raw = open(self._tmp_path, 'wb')
+        binary = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6) if self.compress else raw
+        self._raw = raw
+        self._file = io.TextIOWrapper(binary, encoding='utf-8', newline='\n')
+        self._write_line({'format': SPOOL_FORMAT, 'version': SPOOL_VERSION, **(metadata or {})})
+        
+    def __enter__(self) -> 'SpoolWriter':
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+            
+    def _write_line(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+        self._file.write('\n')
+        
+    def write(self, context: Dict[str, Any]) -> None:
+        """Append one context."""
+        self._write_line(context)
+        self.count += 1
+        
+    def write_all(self, contexts: Iterable[Dict[str, Any]]) -> int:
+        """
+        Append contexts from an iterable, e.g. a builder consuming a collector stream.
+        
+        Returns:
+            Number of contexts written
+        """
+        written = 0
+        for context in contexts:
+            self.write(context)
+            written += 1
+        return written
+        
+    def close(self) -> None:
+        """Finish the spool and move it to its final path."""
+        if self._file.closed:
+            return
+        self._file.close()
+        self._raw.close()
+        os.replace(self._tmp_path, self.path)
+        
+    def abort(self) -> None:
+        """Discard a partially written spool."""
+        if not self._file.closed:
+            self._file.close()
+            self._raw.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+            
+class SpoolReader:
+    """
+    Lazily reads contexts back from a spool.
+    
+    Several workers can share one spool by each reading a different shard:
+    worker ``i`` of ``n`` gets records ``i, i + n, i + 2n, ...`` and only
+    decodes those.
+    """
+    
+    def __init__(self, path: str, shard: int = 0, shards: int = 1):
+        """
+        Open a spool for reading.
+        
+        Args:
+            path: Spool file path (compression is detected from its content)
+            shard: Index of the shard to read
+            shards: Total number of shards
+            
+        Raises:
+            FileNotFoundError: If the spool doesn't exist
+            ValueError: If the shard is out of range or the file isn't a spool
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Spool not found: {path}")
+        if shards < 1 or not 0 <= shard < shards:
+            raise ValueError(f"Invalid shard {shard} of {shards}")
+        self.path = path
+        self.shard = shard
+        self.shards = shards
+        self.header = self._read_header()
+        
+    def _open(self):
+        """Open the spool as text, decompressing if needed."""
+        if _is_gzip(self.path):
+            return gzip.open(self.path, 'rt', encoding='utf-8', newline='\n')
+        return open(self.path, 'r', encoding='utf-8', newline='\n')
+        
+    def _read_header(self) -> Dict[str, Any]:
+        """Read and validate the header line."""
+        with self._open() as f:
+            line = f.readline()
+        try:
+            header = json.loads(line)
+        except ValueError:
+            header = None
+        if not isinstance(header, dict) or header.get('format') != SPOOL_FORMAT:
+            raise ValueError(f"Not a context spool: {self.path}")
+        if header.get('version') != SPOOL_VERSION:
+            raise ValueError(f"Unsupported spool version: {header.get('version')}")
+        return header
+        
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Yield this shard's contexts in spool order."""
+        with self._open() as f:
+            f.readline()  # header
+            for index, line in enumerate(f):
+                if index % self.shards == self.shard:
+                    yield json.loads(line)
@@ -61,4 +61,11 @@ def test_directory_context_builder():
     assert result['review_type'] == 'directory'
     assert len(result['files']) == 2
     assert result['files'][0]['file'] == 'src/main.py'
-    assert result['files'][1]['file'] == 'src/utils.py' 
\ No newline at end of file
+    assert result['files'][1]['file'] == 'src/utils.py' 
+    
+def test_builders_reuse_detected_language():
+    diff = DiffContextBuilder().build({'file_path': 'bin/tool', 'hunks': [], 'language': 'shell'})
+    assert diff['language'] == 'shell'
+    
+    file = FileContextBuilder().build({'file_path': 'bin/tool', 'content': '', 'metadata': {'language': 'shell'}})
+    assert file['language'] == 'shell'
\ No newline at end of file
@@ -0,0 +1,83 @@
+from ..dedup import Deduplicator, normalize
+
+RULES = [{'id': 'SEC-001'}]
+
+def diff_context(path, start, after='token = "abc"\n', language='python'):
+    return {
+        'file': path,
+        'language': language,
+        'changes': {'type': 'diff', 'hunks': [{'start_line': start, 'end_line': start, 'before': '', 'after': after}]}
+    }
+    
+def test_identical_units_are_sent_once():
+    dedup = Deduplicator()
+    assert dedup.add(diff_context('a.py', 10), RULES) is True
+    assert dedup.add(diff_context('b.py', 40), RULES) is False
+    assert dedup.add(diff_context('c.py', 10, after='other = 1\n'), RULES) is True
+    
+    assert [unit.context['file'] for unit in dedup.units()] == ['a.py', 'c.py']
+    assert dedup.stats() == {'units': 3, 'sent': 2, 'duplicates': 1}
+    
+def test_rule_set_and_language_are_part_of_the_key():
+    dedup = Deduplicator()
+    dedup.add(diff_context('a.py', 10), RULES)
+    dedup.add(diff_context('b.py', 10), [{'id': 'STYLE-001'}])
+    dedup.add(diff_context('c.rb', 10, language='ruby'), RULES)
+    
+    assert len(dedup.units()) == 3
+    
+def test_whitespace_only_differences_are_collapsed():
+    assert normalize('a = 1  \r\nb = 2\t\n') == normalize('a = 1\nb = 2\n')
+    dedup = Deduplicator()
+    dedup.add({'file': 'a.py', 'language': 'python', 'full_content': 'x = 1  \n'}, RULES)
+    dedup.add({'file': 'b.py', 'language': 'python', 'full_content': 'x = 1\r\n'}, RULES)
+    
+    assert len(dedup.units()) == 1
+    
+def test_findings_are_mapped_back_with_line_offsets():
+    dedup = Deduplicator()
+    dedup.add(diff_context('a.py', 10), RULES)
+    dedup.add(diff_context('b.py', 40), RULES)
+    dedup.add(diff_context('c.py', 5), RULES)
+    unit = dedup.units()[0]
+    
+    findings = dedup.expand(unit, [{'file': 'a.py', 'line': 10, 'rule_id': 'SEC-001', 'message': 'secret', 'severity': 'error'}])
+    
+    assert [(f['file'], f['line']) for f in findings] == [('a.py', 10), ('b.py', 40), ('c.py', 5)]
+    assert findings[1]['rule_id'] == 'SEC-001'
+    
+def test_window_offsets_follow_the_matching_window():
+    def windowed(path, starts):
+        return {
+            'file': path,
+            'language': 'python',
+            'windows': [{'start_line': s, 'end_line': s + 1, 'content': f"w{i}\nw{i}\n"} for i, s in enumerate(starts)]
+        }
+    dedup = Deduplicator()
+    dedup.add(windowed('a.py', [1, 50]), RULES)
+    dedup.add(windowed('b.py', [11, 90]), RULES)
+    
+    findings = dedup.expand(dedup.units()[0], [{'file': 'a.py', 'line': 2}, {'file': 'a.py', 'line': 51}])
+    assert [(f['file'], f['line']) for f in findings[2:]] == [('b.py', 12), ('b.py', 91)]
+    
+def test_directory_contexts_are_never_merged():
+    dedup = Deduplicator()
+    batch = {'review_type': 'directory', 'files': [{'file': 'a.py', 'language': 'python', 'content': 'x'}]}
+    dedup.add(batch, RULES)
+    dedup.add(dict(batch), RULES)
+    
+    assert len(dedup.units()) == 2
+    
+def test_contexts_without_code_are_never_merged():
+    dedup = Deduplicator()
+    contexts = [
+        {'file': 'logo.png', 'language': 'text', 'status': 'modified', 'binary': True, 'changes': {'hunks': []}},
+        {'file': 'new_name.py', 'language': 'python', 'status': 'renamed', 'changes': {'hunks': []}},
+        {'file': 'yarn.lock', 'language': 'text', 'summary': '[lockfile file; content omitted from review]\n',
+         'changes': {'hunks': []}},
+        {'file': 'poetry.lock', 'language': 'text', 'summary': '[lockfile file; content omitted from review]\n',
+         'changes': {'hunks': []}}
+    ]
+    
+    assert [dedup.add(context, RULES) for context in contexts] == [True] * 4
+    assert dedup.stats() == {'units': 4, 'sent': 4, 'duplicates': 0}
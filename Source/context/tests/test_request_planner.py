@@ -0,0 +1,63 @@
+import pytest
+from ...collector.models import FileContent
+from ..request_planner import RequestPlanner
+from ..directory_context_builder import DirectoryContextBuilder
+
+def make_file(path, size):
+    return FileContent(path=path, content='x' * (size - 1) + '\n', metadata={'language': 'python'})
+    
+def test_small_files_are_packed_together():
+    files = [make_file(f"f{i}.py", 40) for i in range(100)]
+    plan = RequestPlanner(token_budget=1000, file_overhead=10).plan(files)
+    
+    # 20 tokens per file, 50 per request
+    assert len(plan.requests) == 2
+    assert all(request.tokens <= 1000 for request in plan.requests)
+    assert sorted(f.path for r in plan.requests for f in r.files) == sorted(f.path for f in files)
+    
+def test_first_fit_decreasing_fills_gaps():
+    files = [make_file('a.py', 2400), make_file('b.py', 2400), make_file('c.py', 1200), make_file('d.py', 1200)]
+    plan = RequestPlanner(token_budget=1000, file_overhead=0).plan(files)
+    
+    assert [sorted(f.path for f in r.files) for r in plan.requests] == [['a.py', 'c.py'], ['b.py', 'd.py']]
+    
+def test_oversized_file_is_split_into_windows():
+    content = ''.join(f"line {i} {'y' * 30}\n" for i in range(200))
+    files = [FileContent(path='big.py', content=content, metadata={}), make_file('small.py', 40)]
+    plan = RequestPlanner(token_budget=500, file_overhead=10).plan(files)
+    
+    assert plan.split_files == ['big.py']
+    windows = [f.window for r in plan.requests for f in r.files if f.path == 'big.py']
+    assert len(windows) > 1
+    assert min(w.start_line for w in windows) == 1
+    assert max(w.end_line for w in windows) == 200
+    assert all(request.tokens <= 500 for request in plan.requests)
+    
+def test_skipped_and_empty_files_are_not_planned():
+    files = [
+        make_file('a.py', 40),
+        FileContent(path='b.bin', content='', metadata={'skipped': {'reason': 'binary'}}),
+        FileContent(path='c.py', content='', metadata={})
+    ]
+    plan = RequestPlanner(token_budget=1000).plan(files)
+    
+    assert plan.skipped_files == ['b.bin', 'c.py']
+    assert plan.to_dict()['request_count'] == 1
+    
+def test_budget_must_exceed_overhead():
+    with pytest.raises(ValueError):
+        RequestPlanner(token_budget=10, file_overhead=16)
+        
+def test_directory_builder_builds_one_context_per_request():
+    files = [{'path': f"f{i}.py", 'content': 'x' * 400, 'metadata': {'language': 'python'}} for i in range(10)]
+    builder = DirectoryContextBuilder(token_budget=300)
+    contexts = builder.build_requests({'files': files})
+    
+    assert len(contexts) == len(builder.plan({'files': files}).requests)
+    assert len(contexts) < len(files)
+    assert sum(len(c['files']) for c in contexts) == 10
+    assert contexts[0]['files'][0]['language'] == 'python'
+    
+def test_directory_builder_plan_requires_budget():
+    with pytest.raises(ValueError):
+        DirectoryContextBuilder().plan({'files': []})
@@ -0,0 +1,85 @@
+from ..splitter import split_context, context_lines
+
+def numbered_lines(count, start=1):
+    return ''.join(f"line_{i} = {i}\n" for i in range(start, start + count))
+    
+def diff_context(hunks, content=None):
+    context = {
+        'file': 'src/app.py',
+        'language': 'python',
+        'changes': {'hunks': hunks}
+    }
+    if content is not None:
+        context['full_content'] = content
+    return context
+    
+def hunk(start, count):
+    return {'start_line': start, 'end_line': start + count - 1, 'old_start': start, 'before': '',
+            'after': numbered_lines(count, start), 'old_count': 0, 'new_count': count}
+            
+def test_diff_split_by_hunk_keeps_nearby_code():
+    content = numbered_lines(400)
+    context = diff_context([hunk(10, 3), hunk(200, 3), hunk(390, 3)], content)
+    
+    first, second = split_context(context)
+    
+    assert [h['start_line'] for h in first['changes']['hunks']] == [10, 200]
+    assert [h['start_line'] for h in second['changes']['hunks']] == [390]
+    assert 'full_content' not in first
+    assert all(w['start_line'] <= 390 <= w['end_line'] for w in second['windows'])
+    assert context['full_content'] == content
+    
+def test_windows_split_in_half_with_their_hunks():
+    windows = [{'start_line': s, 'end_line': s + 9, 'content': numbered_lines(10, s)} for s in (1, 50, 100, 150)]
+    context = {'file': 'a.py', 'language': 'python', 'windows': windows, 'changes': None}
+    
+    first, second = split_context(context)
+    
+    assert [w['start_line'] for w in first['windows']] == [1, 50]
+    assert [w['start_line'] for w in second['windows']] == [100, 150]
+    
+def test_single_file_split_by_lines_until_min_lines():
+    context = {'file': 'a.py', 'language': 'python', 'full_content': numbered_lines(100)}
+    
+    first, second = split_context(context, min_lines=20)
+    
+    assert (first['windows'][0]['start_line'], first['windows'][0]['end_line']) == (1, 50)
+    assert (second['windows'][0]['start_line'], second['windows'][0]['end_line']) == (51, 100)
+    assert context_lines(first) + context_lines(second) == context_lines(context)
+    assert split_context({**context, 'full_content': numbered_lines(39)}, min_lines=20) is None
+    
+def test_single_large_hunk_split_keeps_line_numbers():
+    context = diff_context([hunk(5, 60)])
+    
+    first, second = split_context(context, min_lines=20)
+    
+    first_hunk, second_hunk = first['changes']['hunks'][0], second['changes']['hunks'][0]
+    assert (first_hunk['start_line'], first_hunk['end_line'], first_hunk['new_count']) == (5, 34, 30)
+    assert (second_hunk['start_line'], second_hunk['end_line'], second_hunk['new_count']) == (35, 64, 30)
+    assert second_hunk['after'].startswith('line_35 = 35\n')
+    
+def test_hunk_split_uses_recorded_line_numbers():
+    sparse = {'start_line': 100, 'end_line': 160, 'old_start': 98, 'old_count': 2, 'new_count': 4,
+              'before': 'a = 0\nb = 0\n', 'after': 'a = 1\nb = 1\nc = 1\nd = 1\n',
+              'added_lines': [100, 101, 150, 160], 'removed_lines': [98, 140]}
+              
+    first, second = split_context(diff_context([sparse]), min_lines=2)
+    
+    first_hunk, second_hunk = first['changes']['hunks'][0], second['changes']['hunks'][0]
+    assert (first_hunk['start_line'], first_hunk['end_line'], first_hunk['old_start']) == (100, 101, 98)
+    assert (second_hunk['start_line'], second_hunk['end_line'], second_hunk['old_start']) == (150, 160, 140)
+    assert second_hunk['after'] == 'c = 1\nd = 1\n'
+    assert second_hunk['added_lines'] == [150, 160]
+    
+def test_directory_split_by_file_then_by_lines():
+    files = [{'file': f'f{i}.py', 'language': 'python', 'content': numbered_lines(50)} for i in range(3)]
+    context = {'review_type': 'directory', 'files': files}
+    
+    first, second = split_context(context)
+    
+    assert [f['file'] for f in first['files']] == ['f0.py', 'f1.py']
+    assert [f['file'] for f in second['files']] == ['f2.py']
+    
+    top, bottom = split_context(second, min_lines=20)
+    assert (top['files'][0]['start_line'], bottom['files'][0]['start_line']) == (1, 26)
+    assert split_context(top, min_lines=20) is None
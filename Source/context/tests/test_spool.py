@@ -0,0 +1,72 @@
+import gzip
+import pytest
+from ..spool import SpoolWriter, SpoolReader
+from ..file_context_builder import FileContextBuilder
+
+def make_contexts(count):
+    return [{'file': f"src/f{i}.py", 'language': 'python', 'full_content': f"x = {i}\n \n"} for i in range(count)]
+    
+@pytest.mark.parametrize('name', ['contexts.ndjson', 'contexts.ndjson.gz'])
+def test_round_trip(tmp_path, name):
+    path = str(tmp_path / name)
+    contexts = make_contexts(5)
+    with SpoolWriter(path, metadata={'ref_spec': 'main..feature'}) as writer:
+        assert writer.write_all(contexts) == 5
+        
+    reader = SpoolReader(path)
+    assert reader.header['ref_spec'] == 'main..feature'
+    assert list(reader) == contexts
+    
+def test_compression_follows_extension(tmp_path):
+    path = str(tmp_path / 'contexts.gz')
+    with SpoolWriter(path) as writer:
+        writer.write_all(make_contexts(3))
+        
+    with gzip.open(path, 'rt') as f:
+        assert len(f.readlines()) == 4
+        
+def test_shards_partition_records(tmp_path):
+    path = str(tmp_path / 'contexts.ndjson')
+    contexts = make_contexts(10)
+    with SpoolWriter(path) as writer:
+        writer.write_all(contexts)
+        
+    shards = [list(SpoolReader(path, shard=i, shards=3)) for i in range(3)]
+    assert [len(s) for s in shards] == [4, 3, 3]
+    assert sorted((c for s in shards for c in s), key=lambda c: c['file']) == sorted(contexts, key=lambda c: c['file'])
+    
+def test_spool_appears_only_when_closed(tmp_path):
+    path = tmp_path / 'contexts.ndjson'
+    writer = SpoolWriter(str(path))
+    writer.write({'file': 'a.py'})
+    assert not path.exists()
+    writer.close()
+    assert path.exists()
+    
+def test_failed_write_leaves_no_spool(tmp_path):
+    path = tmp_path / 'contexts.ndjson'
+    with pytest.raises(RuntimeError):
+        with SpoolWriter(str(path)) as writer:
+            writer.write({'file': 'a.py'})
+            raise RuntimeError("collection failed")
+    assert list(tmp_path.iterdir()) == []
+    
+def test_rejects_invalid_input(tmp_path):
+    other = tmp_path / 'other.json'
+    other.write_text('{"hello": 1}\n')
+    with pytest.raises(ValueError):
+        SpoolReader(str(other))
+    with pytest.raises(FileNotFoundError):
+        SpoolReader(str(tmp_path / 'missing.ndjson'))
+    with SpoolWriter(str(tmp_path / 'ok.ndjson')):
+        pass
+    with pytest.raises(ValueError):
+        SpoolReader(str(tmp_path / 'ok.ndjson'), shard=2, shards=2)
+        
+def test_builder_streams_into_spool(tmp_path):
+    path = str(tmp_path / 'contexts.ndjson')
+    items = ({'file_path': f"f{i}.py", 'content': 'pass\n'} for i in range(3))
+    with SpoolWriter(path) as writer:
+        writer.write_all(FileContextBuilder().build_all(items))
+        
+    assert [c['file'] for c in SpoolReader(path)] == ['f0.py', 'f1.py', 'f2.py']
@@ -0,0 +1,105 @@
+from ..windowing import ContextWindower, hunk_line_ranges, estimate_tokens
+from ..diff_context_builder import DiffContextBuilder
+from ..file_context_builder import FileContextBuilder
+
+def make_module(functions=50, body=8):
+    lines = []
+    for i in range(functions):
+        lines.append(f"def function_{i}(value):\n")
+        for j in range(body):
+            lines.append(f"    value = value + {j}  # step {j} of function {i}\n")
+        lines.append("\n")
+    return ''.join(lines)
+    
+def test_small_file_is_one_window():
+    windower = ContextWindower(token_budget=1000)
+    windows = windower.window_file("a = 1\nb = 2\n")
+    
+    assert len(windows) == 1
+    assert (windows[0].start_line, windows[0].end_line) == (1, 2)
+    
+def test_oversized_file_split_into_overlapping_windows():
+    content = make_module()
+    lines = content.splitlines(keepends=True)
+    windower = ContextWindower(token_budget=300, overlap_lines=5)
+    windows = windower.window_file(content)
+    
+    assert len(windows) > 1
+    assert windows[0].start_line == 1
+    assert windows[-1].end_line == len(lines)
+    for window in windows:
+        assert estimate_tokens(window.content) <= 300
+        assert window.content == ''.join(lines[window.start_line - 1:window.end_line])
+    for previous, current in zip(windows, windows[1:]):
+        assert current.start_line <= previous.end_line
+        assert current.start_line > previous.start_line
+        
+def test_change_windows_keep_context_and_scope():
+    content = make_module()
+    windower = ContextWindower(token_budget=2000, context_lines=2)
+    # Line 105 is inside function_10 (lines 101-110)
+    windows = windower.window_changes(content, [(105, 105)])
+    
+    assert len(windows) == 1
+    assert (windows[0].start_line, windows[0].end_line) == (103, 107)
+    assert windows[0].scope == "def function_10(value):"
+    assert windows[0].scope_line == 101
+    
+def test_nearby_changes_are_merged():
+    content = make_module()
+    windower = ContextWindower(token_budget=2000, context_lines=3)
+    windows = windower.window_changes(content, [(20, 20), (25, 26), (300, 300)])
+    
+    assert [(w.start_line, w.end_line) for w in windows] == [(17, 29), (297, 303)]
+    
+def test_context_shrinks_to_fit_budget():
+    content = make_module()
+    windower = ContextWindower(token_budget=60, context_lines=20)
+    windows = windower.window_changes(content, [(105, 105)])
+    
+    assert sum(estimate_tokens(w.content) for w in windows) <= 60
+    assert any(w.start_line <= 105 <= w.end_line for w in windows)
+    
+def test_hunk_line_ranges_use_new_count():
+    hunks = [{'start_line': 10, 'end_line': 12, 'new_count': 7}, {'start_line': 0, 'end_line': 0, 'new_count': 0}]
+    
+    assert hunk_line_ranges(hunks) == [(10, 16), (1, 1)]
+    
+def test_diff_builder_windows_full_content():
+    content = make_module()
+    builder = DiffContextBuilder(token_budget=500, context_lines=2)
+    result = builder.build({
+        'file_path': 'src/module.py',
+        'hunks': [{'start_line': 105, 'end_line': 105, 'new_count': 1}],
+        'full_content': content
+    })
+    
+    assert 'full_content' not in result
+    assert result['windows'] == [{
+        'start_line': 103,
+        'end_line': 107,
+        'content': ''.join(content.splitlines(keepends=True)[102:107]),
+        'scope': 'def function_10(value):',
+        'scope_line': 101
+    }]
+    
+def test_file_builder_windows_only_when_over_budget():
+    small = FileContextBuilder(token_budget=10000).build({'file_path': 'a.py', 'content': 'x = 1\n'})
+    assert small['full_content'] == 'x = 1\n'
+    
+    large = FileContextBuilder(token_budget=300).build({'file_path': 'a.py', 'content': make_module()})
+    assert 'full_content' not in large
+    assert len(large['windows']) > 1
+    
+def test_large_overlap_with_small_budget_still_advances():
+    content = make_module(functions=40)
+    lines = content.splitlines(keepends=True)
+    windower = ContextWindower(token_budget=40, overlap_lines=20)
+    
+    windows = windower.window_file(content)
+    
+    assert windows[-1].end_line == len(lines)
+    assert len(windows) < len(lines) / 2
+    for previous, window in zip(windows, windows[1:]):
+        overlap = previous.end_line - window.start_line + 1
+        assert 0 <= overlap <= (previous.end_line - previous.start_line) // 2
@@ -0,0 +1,209 @@
+"""
+Token-budgeted windowing of file content for context building.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+CHARS_PER_TOKEN = 4
+
+# Lines that open a scope in most languages (def, class, func, fn, ...)
+SCOPE_PATTERN = re.compile(
+    r'^\s*(?:(?:export|default|public|private|protected|internal|static|async|override|'
+    r'final|abstract|pub|open|virtual|inline)\s+)*'
+    r'(?:def|class|function|func|fn|interface|struct|enum|impl|module|trait|protocol|'
+    r'extension|object|namespace)\b'
+)
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count used when no estimator is supplied."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    
+@dataclass
+class ContextWindow:
+    """A contiguous slice of a file, with its 1-based line range."""
+    start_line: int
+    end_line: int
+    content: str
+    scope: Optional[str] = None
+    scope_line: Optional[int] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert window to dictionary format."""
+        result = {
+            'start_line': self.start_line,
+            'end_line': self.end_line,
+            'content': self.content
+        }
+        if self.scope is not None:
+            result['scope'] = self.scope
+            result['scope_line'] = self.scope_line
+        return result
+        
+def hunk_line_ranges(hunks: List[Dict[str, Any]]) -> List[Tuple[int, int]]:
+    """
+    Get the new-file line range covered by each hunk.
+    
+    Args:
+        hunks: Hunk dicts as produced by DiffHunk.to_dict()
+        
+    Returns:
+        List of (start_line, end_line), 1-based and inclusive
+    """
+    ranges = []
+    for hunk in hunks:
+        start = max(1, hunk['start_line'])
+        end = hunk.get('end_line', start)
+        new_count = hunk.get('new_count')
+        if new_count:
+            end = max(end, start + new_count - 1)
+        ranges.append((start, max(start, end)))
+    return ranges
+    
+class ContextWindower:
+    """Cuts file content into windows that fit a token budget."""
+    
+    def __init__(self, token_budget: int, context_lines: int = 20, overlap_lines: int = 10,
+                 estimator: Callable[[str], int] = estimate_tokens, max_scope_scan: int = 200):
+        """
+        Initialize the windower.
+        
+        Args:
+            token_budget: Maximum tokens of content per request
+            context_lines: Lines kept around each changed range
+            overlap_lines: Lines shared by consecutive windows of a split file
+            estimator: Function returning the token count of a string
+            max_scope_scan: How far above a window to look for its enclosing scope
+        """
+        self.token_budget = token_budget
+        self.context_lines = context_lines
+        self.overlap_lines = overlap_lines
+        self.estimator = estimator
+        self.max_scope_scan = max_scope_scan
+        
+    def fits(self, content: str) -> bool:
+        """Check if content fits the budget as a whole."""
+        return self.estimator(content) <= self.token_budget
+        
+    def window_file(self, content: str) -> List[ContextWindow]:
+        """
+        Window a whole file: one window if it fits, overlapping windows otherwise.
+        
+        Args:
+            content: File content
+            
+        Returns:
+            List of ContextWindow objects covering the file
+        """
+        lines = content.splitlines(keepends=True)
+        if self.fits(content):
+            return [ContextWindow(1, max(1, len(lines)), content)]
+        return self._split(lines, 1, len(lines))
+        
+    def window_changes(self, content: str, ranges: List[Tuple[int, int]]) -> List[ContextWindow]:
+        """
+        Window the changed line ranges of a file.
+        
+        Each range is widened by ``context_lines`` and overlapping ranges are
+        merged. If the result exceeds the budget the context is narrowed, and
+        any range that still doesn't fit is split into overlapping windows.
+        
+        Args:
+            content: Full file content
+            ranges: Changed (start_line, end_line) ranges, 1-based and inclusive
+            
+        Returns:
+            List of ContextWindow objects in file order
+        """
+        lines = content.splitlines(keepends=True)
+        if not lines or not ranges:
+            return []
+            
+        context_lines = self.context_lines
+        while True:
+            merged = self._merge(ranges, context_lines, len(lines))
+            windows = [self._window(lines, start, end) for start, end in merged]
+            total = sum(self.estimator(window.content) for window in windows)
+            if total <= self.token_budget or context_lines == 0:
+                break
+            context_lines //= 2
+            
+        result = []
+        for window in windows:
+            if self.fits(window.content):
+                result.append(window)
+            else:
+                result.extend(self._split(lines, window.start_line, window.end_line))
+        return result
+        
+    @staticmethod
+    def _merge(ranges: List[Tuple[int, int]], context_lines: int, line_count: int) -> List[Tuple[int, int]]:
+        """Widen ranges by context_lines, clamp them to the file and merge overlaps."""
+        widened = sorted(
+            (max(1, start - context_lines), min(line_count, end + context_lines))
+            for start, end in ranges
+            if start <= line_count
+        )
+        merged: List[Tuple[int, int]] = []
+        for start, end in widened:
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+        
+    def _window(self, lines: List[str], start: int, end: int) -> ContextWindow:
+        """Build a window for lines start..end with its enclosing scope header."""
+        window = ContextWindow(start, end, ''.join(lines[start - 1:end]))
+        scope_line = self._find_scope(lines, start)
+        if scope_line is not None:
+            window.scope = lines[scope_line - 1].rstrip('\n')
+            window.scope_line = scope_line
+        return window
+        
+    def _find_scope(self, lines: List[str], start: int) -> Optional[int]:
+        """
+        Find the nearest scope header above a window that encloses it.
+        
+        A header encloses the window if it is indented less than the window's
+        first non-blank line. Only ``max_scope_scan`` lines are inspected.
+        """
+        first = lines[start - 1]
+        index = start - 1
+        while not first.strip() and index < len(lines) - 1:
+            index += 1
+            first = lines[index]
+        indent = len(first) - len(first.lstrip())
+        if indent == 0:
+            return None
+            
+        for line_index in range(start - 2, max(-1, start - 2 - self.max_scope_scan), -1):
+            line = lines[line_index]
+            if not line.strip():
+                continue
+            line_indent = len(line) - len(line.lstrip())
+            if line_indent < indent and SCOPE_PATTERN.match(line):
+                return line_index + 1
+        return None
+        
+    def _split(self, lines: List[str], start: int, end: int) -> List[ContextWindow]:
+        """Split lines start..end into overlapping windows within the budget."""
+        windows = []
+        window_start = start
+        while window_start <= end:
+            window_end = window_start
+            tokens = self.estimator(lines[window_start - 1])
+            while window_end < end:
+                line_tokens = self.estimator(lines[window_end])
+                if tokens + line_tokens > self.token_budget:
+                    break
+                tokens += line_tokens
+                window_end += 1
+            windows.append(self._window(lines, window_start, window_end))
+            if window_end >= end:
+                break
+            # Overlap at most half the window, so short windows still advance
+            overlap = min(self.overlap_lines, (window_end - window_start) // 2)
+            window_start = max(window_start + 1, window_end - overlap + 1)
+        return windows
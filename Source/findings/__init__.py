@@ -0,0 +1,12 @@
+"""
+Findings package for code review.
+Provides the output data models written to the findings report.
+"""
+
+from .models import Finding, CostSummary, ProcessingMetrics
+
+__all__ = [
+    'Finding',
+    'CostSummary',
+    'ProcessingMetrics',
+]
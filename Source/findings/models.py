@@ -0,0 +1,74 @@
+"""
+Data models for the findings report.
+"""
+
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, Literal
+
+@dataclass(frozen=True)
+class Finding:
+    """A single rule violation reported for a file."""
+    file: str  # relative path
+    line: int  # 1-based
+    rule_id: str
+    message: str
+    severity: Literal["info", "warning", "error"]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert finding to dictionary format."""
+        return asdict(self)
+        
+@dataclass
+class CostSummary:
+    """Token usage and cost of the LLM calls made for a run."""
+    provider: str
+    model: str
+    tokens_prompt: int = 0
+    tokens_completion: int = 0
+    cost_usd: float = 0.0
+    processing_time: float = 0.0  # seconds
+    requests: int = 0
+    cached_responses: int = 0      # requests answered by the response cache
+    tokens_saved: int = 0          # prompt + completion tokens of those requests' original calls
+    cost_saved_usd: float = 0.0
+    
+    def add(self, tokens_prompt: int, tokens_completion: int, cost_usd: float, from_cache: bool = False) -> None:
+        """
+        Account for one LLM response.
+        
+        Responses replayed from the cache count as saved rather than spent,
+        using the usage recorded for the original call.
+        """
+        self.requests += 1
+        if from_cache:
+            self.cached_responses += 1
+            self.tokens_saved += tokens_prompt + tokens_completion
+            self.cost_saved_usd += cost_usd
+        else:
+            self.tokens_prompt += tokens_prompt
+            self.tokens_completion += tokens_completion
+            self.cost_usd += cost_usd
+            
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert cost summary to dictionary format."""
+        return asdict(self)
+        
+@dataclass
+class ProcessingMetrics:
+    """Timings and file counts for a run."""
+    files_processed: int = 0
+    total_time: float = 0.0
+    avg_time_per_file: float = 0.0
+    collection_time: float = 0.0
+    context_build_time: float = 0.0
+    llm_analysis_time: float = 0.0
+    files_skipped: Dict[str, int] = field(default_factory=dict)  # reason -> count
+    
+    def add_skipped(self, counts: Dict[str, int]) -> None:
+        """Add skipped-file counts per reason, e.g. from DirectoryScanner.skip_counts()."""
+        for reason, count in counts.items():
+            self.files_skipped[reason] = self.files_skipped.get(reason, 0) + count
+            
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert metrics to dictionary format."""
+        return asdict(self)
@@ -0,0 +1,13 @@
+from ..models import Finding, ProcessingMetrics
+
+def test_finding_to_dict():
+    finding = Finding(file='a.py', line=3, rule_id='SEC-001', message='secret', severity='error')
+    
+    assert finding.to_dict() == {'file': 'a.py', 'line': 3, 'rule_id': 'SEC-001', 'message': 'secret', 'severity': 'error'}
+    
+def test_metrics_accumulate_skip_counts():
+    metrics = ProcessingMetrics()
+    metrics.add_skipped({'lockfile': 2, 'binary': 1})
+    metrics.add_skipped({'lockfile': 1})
+    
+    assert metrics.to_dict()['files_skipped'] == {'lockfile': 3, 'binary': 1}
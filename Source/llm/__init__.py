@@ -0,0 +1,56 @@
+"""
+LLM package for code review.
+Sends prompts to LLM back-ends within provider rate limits and parses their findings.
+"""
+
+from .errors import BackendError, RateLimitError, BackendTimeoutError, ContextLengthError
+from .backend import BaseBackend, HTTPBackend, ReviewResult, StreamDelta, parse_findings
+from .transport import TransportPool, TransportConfig
+from .openai import OpenAIBackend
+from .claude import ClaudeBackend
+from .gemini import GeminiBackend
+from .local import LocalBackend
+from .factory import BackendFactory
+from .rate_limit import TokenBucket
+from .dispatch import DispatchEngine, ProviderLimits, DispatchStats
+from .latency import LatencyTracker
+from .streaming import FindingStreamParser, StreamCollector
+from .hedging import Hedger, HedgePolicy, HedgeStats
+from .adaptive import AdaptiveExecutor, SafeSizes, AdaptiveStats
+from .router import ModelRouter, Route, UnitFeatures, unit_features
+
+__all__ = [
+    'BackendError',
+    'RateLimitError',
+    'BackendTimeoutError',
+    'ContextLengthError',
+    'BaseBackend',
+    'HTTPBackend',
+    'ReviewResult',
+    'StreamDelta',
+    'parse_findings',
+    'TransportPool',
+    'TransportConfig',
+    'OpenAIBackend',
+    'ClaudeBackend',
+    'GeminiBackend',
+    'LocalBackend',
+    'BackendFactory',
+    'TokenBucket',
+    'DispatchEngine',
+    'ProviderLimits',
+    'DispatchStats',
+    'LatencyTracker',
+    'FindingStreamParser',
+    'StreamCollector',
+    'Hedger',
+    'HedgePolicy',
+    'HedgeStats',
+    'AdaptiveExecutor',
+    'SafeSizes',
+    'AdaptiveStats',
+    'ModelRouter',
+    'Route',
+    'UnitFeatures',
+    'unit_features',
+]
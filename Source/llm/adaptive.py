@@ -0,0 +1,303 @@
+"""
+Adaptive split-and-retry execution of review units.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from ..context.splitter import split_context
+from ..context.windowing import estimate_tokens
+from ..findings.models import Finding
+from ..prompt.prompt_builder import PromptBuilder
+from .backend import BaseBackend, ReviewResult
+from .dispatch import DispatchEngine
+from .errors import BackendError, BackendTimeoutError, ContextLengthError
+
+class SafeSizes:
+    """
+    Learned largest safe prompt size, in tokens, per provider and model.
+    
+    A context overflow is a hard signal: it lowers the model's limit to
+    ``shrink`` times the failed request's size, and that limit is kept
+    between runs when a path is given. Timeouts are only a soft signal,
+    since a slow provider times out at any size: once ``timeout_repeats``
+    timeouts happened within ``timeout_ttl`` seconds the smallest of them
+    sets a temporary limit, which lapses as they expire. Every
+    ``probe_every``-th unit above the limit is sent whole anyway, and a
+    success raises the limit to its size, so a limit learned from a
+    provider hiccup recovers.
+    """
+    
+    def __init__(self, path: Optional[str] = None, shrink: float = 0.7, timeout_repeats: int = 2,
+                 timeout_ttl: float = 600.0, probe_every: int = 20, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            path: JSON file to load limits from and save them to
+            shrink: Fraction of a failed request's size taken as the new limit
+            timeout_repeats: Timeouts within timeout_ttl needed for a temporary limit
+            timeout_ttl: Seconds a timeout counts towards the temporary limit
+            probe_every: Send one in this many units above the limit unsplit; 0 never
+            clock: Monotonic time source
+        """
+        self.path = path
+        self.shrink = shrink
+        self.timeout_repeats = timeout_repeats
+        self.timeout_ttl = timeout_ttl
+        self.probe_every = probe_every
+        self.clock = clock
+        self._limits: Dict[str, int] = {}
+        self._timeouts: Dict[str, List[Tuple[float, int]]] = {}
+        self._over_limit: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._limits = {key: int(value) for key, value in json.load(f).items()}
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not read safe sizes from {path}: {e}")
+                
+    @staticmethod
+    def key(backend: BaseBackend) -> str:
+        return f"{backend.provider}:{backend.model}"
+        
+    def limit(self, backend: BaseBackend) -> Optional[int]:
+        """Largest prompt currently considered safe for the back-end's model, or None if unknown."""
+        key = self.key(backend)
+        with self._lock:
+            limits = [self._limits[key]] if key in self._limits else []
+            timeouts = self._recent_timeouts(key)
+            if timeouts and len(timeouts) >= self.timeout_repeats:
+                limits.append(max(1, int(min(tokens for _, tokens in timeouts) * self.shrink)))
+        return min(limits) if limits else None
+        
+    def _recent_timeouts(self, key: str) -> List[Tuple[float, int]]:
+        cutoff = self.clock() - self.timeout_ttl
+        timeouts = [entry for entry in self._timeouts.get(key, []) if entry[0] > cutoff]
+        self._timeouts[key] = timeouts
+        return timeouts
+        
+    def probe(self, backend: BaseBackend) -> bool:
+        """
+        Count a unit above the limit.
+        
+        Returns:
+            True if it should be sent whole to test whether the limit is too low
+        """
+        if not self.probe_every:
+            return False
+        key = self.key(backend)
+        with self._lock:
+            self._over_limit[key] = self._over_limit.get(key, 0) + 1
+            return self._over_limit[key] % self.probe_every == 0
+            
+    def record_overflow(self, backend: BaseBackend, tokens: int) -> None:
+        """Lower the limit after a request of tokens overflowed the model's context."""
+        key = self.key(backend)
+        with self._lock:
+            limit = max(1, int(tokens * self.shrink))
+            if key not in self._limits or limit < self._limits[key]:
+                self._limits[key] = limit
+                self._save()
+                
+    def record_timeout(self, backend: BaseBackend, tokens: int) -> None:
+        """Count a timed-out request of tokens towards a temporary limit."""
+        key = self.key(backend)
+        with self._lock:
+            self._recent_timeouts(key).append((self.clock(), tokens))
+            
+    def record_success(self, backend: BaseBackend, tokens: int) -> None:
+        """Raise the limit, and forget smaller timeouts, after a request of tokens succeeded."""
+        key = self.key(backend)
+        with self._lock:
+            if key in self._timeouts:
+                self._timeouts[key] = [entry for entry in self._timeouts[key] if entry[1] > tokens]
+            if key in self._limits and tokens > self._limits[key]:
+                self._limits[key] = tokens
+                self._save()
+                
+    def _save(self) -> None:
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._limits, f, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        
+    def to_dict(self) -> Dict[str, int]:
+        """Return the learned hard limits by 'provider:model'."""
+        with self._lock:
+            return dict(self._limits)
+            
+@dataclass
+class AdaptiveStats:
+    """Counters for split-and-retry execution."""
+    units: int = 0
+    requests: int = 0
+    splits: int = 0        # units split after a timeout or context overflow
+    presplits: int = 0     # units split up front because they exceed the learned safe size
+    probes: int = 0        # units above the learned safe size sent whole to test it
+    unreviewed: int = 0    # pieces that failed at the minimum size
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert stats to dictionary format."""
+        return asdict(self)
+        
+class AdaptiveExecutor:
+    """
+    Reviews contexts, splitting those that are too large for the model.
+    
+    When a request times out or overflows the model's context, the context
+    is split along hunk, window or file boundaries (see
+    ``context.splitter``) and the pieces are reviewed in parallel,
+    recursively, down to ``min_lines``. Pieces that still fail are reported
+    as an 'info' finding instead of being dropped silently. Failures teach
+    SafeSizes a per-model limit, so later contexts above it are split
+    before they are sent, apart from the occasional probe.
+    """
+    
+    def __init__(self, engine: DispatchEngine, builder: PromptBuilder, sizes: Optional[SafeSizes] = None,
+                 min_lines: int = 20, max_depth: int = 8, estimator: Callable[[str], int] = estimate_tokens):
+        """
+        Initialize the executor.
+        
+        Args:
+            engine: Engine that sends the requests
+            builder: Renders contexts and rules into prompts
+            sizes: Learned safe sizes; a fresh in-memory one if omitted
+            min_lines: Smallest piece a context is split into
+            max_depth: Maximum number of successive splits of one context
+            estimator: Token counter used to size prompts
+        """
+        self.engine = engine
+        self.builder = builder
+        self.sizes = sizes or SafeSizes()
+        self.min_lines = min_lines
+        self.max_depth = max_depth
+        self.estimator = estimator
+        self._stats = AdaptiveStats()
+        
+    @classmethod
+    def from_config(cls, engine: DispatchEngine, builder: PromptBuilder, config: Dict[str, Any]) -> 'AdaptiveExecutor':
+        """
+        Create an executor from the 'llm' section of the user configuration.
+        
+        Reads the optional 'adaptive' entry: min_lines, max_depth,
+        sizes_path (where learned safe sizes are kept between runs),
+        timeout_repeats, timeout_ttl_sec and probe_every.
+        """
+        adaptive = config.get('adaptive') or {}
+        sizes = SafeSizes(
+            adaptive.get('sizes_path'),
+            timeout_repeats=int(adaptive.get('timeout_repeats', 2)),
+            timeout_ttl=float(adaptive.get('timeout_ttl_sec', 600)),
+            probe_every=int(adaptive.get('probe_every', 20))
+        )
+        return cls(
+            engine,
+            builder,
+            sizes=sizes,
+            min_lines=int(adaptive.get('min_lines', 20)),
+            max_depth=int(adaptive.get('max_depth', 8))
+        )
+        
+    async def review(self, backend: BaseBackend, context: Dict[str, Any], rules: List[Dict[str, Any]]) -> ReviewResult:
+        """
+        Review a context against rules, splitting it as needed.
+        
+        Returns:
+            The merged result of every piece that was sent
+            
+        Raises:
+            BackendError: For failures other than timeouts and context overflow
+        """
+        self._stats.units += 1
+        return await self._review(backend, context, rules, 0)
+        
+    async def _review(self, backend: BaseBackend, context: Dict[str, Any], rules: List[Dict[str, Any]],
+                      depth: int) -> ReviewResult:
+        prompt = self.builder.build(context, rules)
+        tokens = prompt.prefix_tokens + self.estimator(prompt.user)
+        limit = self.sizes.limit(backend)
+        if limit is not None and tokens > limit and depth < self.max_depth:
+            pieces = split_context(context, self.min_lines)
+            if pieces is not None:
+                if not self.sizes.probe(backend):
+                    self._stats.presplits += 1
+                    return await self._review_pieces(backend, pieces, rules, depth + 1)
+                self._stats.probes += 1
+                
+        self._stats.requests += 1
+        try:
+            result = await self.engine.review(backend, prompt, retry_timeouts=False)
+        except (BackendTimeoutError, ContextLengthError) as e:
+            if isinstance(e, ContextLengthError):
+                self.sizes.record_overflow(backend, tokens)
+            else:
+                self.sizes.record_timeout(backend, tokens)
+            pieces = split_context(context, self.min_lines) if depth < self.max_depth else None
+            if pieces is None:
+                self._stats.unreviewed += 1
+                print(f"Warning: Giving up on part of {_file(context)} at minimum size: {e}")
+                return ReviewResult(findings=[unreviewed_finding(context, e)])
+            self._stats.splits += 1
+            return await self._review_pieces(backend, pieces, rules, depth + 1)
+        self.sizes.record_success(backend, tokens)
+        return result
+        
+    async def _review_pieces(self, backend: BaseBackend, pieces: List[Dict[str, Any]], rules: List[Dict[str, Any]],
+                             depth: int) -> ReviewResult:
+        results = await asyncio.gather(*(self._review(backend, piece, rules, depth) for piece in pieces))
+        return merge_results(results)
+        
+    def stats(self) -> Dict[str, Any]:
+        """Return split counters and the learned safe sizes."""
+        return {**self._stats.to_dict(), 'safe_sizes': self.sizes.to_dict()}
+        
+def merge_results(results: List[ReviewResult]) -> ReviewResult:
+    """
+    Combine the results of the pieces of one context.
+    
+    Findings reported by more than one piece (from overlapping windows) are
+    kept once.
+    """
+    findings = list(dict.fromkeys(finding for result in results for finding in result.findings))
+    cached = [result.cached_tokens for result in results if result.cached_tokens is not None]
+    return ReviewResult(
+        findings=findings,
+        tokens_prompt=sum(result.tokens_prompt for result in results),
+        tokens_completion=sum(result.tokens_completion for result in results),
+        cost_usd=sum(result.cost_usd for result in results),
+        cached_tokens=sum(cached) if cached else None,
+        from_cache=all(result.from_cache for result in results),
+        truncated=any(result.truncated for result in results)
+    )
+    
+def _file(context: Dict[str, Any]) -> str:
+    if context.get('review_type') == 'directory':
+        return context['files'][0]['file'] if context['files'] else ''
+    return context['file']
+    
+def _first_line(context: Dict[str, Any]) -> int:
+    if context.get('review_type') == 'directory':
+        return context['files'][0].get('start_line', 1) if context['files'] else 1
+    hunks = (context.get('changes') or {}).get('hunks')
+    if hunks:
+        return hunks[0]['start_line']
+    if context.get('windows'):
+        return context['windows'][0]['start_line']
+    return 1
+    
+def unreviewed_finding(context: Dict[str, Any], error: BackendError) -> Finding:
+    """The 'info' finding that marks code the LLM could not review."""
+    if isinstance(error, ContextLengthError):
+        rule_id, message = 'LLM-CONTEXT-LENGTH', 'LLM context length exceeded'
+    else:
+        rule_id, message = 'LLM-TIMEOUT', 'LLM timeout'
+    return Finding(file=_file(context), line=_first_line(context), rule_id=rule_id, message=message, severity='info')
@@ -0,0 +1,374 @@
+"""
+Base class and shared helpers for LLM back-ends.
+"""
+
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, AsyncIterator, List, Mapping, Optional
+import httpx
+from ..findings.models import Finding
+from ..prompt.prompt_builder import Prompt
+from .errors import BackendError, RateLimitError, BackendTimeoutError, ContextLengthError
+
+SEVERITIES = ('info', 'warning', 'error')
+REQUIRED_KEYS = ('file', 'line', 'rule_id', 'message')
+
+# Error messages of OpenAI, Anthropic, Gemini and llama.cpp for prompts that don't fit
+_CONTEXT_LENGTH = re.compile(
+    r'context_length_exceeded|maximum context length|prompt is too long|exceeds the maximum number of tokens|'
+    r'exceeds the available context size|context window|too many tokens',
+    re.IGNORECASE
+)
+
+_FENCE = re.compile(r'```(?:json)?\s*(.*?)```', re.DOTALL)
+
+@dataclass
+class ReviewResult:
+    """Findings and usage returned by one LLM request."""
+    findings: List[Finding] = field(default_factory=list)
+    tokens_prompt: int = 0
+    tokens_completion: int = 0
+    cost_usd: float = 0.0
+    cached_tokens: Optional[int] = None
+    from_cache: bool = False  # replayed from the ResponseCache; usage is the original call's
+    truncated: bool = False   # the stream was cut off; findings are those received before
+    time_to_first_finding: Optional[float] = None  # seconds from sending to the first streamed finding
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert result to dictionary format."""
+        return {
+            'findings': [finding.to_dict() for finding in self.findings],
+            'tokens_prompt': self.tokens_prompt,
+            'tokens_completion': self.tokens_completion,
+            'cost_usd': self.cost_usd,
+            'cached_tokens': self.cached_tokens,
+            'truncated': self.truncated,
+            'time_to_first_finding': self.time_to_first_finding
+        }
+        
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], from_cache: bool = False) -> 'ReviewResult':
+        """Rebuild a result from ``to_dict()`` output."""
+        return cls(
+            findings=[Finding(**finding) for finding in data['findings']],
+            tokens_prompt=data['tokens_prompt'],
+            tokens_completion=data['tokens_completion'],
+            cost_usd=data['cost_usd'],
+            cached_tokens=data.get('cached_tokens'),
+            from_cache=from_cache
+        )
+        
+@dataclass
+class StreamDelta:
+    """One event of a streamed reply: new text and/or usage reported so far."""
+    text: str = ''
+    tokens_prompt: Optional[int] = None
+    tokens_completion: Optional[int] = None
+    cached_tokens: Optional[int] = None
+    cache_write_tokens: Optional[int] = None
+    
+class BaseBackend:
+    """
+    An LLM provider that reviews prompts.
+    
+    Subclasses set ``provider`` and implement ``review``; those that can
+    stream set ``supports_streaming`` and implement ``stream``. Back-ends raise
+    BackendError (or a subclass) for failed requests and leave retries,
+    timeouts and rate limiting to the DispatchEngine.
+    """
+    
+    provider = ''
+    temperature = 0.0
+    supports_streaming = False
+    
+    # USD per million (prompt, completion) tokens, by model
+    PRICES: Dict[str, tuple] = {}
+    # Price of prompt tokens read from / written to the provider's prompt
+    # cache, relative to the prompt price
+    CACHE_READ_RATE = 1.0
+    CACHE_WRITE_RATE = 1.0
+    
+    def __init__(self, model: str):
+        self.model = model
+        
+    async def review(self, prompt: Prompt) -> ReviewResult:
+        """
+        Send a prompt and parse the findings from the reply.
+        
+        Raises:
+            BackendError: If the request fails or the reply can't be parsed
+        """
+        raise NotImplementedError
+        
+    def stream(self, prompt: Prompt) -> AsyncIterator[StreamDelta]:
+        """
+        Send a prompt and yield the reply as it arrives.
+        
+        Raises:
+            BackendError: If the request fails before or during the stream
+        """
+        raise NotImplementedError
+        
+    def request_options(self, prompt: Prompt) -> Dict[str, Any]:
+        """
+        Everything besides the prompt's messages that shapes the reply.
+        
+        Part of the response cache key, so back-ends that differ only in
+        endpoint or request settings don't share cached replies.
+        """
+        return {'temperature': self.temperature}
+        
+    async def aclose(self) -> None:
+        """Release connections held by the back-end."""
+        
+    def cost(self, tokens_prompt: int, tokens_completion: int, cached_tokens: Optional[int] = None,
+             cache_write_tokens: Optional[int] = None) -> float:
+        """
+        Price a request from its token usage; unknown models cost 0.
+        
+        tokens_prompt includes the cached_tokens read from and the
+        cache_write_tokens written to the prompt cache, which are priced at
+        CACHE_READ_RATE and CACHE_WRITE_RATE times the prompt price.
+        """
+        prompt_price, completion_price = self.PRICES.get(self.model, (0.0, 0.0))
+        read, written = cached_tokens or 0, cache_write_tokens or 0
+        prompt = tokens_prompt - read - written + read * self.CACHE_READ_RATE + written * self.CACHE_WRITE_RATE
+        return (prompt * prompt_price + tokens_completion * completion_price) / 1_000_000
+        
+class HTTPBackend(BaseBackend):
+    """
+    A back-end reached over HTTP with a JSON request per prompt.
+    
+    Subclasses define the endpoint, headers, request body and how to read
+    the reply. Pass a client from a TransportPool to share keep-alive
+    connections between back-ends; otherwise the back-end creates its own.
+    """
+    
+    DEFAULT_URL = ''
+    supports_streaming = True
+    
+    # Keys of the request body that carry the prompt's messages
+    PROMPT_KEYS = ('messages',)
+    
+    def __init__(self, model: str, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 client: Optional[httpx.AsyncClient] = None, timeout: float = 30.0):
+        """
+        Initialize the back-end.
+        
+        Args:
+            model: Provider model name
+            api_key: Provider API key, if the endpoint needs one
+            base_url: Endpoint URL; defaults to the provider's public API
+            client: Shared client to send requests with
+            timeout: Connect/read timeout in seconds for a client created here
+            
+        Raises:
+            ValueError: If there is no base URL
+        """
+        super().__init__(model)
+        base_url = base_url or self.DEFAULT_URL
+        if not base_url:
+            raise ValueError(f"No base URL for {self.provider} back-end")
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(timeout=timeout)
+        
+    def endpoint(self) -> str:
+        """URL to POST a prompt to."""
+        raise NotImplementedError
+        
+    def headers(self) -> Dict[str, str]:
+        """Request headers, including authentication."""
+        return {}
+        
+    def payload(self, prompt: Prompt) -> Dict[str, Any]:
+        """Request body for a prompt."""
+        raise NotImplementedError
+        
+    def request_options(self, prompt: Prompt) -> Dict[str, Any]:
+        """The endpoint and the request body without the messages."""
+        options = {key: value for key, value in self.payload(prompt).items() if key not in self.PROMPT_KEYS}
+        return {'endpoint': self.endpoint(), **options}
+        
+    def parse(self, data: Dict[str, Any]) -> ReviewResult:
+        """
+        Build the result from a decoded reply.
+        
+        May raise KeyError, IndexError or TypeError for unexpected replies.
+        """
+        raise NotImplementedError
+        
+    def stream_endpoint(self) -> str:
+        """URL to POST a streaming request to."""
+        return self.endpoint()
+        
+    def stream_payload(self, prompt: Prompt) -> Dict[str, Any]:
+        """Request body asking for a server-sent event stream."""
+        return {**self.payload(prompt), 'stream': True}
+        
+    def parse_event(self, data: Dict[str, Any]) -> Optional[StreamDelta]:
+        """
+        Read one decoded stream event.
+        
+        Returns None for events without text or usage. May raise KeyError,
+        IndexError or TypeError for unexpected events, and BackendError for
+        error events.
+        """
+        raise NotImplementedError
+        
+    def _transport_error(self, error: httpx.TransportError) -> BackendError:
+        if isinstance(error, httpx.TimeoutException):
+            return BackendTimeoutError(f"{self.provider} request timed out: {error!r}")
+        return BackendError(f"{self.provider} request failed: {error!r}", retryable=True)
+        
+    async def review(self, prompt: Prompt) -> ReviewResult:
+        try:
+            response = await self._client.post(self.endpoint(), json=self.payload(prompt), headers=self.headers())
+        except httpx.TransportError as e:
+            raise self._transport_error(e) from e
+        raise_for_status(self.provider, response.status_code, response.headers, response.text)
+        
+        try:
+            return self.parse(response.json())
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise BackendError(f"Unexpected {self.provider} response: {response.text[:200]}") from e
+            
+    async def stream(self, prompt: Prompt) -> AsyncIterator[StreamDelta]:
+        request = self._client.stream('POST', self.stream_endpoint(), json=self.stream_payload(prompt), headers=self.headers())
+        try:
+            async with request as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                    raise_for_status(self.provider, response.status_code, response.headers, response.text)
+                async for line in response.aiter_lines():
+                    if not line.startswith('data:'):
+                        continue
+                    data = line[5:].strip()
+                    if data == '[DONE]':
+                        return
+                    try:
+                        delta = self.parse_event(json.loads(data))
+                    except (ValueError, KeyError, IndexError, TypeError) as e:
+                        raise BackendError(f"Unexpected {self.provider} stream event: {data[:200]}") from e
+                    if delta is not None:
+                        yield delta
+        except httpx.TransportError as e:
+            raise self._transport_error(e) from e
+            
+    def result(self, content: str, tokens_prompt: int, tokens_completion: int,
+               cached_tokens: Optional[int] = None, cache_write_tokens: Optional[int] = None) -> ReviewResult:
+        """Parse the findings in a reply's text and price its usage."""
+        return ReviewResult(
+            findings=parse_findings(content),
+            tokens_prompt=tokens_prompt,
+            tokens_completion=tokens_completion,
+            cost_usd=self.cost(tokens_prompt, tokens_completion, cached_tokens, cache_write_tokens),
+            cached_tokens=cached_tokens
+        )
+        
+    async def aclose(self) -> None:
+        if self._owns_client:
+            await self._client.aclose()
+            
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+    
+    Args:
+        value: Delay in seconds or an HTTP date
+        
+    Returns:
+        Seconds to wait, or None if absent or malformed
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+        
+def raise_for_status(provider: str, status: int, headers: Mapping[str, str], body: str) -> None:
+    """
+    Map an HTTP error response to a BackendError.
+    
+    429 raises RateLimitError; 413 and 400s that say the prompt is too long
+    raise ContextLengthError; 408, 409 and 5xx are retryable; other 4xx
+    are not.
+    """
+    if status < 400:
+        return
+    message = f"{provider} returned HTTP {status}: {body[:200]}"
+    retry_after = parse_retry_after(headers.get('retry-after'))
+    if status == 429:
+        raise RateLimitError(message, retry_after=retry_after)
+    if status == 413 or (status == 400 and _CONTEXT_LENGTH.search(body)):
+        raise ContextLengthError(message, status=status)
+    retryable = status in (408, 409) or status >= 500
+    raise BackendError(message, status=status, retryable=retryable, retry_after=retry_after)
+    
+def parse_findings(text: str) -> List[Finding]:
+    """
+    Parse the JSON array of findings in a model reply.
+    
+    Accepts the array on its own, inside a Markdown code fence or wrapped
+    in an object under 'findings'. Entries missing required keys are
+    skipped with a warning; unknown severities become 'warning'.
+    
+    Raises:
+        BackendError: If the reply contains no JSON findings
+    """
+    fenced = _FENCE.search(text)
+    if fenced:
+        text = fenced.group(1)
+    text = text.strip()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        start, end = text.find('['), text.rfind(']')
+        try:
+            data = json.loads(text[start:end + 1]) if 0 <= start < end else None
+        except json.JSONDecodeError:
+            data = None
+    if isinstance(data, dict):
+        data = data.get('findings')
+    if not isinstance(data, list):
+        raise BackendError(f"Reply is not a JSON array of findings: {text[:200]}")
+        
+    findings = []
+    for entry in data:
+        finding = finding_from_entry(entry)
+        if finding is not None:
+            findings.append(finding)
+    return findings
+    
+def finding_from_entry(entry: Any) -> Optional[Finding]:
+    """
+    Convert one decoded finding object.
+    
+    Returns:
+        The Finding, or None (with a warning) if the entry is malformed
+    """
+    if not isinstance(entry, dict) or any(entry.get(key) is None for key in REQUIRED_KEYS):
+        print(f"Warning: Skipping malformed finding: {entry}")
+        return None
+    try:
+        line = int(entry['line'])
+    except (TypeError, ValueError):
+        print(f"Warning: Skipping finding with invalid line: {entry}")
+        return None
+    severity = str(entry.get('severity', 'warning')).lower()
+    return Finding(
+        file=str(entry['file']),
+        line=line,
+        rule_id=str(entry['rule_id']),
+        message=str(entry['message']),
+        severity=severity if severity in SEVERITIES else 'warning'
+    )
@@ -0,0 +1,94 @@
+"""
+Back-end for Anthropic Claude models.
+"""
+
+from typing import Dict, Any, Optional
+import httpx
+from ..prompt.prompt_builder import Prompt
+from .backend import HTTPBackend, ReviewResult, StreamDelta
+from .errors import BackendError
+
+ANTHROPIC_VERSION = '2023-06-01'
+
+class ClaudeBackend(HTTPBackend):
+    """
+    Reviews prompts with the Anthropic Messages API.
+    
+    The rules prefix is sent as a system block marked for prompt caching;
+    cache reads are billed at a tenth of the input price and cache writes at
+    a quarter more.
+    """
+    
+    provider = 'anthropic'
+    DEFAULT_URL = 'https://api.anthropic.com'
+    PROMPT_KEYS = ('system', 'messages')
+    PRICES = {
+        'claude-3-haiku': (0.25, 1.25),
+        'claude-3-haiku-20240307': (0.25, 1.25),
+        'claude-3-5-haiku-latest': (0.80, 4.00),
+        'claude-3-5-sonnet-latest': (3.00, 15.00)
+    }
+    CACHE_READ_RATE = 0.1
+    CACHE_WRITE_RATE = 1.25
+    
+    def __init__(self, model: str, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 client: Optional[httpx.AsyncClient] = None, timeout: float = 30.0, max_tokens: int = 4096):
+        """
+        Initialize the back-end.
+        
+        Args:
+            max_tokens: Completion token limit, required by the Messages API
+            
+        See HTTPBackend for the other arguments.
+        """
+        super().__init__(model, api_key=api_key, base_url=base_url, client=client, timeout=timeout)
+        self.max_tokens = max_tokens
+        
+    def endpoint(self) -> str:
+        return f"{self.base_url}/v1/messages"
+        
+    def headers(self) -> Dict[str, str]:
+        headers = {'anthropic-version': ANTHROPIC_VERSION}
+        if self.api_key:
+            headers['x-api-key'] = self.api_key
+        return headers
+        
+    def payload(self, prompt: Prompt) -> Dict[str, Any]:
+        return {
+            'model': self.model,
+            'max_tokens': self.max_tokens,
+            'temperature': self.temperature,
+            'system': [{'type': 'text', 'text': prompt.prefix, 'cache_control': {'type': 'ephemeral'}}],
+            'messages': [{'role': 'user', 'content': prompt.user}]
+        }
+        
+    def parse(self, data: Dict[str, Any]) -> ReviewResult:
+        text = ''.join(block['text'] for block in data['content'] if block.get('type') == 'text')
+        usage = data.get('usage') or {}
+        return self.result(text, prompt_tokens(usage), usage.get('output_tokens', 0),
+                           usage.get('cache_read_input_tokens'), usage.get('cache_creation_input_tokens'))
+                           
+    def parse_event(self, data: Dict[str, Any]) -> Optional[StreamDelta]:
+        kind = data.get('type')
+        if kind == 'error':
+            error = data.get('error') or {}
+            raise BackendError(f"{self.provider} stream error: {error.get('message', error)}",
+                               retryable=error.get('type') in ('overloaded_error', 'api_error'))
+        if kind == 'message_start':
+            usage = data['message'].get('usage') or {}
+            return StreamDelta(
+                tokens_prompt=prompt_tokens(usage),
+                tokens_completion=usage.get('output_tokens'),
+                cached_tokens=usage.get('cache_read_input_tokens'),
+                cache_write_tokens=usage.get('cache_creation_input_tokens')
+            )
+        if kind == 'content_block_delta' and data['delta'].get('type') == 'text_delta':
+            return StreamDelta(text=data['delta']['text'])
+        if kind == 'message_delta':
+            return StreamDelta(tokens_completion=(data.get('usage') or {}).get('output_tokens'))
+        return None
+        
+def prompt_tokens(usage: Dict[str, Any]) -> int:
+    """Total prompt tokens; input_tokens excludes tokens read from or written to the cache."""
+    return (usage.get('input_tokens') or 0) + (usage.get('cache_read_input_tokens') or 0) + \
+        (usage.get('cache_creation_input_tokens') or 0)
@@ -0,0 +1,290 @@
+"""
+Async dispatch of review prompts with per-provider concurrency and rate limits.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Callable, Iterable, Optional, Tuple, Union
+from ..cache.response_cache import ResponseCache
+from ..context.windowing import estimate_tokens
+from ..findings.models import Finding
+from ..prompt.prompt_builder import Prompt
+from .backend import BaseBackend, ReviewResult
+from .errors import BackendError, BackendTimeoutError, RateLimitError
+from .latency import LatencyTracker
+from .rate_limit import TokenBucket
+from .streaming import StreamCollector
+
+@dataclass
+class ProviderLimits:
+    """Concurrency and rate limits for one provider."""
+    concurrency: int = 4
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'ProviderLimits':
+        """Build limits from an llm.limits.<provider> config section."""
+        return cls(
+            concurrency=int(config.get('concurrency', cls.concurrency)),
+            requests_per_minute=config.get('rpm'),
+            tokens_per_minute=config.get('tpm')
+        )
+        
+@dataclass
+class DispatchStats:
+    """Counters for the requests sent to one provider."""
+    requests: int = 0
+    cache_hits: int = 0
+    attempts: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    timeouts: int = 0
+    failures: int = 0
+    truncated: int = 0          # streams cut off after some findings arrived
+    throttle_time: float = 0.0  # seconds waiting on rate limits
+    backoff_time: float = 0.0   # seconds sleeping between attempts
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert stats to dictionary format."""
+        return asdict(self)
+        
+class _Provider:
+    """Limiter state shared by all requests to one provider."""
+    
+    def __init__(self, limits: ProviderLimits):
+        if limits.concurrency < 1:
+            raise ValueError(f"Concurrency must be at least 1: {limits.concurrency}")
+        self.semaphore = asyncio.Semaphore(limits.concurrency)
+        self.requests = TokenBucket(limits.requests_per_minute) if limits.requests_per_minute else None
+        self.tokens = TokenBucket(limits.tokens_per_minute) if limits.tokens_per_minute else None
+        self.paused_until = 0.0
+        self.stats = DispatchStats()
+        
+class DispatchEngine:
+    """
+    Sends prompts to back-ends concurrently without exceeding provider limits.
+    
+    Each provider gets a semaphore bounding in-flight requests plus optional
+    requests/min and tokens/min buckets. Every attempt is bounded by
+    ``asyncio.wait_for``, which cancels the request on timeout. Retryable
+    failures back off exponentially with full jitter; a Retry-After from the
+    provider is honoured and holds back all requests to that provider.
+    
+    With a ResponseCache, identical requests are answered from disk before
+    they are admitted, so hits cost neither rate limit budget nor a slot.
+    """
+    
+    def __init__(self, limits: Optional[Dict[str, ProviderLimits]] = None, timeout: float = 15.0,
+                 max_attempts: int = 3, backoff_base: float = 1.0, backoff_max: float = 30.0,
+                 estimator: Callable[[str], int] = estimate_tokens, rng: Optional[random.Random] = None,
+                 cache: Optional[ResponseCache] = None):
+        """
+        Initialize the engine.
+        
+        Args:
+            limits: Limits per provider; providers not listed get ProviderLimits()
+            timeout: Seconds allowed per attempt
+            max_attempts: Attempts per prompt, including the first
+            backoff_base: Backoff ceiling after the first failure, doubled per attempt
+            backoff_max: Upper bound on the backoff ceiling
+            estimator: Token counter used to charge the tokens/min bucket
+            rng: Random source for jitter
+            cache: Response cache consulted before each request
+        """
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1: {max_attempts}")
+        self.limits = dict(limits or {})
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.estimator = estimator
+        self.rng = rng or random.Random()
+        self.cache = cache
+        self.latency = LatencyTracker()
+        self.first_finding = LatencyTracker()
+        self._providers: Dict[str, _Provider] = {}
+        
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], cache: Optional[ResponseCache] = None) -> 'DispatchEngine':
+        """Build an engine from the llm section of codereview.yaml."""
+        return cls(
+            cache=cache,
+            limits={name: ProviderLimits.from_config(section or {})
+                    for name, section in (config.get('limits') or {}).items()},
+            timeout=float(config.get('timeout_sec', 15)),
+            max_attempts=int(config.get('max_attempts', 3))
+        )
+        
+    def _provider(self, name: str) -> _Provider:
+        if name not in self._providers:
+            self._providers[name] = _Provider(self.limits.get(name, ProviderLimits()))
+        return self._providers[name]
+        
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Delay before retrying after the given failed attempt (1-based).
+        
+        Without Retry-After this is uniform in [0, min(backoff_max,
+        backoff_base * 2 ** (attempt - 1))]. With it, the server's delay plus
+        up to backoff_base of jitter, so clients told the same delay don't
+        all come back at once.
+        """
+        if retry_after is not None:
+            return retry_after + self.rng.uniform(0, self.backoff_base)
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return self.rng.uniform(0, ceiling)
+        
+    async def _admit(self, provider: _Provider, tokens: int) -> None:
+        """Wait for any provider-wide pause and the rate limit buckets."""
+        start = time.monotonic()
+        delay = provider.paused_until - start
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if provider.requests:
+            await provider.requests.acquire(1)
+        if provider.tokens:
+            await provider.tokens.acquire(tokens)
+        provider.stats.throttle_time += time.monotonic() - start
+        
+    async def review(self, backend: BaseBackend, prompt: Prompt, retry_timeouts: bool = True) -> ReviewResult:
+        """
+        Review a prompt, retrying retryable failures.
+        
+        Args:
+            backend: Back-end to send the prompt to
+            prompt: Prompt to review
+            retry_timeouts: Whether timed-out attempts are retried; callers
+                that split the prompt instead pass False
+                
+        Returns:
+            The back-end's result, or the stored one (``from_cache``) on a
+            response cache hit
+            
+        Raises:
+            BackendError: After a non-retryable failure or max_attempts attempts;
+                BackendTimeoutError if the last attempt timed out
+        """
+        return await self._review(backend, prompt, None, retry_timeouts)
+        
+    async def review_stream(self, backend: BaseBackend, prompt: Prompt,
+                            on_finding: Optional[Callable[[Finding], None]] = None) -> ReviewResult:
+        """
+        Review a prompt, streaming findings to on_finding as they are parsed.
+        
+        Failures before the first finding are retried as in ``review``. Once
+        a finding has been emitted the request is not retried (that would
+        emit it twice); if the stream is then cut off by an error or the
+        timeout, the findings received so far are returned with
+        ``truncated`` set. Time to first finding is recorded per provider.
+        
+        Raises:
+            BackendError: As ``review``, if no finding arrived
+        """
+        return await self._review(backend, prompt, StreamCollector(on_finding), True)
+        
+    async def _review(self, backend: BaseBackend, prompt: Prompt, collector: Optional[StreamCollector],
+                      retry_timeouts: bool) -> ReviewResult:
+        provider = self._provider(backend.provider)
+        stats = provider.stats
+        stats.requests += 1
+        key = None
+        if self.cache is not None:
+            key = ResponseCache.key(backend.provider, backend.model, backend.temperature, prompt.messages(),
+                                    backend.request_options(prompt))
+            stored = await asyncio.to_thread(self.cache.get, key)
+            if stored is not None:
+                stats.cache_hits += 1
+                result = ReviewResult.from_dict(stored, from_cache=True)
+                if collector is not None:
+                    for finding in result.findings:
+                        collector.emit(finding)
+                return result
+        tokens = prompt.prefix_tokens + self.estimator(prompt.user)
+        
+        for attempt in range(1, self.max_attempts + 1):
+            await self._admit(provider, tokens)
+            stats.attempts += 1
+            try:
+                async with provider.semaphore:
+                    sent = time.monotonic()
+                    if collector is None:
+                        call = backend.review(prompt)
+                    else:
+                        collector.start()
+                        call = collector.consume(backend, prompt)
+                    result = await asyncio.wait_for(call, self.timeout)
+                    self.latency.record(backend.provider, time.monotonic() - sent)
+            except asyncio.TimeoutError:
+                stats.timeouts += 1
+                error: BackendError = BackendTimeoutError(
+                    f"{backend.provider} request timed out after {self.timeout}s")
+            except BackendError as e:
+                if isinstance(e, BackendTimeoutError):
+                    stats.timeouts += 1
+                error = e
+            else:
+                if result.time_to_first_finding is not None:
+                    self.first_finding.record(backend.provider, result.time_to_first_finding)
+                used = result.tokens_prompt + result.tokens_completion
+                if provider.tokens and used > tokens:
+                    provider.tokens.consume(used - tokens)
+                if key is not None:
+                    await asyncio.to_thread(self.cache.put, key, result.to_dict())
+                return result
+                
+            if collector is not None and collector.findings:
+                stats.truncated += 1
+                print(f"Warning: {error}; keeping {len(collector.findings)} findings received before the stream was cut off")
+                result = collector.result(backend, truncated=True)
+                if result.time_to_first_finding is not None:
+                    self.first_finding.record(backend.provider, result.time_to_first_finding)
+                return result
+            if isinstance(error, RateLimitError):
+                stats.rate_limited += 1
+                if error.retry_after:
+                    provider.paused_until = max(provider.paused_until, time.monotonic() + error.retry_after)
+            give_up = not retry_timeouts and isinstance(error, BackendTimeoutError)
+            if give_up or not error.retryable or attempt == self.max_attempts:
+                stats.failures += 1
+                raise error
+            delay = self.backoff(attempt, error.retry_after)
+            stats.retries += 1
+            stats.backoff_time += delay
+            await asyncio.sleep(delay)
+            
+    async def review_all(self, items: Iterable[Tuple[BaseBackend, Prompt]]) -> List[Union[ReviewResult, BackendError]]:
+        """
+        Review prompts concurrently, within each provider's limits.
+        
+        Failures are returned in place of the result; any other exception
+        cancels the remaining requests and propagates.
+        
+        Returns:
+            A ReviewResult or BackendError per item, in input order
+        """
+        async def settle(backend: BaseBackend, prompt: Prompt) -> Union[ReviewResult, BackendError]:
+            try:
+                return await self.review(backend, prompt)
+            except BackendError as e:
+                return e
+                
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(settle(backend, prompt)) for backend, prompt in items]
+        return [task.result() for task in tasks]
+        
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return dispatch counters, p50/p95/p99 latency and time to first finding per provider."""
+        latency = self.latency.summary()
+        first_finding = self.first_finding.summary()
+        return {
+            name: {
+                **provider.stats.to_dict(),
+                'latency': latency.get(name),
+                'time_to_first_finding': first_finding.get(name)
+            }
+            for name, provider in self._providers.items()
+        }
@@ -0,0 +1,40 @@
+"""
+Errors raised by LLM back-ends and the dispatch engine.
+"""
+
+from typing import Optional
+
+class BackendError(RuntimeError):
+    """
+    A failed LLM request.
+    
+    Attributes:
+        status: HTTP status code, if the server answered
+        retryable: Whether sending the same request again may succeed
+        retry_after: Seconds the server asked us to wait, if it said so
+    """
+    
+    def __init__(self, message: str, status: Optional[int] = None, retryable: bool = False,
+                 retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+        self.retry_after = retry_after
+        
+class RateLimitError(BackendError):
+    """The provider rejected the request with 429 Too Many Requests."""
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message, status=429, retryable=True, retry_after=retry_after)
+        
+class BackendTimeoutError(BackendError):
+    """The request did not complete within the timeout."""
+    
+    def __init__(self, message: str):
+        super().__init__(message, retryable=True)
+        
+class ContextLengthError(BackendError):
+    """The prompt exceeded the model's context window."""
+    
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message, status=status, retryable=False)
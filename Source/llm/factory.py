@@ -0,0 +1,87 @@
+"""
+Creates LLM back-ends that share one transport pool.
+"""
+
+from typing import Dict, Optional, Type
+from ..config.env import EnvLoader
+from .backend import HTTPBackend
+from .claude import ClaudeBackend
+from .gemini import GeminiBackend
+from .local import LocalBackend
+from .openai import OpenAIBackend
+from .transport import TransportPool
+
+BACKENDS: Dict[str, Type[HTTPBackend]] = {
+    'openai': OpenAIBackend,
+    'anthropic': ClaudeBackend,
+    'google': GeminiBackend,
+    'local': LocalBackend
+}
+
+DEFAULT_MODELS = {
+    'openai': 'gpt-4o',
+    'anthropic': 'claude-3-haiku',
+    'google': 'gemini-1.5-pro-latest',
+    'local': 'local'
+}
+
+# EnvLoader provider name for each back-end's key
+ENV_PROVIDERS = {
+    'openai': 'OPENAI',
+    'anthropic': 'ANTHROPIC',
+    'google': 'GOOGLE',
+    'local': 'LLAMA'
+}
+
+class BackendFactory:
+    """Builds back-ends by provider name, all drawing clients from one TransportPool."""
+    
+    def __init__(self, env: Optional[EnvLoader] = None, pool: Optional[TransportPool] = None):
+        """
+        Initialize the factory.
+        
+        Args:
+            env: Source of API keys and LLAMA_SERVER_URL; loaded from .env if omitted
+            pool: Shared transport pool; a default one is created if omitted
+        """
+        self.env = env
+        self.pool = pool or TransportPool()
+        
+    def create(self, provider: str, model: Optional[str] = None, base_url: Optional[str] = None) -> HTTPBackend:
+        """
+        Create a back-end.
+        
+        Args:
+            provider: One of BACKENDS
+            model: Model name; defaults to the provider's default model
+            base_url: Endpoint override, e.g. a proxy; for 'local' it replaces LLAMA_SERVER_URL
+            
+        Returns:
+            Back-end using the pool's client for its endpoint
+            
+        Raises:
+            ValueError: If the provider is unknown or its key is not set
+        """
+        if provider not in BACKENDS:
+            raise ValueError(f"Unknown LLM provider: {provider}")
+        model = model or DEFAULT_MODELS[provider]
+        if provider == 'local':
+            url = base_url or self._env().get_api_key(ENV_PROVIDERS[provider])
+            return LocalBackend(url, model=model, client=self.pool.client(url))
+        backend_class = BACKENDS[provider]
+        url = base_url or backend_class.DEFAULT_URL
+        return backend_class(
+            model,
+            api_key=self._env().get_api_key(ENV_PROVIDERS[provider]),
+            base_url=url,
+            client=self.pool.client(url)
+        )
+        
+    def _env(self) -> EnvLoader:
+        if self.env is None:
+            self.env = EnvLoader()
+        return self.env
+        
+    async def aclose(self) -> None:
+        """Close the shared pool."""
+        await self.pool.aclose()
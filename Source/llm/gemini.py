@@ -0,0 +1,60 @@
+"""
+Back-end for Google Gemini models.
+"""
+
+from typing import Dict, Any, Optional
+from ..prompt.prompt_builder import Prompt
+from .backend import HTTPBackend, ReviewResult, StreamDelta
+
+class GeminiBackend(HTTPBackend):
+    """Reviews prompts with the Gemini generateContent API."""
+    
+    provider = 'google'
+    DEFAULT_URL = 'https://generativelanguage.googleapis.com'
+    PROMPT_KEYS = ('systemInstruction', 'contents')
+    PRICES = {
+        'gemini-1.5-pro-latest': (1.25, 5.00),
+        'gemini-1.5-flash-latest': (0.075, 0.30),
+        'gemini-2.0-flash': (0.10, 0.40)
+    }
+    
+    def endpoint(self) -> str:
+        return f"{self.base_url}/v1beta/models/{self.model}:generateContent"
+        
+    def stream_endpoint(self) -> str:
+        return f"{self.base_url}/v1beta/models/{self.model}:streamGenerateContent?alt=sse"
+        
+    def headers(self) -> Dict[str, str]:
+        return {'x-goog-api-key': self.api_key} if self.api_key else {}
+        
+    def payload(self, prompt: Prompt) -> Dict[str, Any]:
+        return {
+            'systemInstruction': {'parts': [{'text': prompt.prefix}]},
+            'contents': [{'role': 'user', 'parts': [{'text': prompt.user}]}],
+            'generationConfig': {'temperature': self.temperature, 'responseMimeType': 'application/json'}
+        }
+        
+    def stream_payload(self, prompt: Prompt) -> Dict[str, Any]:
+        # Streaming is selected by the endpoint, not the body
+        return self.payload(prompt)
+        
+    def parse_event(self, data: Dict[str, Any]) -> Optional[StreamDelta]:
+        candidates = data.get('candidates') or []
+        parts = (candidates[0].get('content') or {}).get('parts') or [] if candidates else []
+        usage = data.get('usageMetadata') or {}
+        return StreamDelta(
+            text=''.join(part.get('text', '') for part in parts),
+            tokens_prompt=usage.get('promptTokenCount'),
+            tokens_completion=usage.get('candidatesTokenCount'),
+            cached_tokens=usage.get('cachedContentTokenCount')
+        )
+        
+    def parse(self, data: Dict[str, Any]) -> ReviewResult:
+        parts = data['candidates'][0]['content']['parts']
+        usage = data.get('usageMetadata') or {}
+        return self.result(
+            ''.join(part.get('text', '') for part in parts),
+            usage.get('promptTokenCount', 0),
+            usage.get('candidatesTokenCount', 0),
+            usage.get('cachedContentTokenCount')
+        )
@@ -0,0 +1,185 @@
+"""
+Hedged requests and ordered failover across LLM back-ends.
+"""
+
+import asyncio
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Iterable, List, Optional, Set, Union
+from ..prompt.prompt_builder import Prompt
+from .backend import BaseBackend, ReviewResult
+from .dispatch import DispatchEngine
+from .errors import BackendError
+from .factory import BackendFactory
+
+@dataclass
+class HedgePolicy:
+    """When to race a duplicate request against the next back-end."""
+    percentile: float = 95.0     # hedge once a request runs longer than this latency percentile
+    min_samples: int = 20        # samples needed before the percentile is trusted
+    default_delay: float = 5.0   # seconds to wait while there are fewer samples
+    min_delay: float = 0.05      # never hedge sooner than this
+    max_parallel: int = 2        # requests in flight per prompt, including the original
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'HedgePolicy':
+        """Build a policy from the llm.hedge section of codereview.yaml."""
+        return cls(
+            percentile=float(config.get('percentile', cls.percentile)),
+            min_samples=int(config.get('min_samples', cls.min_samples)),
+            default_delay=float(config.get('default_delay_sec', cls.default_delay)),
+            min_delay=float(config.get('min_delay_sec', cls.min_delay)),
+            max_parallel=int(config.get('max_parallel', cls.max_parallel))
+        )
+        
+@dataclass
+class HedgeStats:
+    """Counters for hedged and failed-over reviews."""
+    requests: int = 0
+    hedged: int = 0          # duplicates started because the request was slow
+    failovers: int = 0       # back-ends tried because an earlier one failed
+    hedge_wins: int = 0      # reviews answered by a hedged duplicate
+    cancelled: int = 0       # losing requests cancelled
+    failures: int = 0        # reviews where every back-end failed
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert stats to dictionary format."""
+        return asdict(self)
+        
+class Hedger:
+    """
+    Reviews each prompt with an ordered list of back-ends.
+    
+    The first back-end is tried alone. If it hasn't answered within the
+    policy's latency percentile for its provider, the next back-end races it
+    and the first successful answer wins; the losers are cancelled. If a
+    back-end fails (after the engine's own retries), the next one in the
+    list takes over. Requests still go through the DispatchEngine, so each
+    provider's concurrency and rate limits hold.
+    """
+    
+    def __init__(self, engine: DispatchEngine, backends: List[BaseBackend], policy: Optional[HedgePolicy] = None):
+        """
+        Initialize the hedger.
+        
+        Args:
+            engine: Engine that sends requests and tracks latency
+            backends: Back-ends in order of preference
+            policy: Hedging policy; None only fails over, never hedges
+            
+        Raises:
+            ValueError: If no back-end is given
+        """
+        if not backends:
+            raise ValueError("Hedger needs at least one back-end")
+        self.engine = engine
+        self.backends = list(backends)
+        self.policy = policy
+        self.wins: Dict[str, int] = {}
+        self._stats = HedgeStats()
+        
+    @classmethod
+    def from_config(cls, engine: DispatchEngine, factory: BackendFactory, config: Dict[str, Any]) -> 'Hedger':
+        """
+        Build a hedger from the llm section of codereview.yaml.
+        
+        The configured provider/model comes first, followed by each
+        llm.failover entry; llm.hedge enables hedging.
+        """
+        backends = [factory.create(config['provider'], config.get('model'))]
+        for entry in config.get('failover') or []:
+            backends.append(factory.create(entry['provider'], entry.get('model'), entry.get('base_url')))
+        hedge = config.get('hedge')
+        return cls(engine, backends, HedgePolicy.from_config(hedge) if hedge is not None else None)
+        
+    def hedge_delay(self, backend: BaseBackend) -> Optional[float]:
+        """Seconds to wait for a request to backend before hedging, or None to wait indefinitely."""
+        if self.policy is None:
+            return None
+        delay = self.policy.default_delay
+        if self.engine.latency.count(backend.provider) >= self.policy.min_samples:
+            delay = self.engine.latency.percentile(backend.provider, self.policy.percentile)
+        return max(self.policy.min_delay, delay)
+        
+    async def review(self, prompt: Prompt) -> ReviewResult:
+        """
+        Review a prompt, hedging slow requests and failing over on errors.
+        
+        Raises:
+            BackendError: The last back-end's error, if every back-end failed
+        """
+        stats = self._stats
+        stats.requests += 1
+        queue = list(self.backends)
+        owner: Dict[asyncio.Task, BaseBackend] = {}
+        running: Set[asyncio.Task] = set()
+        hedges: Set[asyncio.Task] = set()
+        error: Optional[BackendError] = None
+        loop = asyncio.get_running_loop()
+        launched_at = 0.0
+        
+        def launch() -> asyncio.Task:
+            nonlocal launched_at
+            task = asyncio.create_task(self.engine.review(queue[0], prompt))
+            owner[task] = queue.pop(0)
+            running.add(task)
+            launched_at = loop.time()
+            return task
+            
+        latest = launch()
+        try:
+            while running:
+                timeout = None
+                if queue and self.policy is not None and len(running) < self.policy.max_parallel:
+                    # The deadline runs from the latest launch, not from this pass
+                    # through the loop, so a failed request doesn't reset it
+                    timeout = max(0.0, launched_at + self.hedge_delay(owner[latest]) - loop.time())
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    latest = launch()
+                    hedges.add(latest)
+                    stats.hedged += 1
+                    continue
+                    
+                for task in done:
+                    running.discard(task)
+                    if task.exception() is None:
+                        if task in hedges:
+                            stats.hedge_wins += 1
+                        provider = owner[task].provider
+                        self.wins[provider] = self.wins.get(provider, 0) + 1
+                        return task.result()
+                    if not isinstance(task.exception(), BackendError):
+                        raise task.exception()
+                    error = task.exception()
+                if not running and queue:
+                    latest = launch()
+                    stats.failovers += 1
+        finally:
+            for task in running:
+                task.cancel()
+            stats.cancelled += len(running)
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+        stats.failures += 1
+        raise error
+        
+    async def review_all(self, prompts: Iterable[Prompt]) -> List[Union[ReviewResult, BackendError]]:
+        """
+        Review prompts concurrently.
+        
+        Returns:
+            A ReviewResult or BackendError per prompt, in input order
+        """
+        async def settle(prompt: Prompt) -> Union[ReviewResult, BackendError]:
+            try:
+                return await self.review(prompt)
+            except BackendError as e:
+                return e
+                
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(settle(prompt)) for prompt in prompts]
+        return [task.result() for task in tasks]
+        
+    def stats(self) -> Dict[str, Any]:
+        """Return hedging counters, wins per provider and the engine's per-provider latency."""
+        return {**self._stats.to_dict(), 'wins': dict(self.wins), 'latency': self.engine.latency.summary()}
@@ -0,0 +1,65 @@
+"""
+Per-provider latency tracking.
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Deque, Dict, Any, Optional
+
+class LatencyTracker:
+    """
+    Keeps a sliding window of successful request latencies per provider.
+    
+    Percentiles use the nearest-rank method over the last ``window``
+    samples, so they follow a provider that slows down during a run.
+    """
+    
+    def __init__(self, window: int = 512):
+        """
+        Args:
+            window: Samples kept per provider
+        """
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        
+    def record(self, provider: str, seconds: float) -> None:
+        """Record the latency of a successful request."""
+        with self._lock:
+            if provider not in self._samples:
+                self._samples[provider] = deque(maxlen=self.window)
+            self._samples[provider].append(seconds)
+            
+    def count(self, provider: str) -> int:
+        """Number of samples held for a provider."""
+        with self._lock:
+            return len(self._samples.get(provider, ()))
+            
+    def percentile(self, provider: str, percent: float) -> Optional[float]:
+        """
+        Latency below which percent of the provider's recent requests finished.
+        
+        Returns:
+            Seconds, or None without samples
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(provider, ()))
+        if not samples:
+            return None
+        rank = max(1, math.ceil(percent / 100 * len(samples)))
+        return samples[rank - 1]
+        
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Return sample count and p50/p95/p99 in seconds per provider."""
+        with self._lock:
+            providers = list(self._samples)
+        return {
+            provider: {
+                'count': self.count(provider),
+                'p50': self.percentile(provider, 50),
+                'p95': self.percentile(provider, 95),
+                'p99': self.percentile(provider, 99)
+            }
+            for provider in providers
+        }
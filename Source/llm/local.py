@@ -0,0 +1,36 @@
+"""
+Back-end for a local llama.cpp server (LLAMA_SERVER_URL).
+"""
+
+from typing import Dict, Any, Optional
+import httpx
+from ..prompt.prompt_builder import Prompt
+from .openai import OpenAIBackend
+
+class LocalBackend(OpenAIBackend):
+    """
+    Reviews prompts with a llama.cpp server's OpenAI-compatible chat endpoint.
+    
+    Requests set ``cache_prompt`` so the server keeps the shared rules prefix
+    in its KV cache between requests.
+    """
+    
+    provider = 'local'
+    DEFAULT_URL = ''
+    PRICES = {}
+    
+    def __init__(self, base_url: str, model: str = 'local', timeout: float = 30.0,
+                 client: Optional[httpx.AsyncClient] = None):
+        """
+        Initialize the back-end.
+        
+        Args:
+            base_url: Server URL, e.g. http://localhost:8080
+            model: Model name sent with each request
+            timeout: Connect/read timeout in seconds for a client created here
+            client: Shared client to send requests with
+        """
+        super().__init__(model, base_url=base_url, client=client, timeout=timeout)
+        
+    def payload(self, prompt: Prompt) -> Dict[str, Any]:
+        return {**super().payload(prompt), 'cache_prompt': True}
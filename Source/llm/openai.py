@@ -0,0 +1,58 @@
+"""
+Back-end for OpenAI chat models.
+"""
+
+from typing import Dict, Any, Optional
+from ..prompt.prompt_builder import Prompt
+from .backend import HTTPBackend, ReviewResult, StreamDelta
+from .errors import BackendError
+
+class OpenAIBackend(HTTPBackend):
+    """Reviews prompts with the OpenAI chat completions API."""
+    
+    provider = 'openai'
+    DEFAULT_URL = 'https://api.openai.com'
+    PRICES = {
+        'gpt-4o': (2.50, 10.00),
+        'gpt-4o-mini': (0.15, 0.60),
+        'gpt-4.1': (2.00, 8.00),
+        'gpt-4.1-mini': (0.40, 1.60)
+    }
+    
+    def endpoint(self) -> str:
+        return f"{self.base_url}/v1/chat/completions"
+        
+    def headers(self) -> Dict[str, str]:
+        return {'Authorization': f"Bearer {self.api_key}"} if self.api_key else {}
+        
+    def payload(self, prompt: Prompt) -> Dict[str, Any]:
+        return {'model': self.model, 'messages': prompt.messages(), 'temperature': self.temperature}
+        
+    def parse(self, data: Dict[str, Any]) -> ReviewResult:
+        usage = data.get('usage') or {}
+        details = usage.get('prompt_tokens_details') or {}
+        return self.result(
+            data['choices'][0]['message']['content'],
+            usage.get('prompt_tokens', 0),
+            usage.get('completion_tokens', 0),
+            details.get('cached_tokens')
+        )
+        
+    def stream_payload(self, prompt: Prompt) -> Dict[str, Any]:
+        return {**super().stream_payload(prompt), 'stream_options': {'include_usage': True}}
+        
+    def parse_event(self, data: Dict[str, Any]) -> Optional[StreamDelta]:
+        if data.get('error'):
+            raise BackendError(f"{self.provider} stream error: {data['error']}", retryable=True)
+        choices = data.get('choices') or []
+        text = (choices[0].get('delta') or {}).get('content') or '' if choices else ''
+        usage = data.get('usage')
+        if not text and not usage:
+            return None
+        usage = usage or {}
+        return StreamDelta(
+            text=text,
+            tokens_prompt=usage.get('prompt_tokens'),
+            tokens_completion=usage.get('completion_tokens'),
+            cached_tokens=(usage.get('prompt_tokens_details') or {}).get('cached_tokens')
+        )
@@ -0,0 +1,74 @@
+"""
+Token-bucket rate limiting for LLM requests.
+"""
+
+import asyncio
+import time
+from typing import Callable, Optional
+
+class TokenBucket:
+    """
+    Async token bucket refilled continuously at a per-minute rate.
+    
+    Used for both requests/min (one token per request) and tokens/min (the
+    estimated size of each request). Waiters are served in arrival order, so
+    a large request can't be starved by a stream of small ones.
+    """
+    
+    def __init__(self, per_minute: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the bucket, full.
+        
+        Args:
+            per_minute: Refill rate
+            capacity: Maximum burst; defaults to one minute's worth
+            clock: Monotonic clock in seconds
+            
+        Raises:
+            ValueError: If the rate is not positive
+        """
+        if per_minute <= 0:
+            raise ValueError(f"Rate must be positive: {per_minute}")
+        self.rate = per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else per_minute)
+        self.clock = clock
+        self.tokens = self.capacity
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+        
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        
+    async def acquire(self, amount: float = 1) -> float:
+        """
+        Wait until amount tokens are available and take them.
+        
+        Amounts above the capacity are capped to it, so an oversized request
+        waits for a full bucket instead of forever.
+        
+        Returns:
+            Seconds spent waiting
+        """
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+                
+    def consume(self, amount: float) -> None:
+        """
+        Take tokens without waiting, e.g. to charge actual usage above the estimate.
+        
+        The balance may go negative; later acquires wait for it to recover.
+        """
+        self._refill()
+        self.tokens -= amount
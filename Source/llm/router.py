@@ -0,0 +1,298 @@
+"""
+Cost- and latency-aware routing of review units to LLM back-ends.
+"""
+
+import asyncio
+import time
+from collections import Counter
+from dataclasses import dataclass, field, fields
+from fnmatch import fnmatchcase
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
+from ..context.splitter import context_lines
+from ..findings.models import CostSummary
+from ..prompt.prompt_builder import PromptBuilder
+from ..utils.language_utils import get_language_from_extension
+from .adaptive import AdaptiveExecutor
+from .backend import BaseBackend, ReviewResult, SEVERITIES
+from .dispatch import DispatchEngine
+from .errors import BackendError
+from .factory import BACKENDS, BackendFactory
+from .latency import LatencyTracker
+
+# Severity assumed for rules that don't declare one, as for findings
+DEFAULT_SEVERITY = 'warning'
+# Keys of an llm.routes entry; conditions go under 'when'
+ROUTE_KEYS = {'name', 'provider', 'model', 'base_url', 'when'}
+
+@dataclass(frozen=True)
+class UnitFeatures:
+    """What routing knows about a review unit."""
+    languages: Tuple[str, ...]
+    hunks: int            # diff hunks; 0 for file and directory reviews
+    changed_lines: int    # removed + added lines, or every reviewed line outside diffs
+    severity: str         # highest severity in the rule set
+    rule_ids: Tuple[str, ...]
+    
+def _severity(rule: Dict[str, Any]) -> str:
+    severity = str(rule.get('severity', DEFAULT_SEVERITY)).lower()
+    return severity if severity in SEVERITIES else DEFAULT_SEVERITY
+    
+def unit_features(context: Dict[str, Any], rules: List[Dict[str, Any]]) -> UnitFeatures:
+    """Extract the routing features of a context reviewed against rules."""
+    if context.get('review_type') == 'directory':
+        files = context['files']
+        languages = {f.get('language') or get_language_from_extension(f['file']) for f in files}
+    else:
+        languages = {context.get('language') or get_language_from_extension(context['file'])}
+    hunks = (context.get('changes') or {}).get('hunks') or []
+    if hunks:
+        changed_lines = sum(
+            len((hunk.get('before') or '').splitlines()) + len((hunk.get('after') or '').splitlines())
+            for hunk in hunks
+        )
+    else:
+        changed_lines = context_lines(context)
+    severity = max((_severity(rule) for rule in rules), key=SEVERITIES.index, default=DEFAULT_SEVERITY)
+    return UnitFeatures(
+        languages=tuple(sorted(languages)),
+        hunks=len(hunks),
+        changed_lines=changed_lines,
+        severity=severity,
+        rule_ids=tuple(str(rule.get('id', '')) for rule in rules)
+    )
+    
+@dataclass
+class Route:
+    """
+    A back-end and the review units it takes.
+    
+    Every condition that is set must hold: all of the unit's languages are in
+    ``languages``, some rule id matches a ``rules`` pattern (fnmatch, e.g.
+    'SEC-*'), the rule set's highest severity is within
+    [``min_severity``, ``max_severity``], and hunk and changed line counts are
+    within their bounds. A route without conditions takes every unit.
+    """
+    name: str
+    provider: str
+    model: Optional[str] = None
+    base_url: Optional[str] = None
+    languages: Optional[List[str]] = None
+    rules: Optional[List[str]] = None
+    min_severity: Optional[str] = None
+    max_severity: Optional[str] = None
+    max_hunks: Optional[int] = None
+    min_changed_lines: Optional[int] = None
+    max_changed_lines: Optional[int] = None
+    
+    @classmethod
+    def from_config(cls, entry: Dict[str, Any]) -> 'Route':
+        """
+        Build a route from an llm.routes entry of codereview.yaml.
+        
+        A single language or rule pattern may be given as a string.
+        
+        Raises:
+            ValueError: If the entry is malformed, or its provider, a key, a
+                condition or a severity is unknown
+        """
+        if not isinstance(entry, dict):
+            raise ValueError(f"Route must be a mapping: {entry!r}")
+        name = str(entry.get('name') or f"{entry.get('provider')}:{entry.get('model') or 'default'}")
+        unknown = set(entry) - ROUTE_KEYS
+        if unknown:
+            raise ValueError(f"Unknown keys in route {name}: {', '.join(sorted(map(str, unknown)))}")
+        if entry.get('provider') not in BACKENDS:
+            raise ValueError(f"Unknown LLM provider in route {name}: {entry.get('provider')}")
+        conditions = entry.get('when') or {}
+        if not isinstance(conditions, dict):
+            raise ValueError(f"Route {name}: 'when' must be a mapping of conditions")
+        known = {f.name for f in fields(cls)} - ROUTE_KEYS
+        checked: Dict[str, Any] = {}
+        for key, value in conditions.items():
+            if key not in known:
+                raise ValueError(f"Unknown route condition in {name}: {key}")
+            if key in ('languages', 'rules'):
+                value = [value] if isinstance(value, str) else value
+                if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                    raise ValueError(f"Route {name}: {key} must be a string or a list of strings")
+            elif key in ('min_severity', 'max_severity'):
+                if value not in SEVERITIES:
+                    raise ValueError(f"Unknown severity for {key} in route {name}: {value}")
+            elif isinstance(value, bool) or not isinstance(value, int):
+                raise ValueError(f"Route {name}: {key} must be an integer, got {value!r}")
+            checked[key] = value
+        return cls(
+            name=name,
+            provider=entry['provider'],
+            model=entry.get('model'),
+            base_url=entry.get('base_url'),
+            **checked
+        )
+        
+    def matches(self, features: UnitFeatures) -> bool:
+        """Check whether the route takes a unit with these features."""
+        if self.languages is not None and not set(features.languages) <= set(self.languages):
+            return False
+        if self.rules is not None and not any(
+            fnmatchcase(rule_id, pattern) for rule_id in features.rule_ids for pattern in self.rules
+        ):
+            return False
+        rank = SEVERITIES.index(features.severity)
+        if self.min_severity is not None and rank < SEVERITIES.index(self.min_severity):
+            return False
+        if self.max_severity is not None and rank > SEVERITIES.index(self.max_severity):
+            return False
+        if self.max_hunks is not None and features.hunks > self.max_hunks:
+            return False
+        if self.min_changed_lines is not None and features.changed_lines < self.min_changed_lines:
+            return False
+        if self.max_changed_lines is not None and features.changed_lines > self.max_changed_lines:
+            return False
+        return True
+        
+@dataclass
+class RouteStats:
+    """Usage of one route."""
+    units: int = 0
+    fallbacks: int = 0     # units sent to the default route after this route failed
+    failures: int = 0
+    findings: Counter = field(default_factory=Counter)
+    
+class ModelRouter:
+    """
+    Sends each review unit to the first route that matches it.
+    
+    Routes are tried in order and units no route takes go to the default
+    route (``llm.provider``/``llm.model``). Put routes for error-level or
+    security rule sets before cheaper catch-alls, so those units keep the
+    strong model. A unit whose route fails after the engine's retries is
+    sent to the default route instead. Cost, latency and findings are
+    reported per route.
+    """
+    
+    def __init__(self, engine: DispatchEngine, builder: PromptBuilder, factory: BackendFactory,
+                 routes: List[Route], default: Route, executor: Optional[AdaptiveExecutor] = None):
+        """
+        Initialize the router.
+        
+        Args:
+            engine: Engine that sends the requests
+            builder: Renders contexts and rules into prompts
+            factory: Creates the back-end of each route
+            routes: Routes in priority order
+            default: Route for units no other route takes
+            executor: Adaptive executor used instead of sending prompts
+                to the engine directly, to split oversized units
+        """
+        self.engine = engine
+        self.builder = builder
+        self.factory = factory
+        self.routes = list(routes)
+        self.default = default
+        self.executor = executor
+        self.latency = LatencyTracker()
+        self._backends: Dict[Tuple[str, Optional[str], Optional[str]], BaseBackend] = {}
+        self._costs: Dict[str, CostSummary] = {}
+        self._stats: Dict[str, RouteStats] = {}
+        
+    @classmethod
+    def from_config(cls, engine: DispatchEngine, builder: PromptBuilder, factory: BackendFactory,
+                    config: Dict[str, Any], executor: Optional[AdaptiveExecutor] = None) -> 'ModelRouter':
+        """
+        Build a router from the llm section of codereview.yaml.
+        
+        llm.routes lists the routes in order; llm.provider and llm.model
+        form the default route.
+        """
+        routes = [Route.from_config(entry) for entry in config.get('routes') or []]
+        default = Route(name='default', provider=config['provider'], model=config.get('model'))
+        return cls(engine, builder, factory, routes, default, executor)
+        
+    def route(self, context: Dict[str, Any], rules: List[Dict[str, Any]]) -> Route:
+        """Pick the route for a context reviewed against rules."""
+        features = unit_features(context, rules)
+        for route in self.routes:
+            if route.matches(features):
+                return route
+        return self.default
+        
+    def backend(self, route: Route) -> BaseBackend:
+        """The route's back-end, shared by routes with the same provider, model and endpoint."""
+        key = (route.provider, route.model, route.base_url)
+        if key not in self._backends:
+            self._backends[key] = self.factory.create(route.provider, route.model, route.base_url)
+        return self._backends[key]
+        
+    async def review(self, context: Dict[str, Any], rules: List[Dict[str, Any]]) -> ReviewResult:
+        """
+        Review a context on its route's back-end.
+        
+        Raises:
+            BackendError: If the route, and the default route after it, failed
+        """
+        route = self.route(context, rules)
+        try:
+            return await self._review(route, context, rules)
+        except BackendError as e:
+            if route is self.default:
+                raise
+            self._route_stats(route).fallbacks += 1
+            print(f"Warning: Route {route.name} failed, using {self.default.name}: {e}")
+            return await self._review(self.default, context, rules)
+            
+    async def _review(self, route: Route, context: Dict[str, Any], rules: List[Dict[str, Any]]) -> ReviewResult:
+        stats = self._route_stats(route)
+        stats.units += 1
+        backend = self.backend(route)
+        start = time.monotonic()
+        try:
+            if self.executor is not None:
+                result = await self.executor.review(backend, context, rules)
+            else:
+                result = await self.engine.review(backend, self.builder.build(context, rules))
+        except BackendError:
+            stats.failures += 1
+            raise
+        elapsed = time.monotonic() - start
+        self.latency.record(route.name, elapsed)
+        cost = self._costs.setdefault(route.name, CostSummary(provider=backend.provider, model=backend.model))
+        cost.add(result.tokens_prompt, result.tokens_completion, result.cost_usd, result.from_cache)
+        cost.processing_time += elapsed
+        stats.findings.update(finding.severity for finding in result.findings)
+        return result
+        
+    async def review_all(self, items: Iterable[Tuple[Dict[str, Any], List[Dict[str, Any]]]]) -> List[Union[ReviewResult, BackendError]]:
+        """
+        Review (context, rules) pairs concurrently.
+        
+        Returns:
+            A ReviewResult or BackendError per item, in input order
+        """
+        async def settle(context: Dict[str, Any], rules: List[Dict[str, Any]]) -> Union[ReviewResult, BackendError]:
+            try:
+                return await self.review(context, rules)
+            except BackendError as e:
+                return e
+                
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(settle(context, rules)) for context, rules in items]
+        return [task.result() for task in tasks]
+        
+    def _route_stats(self, route: Route) -> RouteStats:
+        return self._stats.setdefault(route.name, RouteStats())
+        
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return units, fallbacks, findings by severity, cost and p50/p95/p99 latency per route."""
+        latency = self.latency.summary()
+        result = {}
+        for name, stats in self._stats.items():
+            cost = self._costs.get(name)
+            result[name] = {
+                'units': stats.units,
+                'fallbacks': stats.fallbacks,
+                'failures': stats.failures,
+                'findings': {severity: stats.findings[severity] for severity in SEVERITIES},
+                'cost': cost.to_dict() if cost is not None else None,
+                'latency': latency.get(name)
+            }
+        return result
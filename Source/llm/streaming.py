@@ -0,0 +1,212 @@
+"""
+Streaming reviews: incremental findings parsing and partial results.
+"""
+
+import json
+import time
+from typing import Callable, List, Optional
+from ..findings.models import Finding
+from ..prompt.prompt_builder import Prompt
+from .backend import BaseBackend, ReviewResult, finding_from_entry, parse_findings
+from .errors import BackendError
+
+class FindingStreamParser:
+    """
+    Emits each finding as soon as its JSON object closes.
+    
+    Text before the array (prose, a Markdown fence, or the start of a
+    ``{"findings": [`` wrapper) is skipped. The array starts at a '[' whose
+    next non-space character is '{' or ']', so brackets in prose such as
+    "per [rules]" are passed over, and brackets on the opening line of a
+    fence are ignored. Objects are only decoded once complete, so a reply
+    cut off mid-object loses just that object.
+    """
+    
+    def __init__(self):
+        self.complete = False  # the closing ']' was seen
+        self.count = 0
+        self._in_array = False
+        self._in_string = False
+        self._escape = False
+        self._depth = 0
+        self._buffer: List[str] = []
+        self._text: List[str] = []
+        self._opening = False  # a '[' was seen; waiting for its next non-space character
+        self._fence = False    # inside the opening line of a Markdown fence
+        self._tail = ''        # last characters before the array, to spot fences
+        
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        return ''.join(self._text)
+        
+    def feed(self, chunk: str) -> List[Finding]:
+        """
+        Consume the next piece of the reply.
+        
+        Returns:
+            Findings whose objects closed within this chunk
+        """
+        findings: List[Finding] = []
+        self._text.append(chunk)
+        if self.complete:
+            return findings
+        for char in chunk:
+            if not self._in_array and not self._start(char):
+                continue
+            if self._depth:
+                self._buffer.append(char)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            if char == '"':
+                self._in_string = True
+            elif char in '{[':
+                if not self._depth:
+                    self._buffer = [char]
+                self._depth += 1
+            elif char in '}]':
+                if not self._depth:
+                    if char == ']':
+                        self.complete = True
+                        break
+                    continue
+                self._depth -= 1
+                if not self._depth:
+                    finding = self._decode(''.join(self._buffer))
+                    if finding is not None:
+                        findings.append(finding)
+        self.count += len(findings)
+        return findings
+        
+    def _start(self, char: str) -> bool:
+        """
+        Scan a character before the array.
+        
+        Returns:
+            True if char is the first character inside the array
+        """
+        if self._opening:
+            if char.isspace():
+                return False
+            self._opening = False
+            if char in '{]':
+                self._in_array = True
+                return True
+        self._tail = (self._tail + char)[-3:]
+        if self._tail == '```':
+            self._fence = True
+        elif self._fence:
+            self._fence = char != '\n'
+        elif char == '[':
+            self._opening = True
+        return False
+        
+    @staticmethod
+    def _decode(text: str) -> Optional[Finding]:
+        try:
+            entry = json.loads(text)
+        except json.JSONDecodeError:
+            print(f"Warning: Skipping undecodable finding: {text[:200]}")
+            return None
+        return finding_from_entry(entry)
+        
+class StreamCollector:
+    """
+    Consumes one streamed review, keeping every finding received so far.
+    
+    The collector outlives the request, so when a stream is cut off by an
+    error or a timeout the findings that already arrived can still be
+    reported (``result(truncated=True)``).
+    """
+    
+    def __init__(self, on_finding: Optional[Callable[[Finding], None]] = None):
+        """
+        Args:
+            on_finding: Called with each finding as soon as it is parsed
+        """
+        self.on_finding = on_finding
+        self.findings: List[Finding] = []
+        self.sent_at: Optional[float] = None
+        self.first_finding_at: Optional[float] = None
+        self.tokens_prompt = 0
+        self.tokens_completion = 0
+        self.cached_tokens: Optional[int] = None
+        self.cache_write_tokens: Optional[int] = None
+        self._parser = FindingStreamParser()
+        
+    def start(self) -> None:
+        """Begin an attempt; only valid while no finding has been emitted."""
+        self.sent_at = time.monotonic()
+        self._parser = FindingStreamParser()
+        
+    def emit(self, finding: Finding) -> None:
+        """Record a finding and pass it to on_finding."""
+        if self.first_finding_at is None:
+            self.first_finding_at = time.monotonic()
+        self.findings.append(finding)
+        if self.on_finding is not None:
+            self.on_finding(finding)
+            
+    @property
+    def time_to_first_finding(self) -> Optional[float]:
+        """Seconds from sending the request to the first finding."""
+        if self.first_finding_at is None or self.sent_at is None:
+            return None
+        return self.first_finding_at - self.sent_at
+        
+    async def consume(self, backend: BaseBackend, prompt: Prompt) -> ReviewResult:
+        """
+        Stream a review from backend, emitting findings as they arrive.
+        
+        Back-ends that can't stream are reviewed normally and their findings
+        emitted when the reply is complete.
+        
+        Raises:
+            BackendError: If the request fails, or the stream ends before the
+                findings array is closed
+        """
+        if not backend.supports_streaming:
+            result = await backend.review(prompt)
+            for finding in result.findings:
+                self.emit(finding)
+            result.time_to_first_finding = self.time_to_first_finding
+            return result
+            
+        async for delta in backend.stream(prompt):
+            if delta.tokens_prompt is not None:
+                self.tokens_prompt = delta.tokens_prompt
+            if delta.tokens_completion is not None:
+                self.tokens_completion = delta.tokens_completion
+            if delta.cached_tokens is not None:
+                self.cached_tokens = delta.cached_tokens
+            if delta.cache_write_tokens is not None:
+                self.cache_write_tokens = delta.cache_write_tokens
+            if delta.text:
+                for finding in self._parser.feed(delta.text):
+                    self.emit(finding)
+        if not self._parser.complete:
+            raise BackendError(f"{backend.provider} stream ended before the findings array was closed", retryable=True)
+        if not self._parser.count:
+            # The incremental parser may have latched onto an empty array in
+            # prose; the full reply is small, so parse it as a whole
+            for finding in parse_findings(self._parser.text):
+                self.emit(finding)
+        return self.result(backend)
+        
+    def result(self, backend: BaseBackend, truncated: bool = False) -> ReviewResult:
+        """Result from everything received so far."""
+        return ReviewResult(
+            findings=list(self.findings),
+            tokens_prompt=self.tokens_prompt,
+            tokens_completion=self.tokens_completion,
+            cost_usd=backend.cost(self.tokens_prompt, self.tokens_completion, self.cached_tokens, self.cache_write_tokens),
+            cached_tokens=self.cached_tokens,
+            truncated=truncated,
+            time_to_first_finding=self.time_to_first_finding
+        )
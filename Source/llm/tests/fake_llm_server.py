@@ -0,0 +1,123 @@
+"""
+Local stand-in for an OpenAI-compatible chat completions server.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional
+
+FINDINGS = [{'file': 'a.py', 'line': 3, 'rule_id': 'SEC-001', 'message': 'Hardcoded secret', 'severity': 'error'}]
+
+def completion(findings: Optional[List[Dict[str, Any]]] = None, prompt_tokens: int = 100, completion_tokens: int = 20) -> Dict[str, Any]:
+    """A chat completion response whose content is a findings array."""
+    content = json.dumps(FINDINGS if findings is None else findings)
+    return {
+        'choices': [{'message': {'role': 'assistant', 'content': content}}],
+        'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens}
+    }
+    
+def chunks(text: str, size: int = 16, usage: bool = True) -> List[Dict[str, Any]]:
+    """OpenAI-style stream events carrying text in pieces of size characters."""
+    events = [{'choices': [{'delta': {'content': text[i:i + size]}}]} for i in range(0, len(text), size)]
+    if usage:
+        events.append({'choices': [], 'usage': {'prompt_tokens': 100, 'completion_tokens': 20}})
+    return events
+    
+class Stream:
+    """Scripted server-sent event stream; without ``done`` the connection is cut after the events."""
+    
+    def __init__(self, events: List[Dict[str, Any]], interval: float = 0, done: bool = True):
+        self.events = events
+        self.interval = interval
+        self.done = done
+        
+class FakeLLMServer:
+    """
+    Threaded HTTP server answering POSTs from a script of responses.
+    
+    Each scripted response is (status, body, headers, delay), where body may
+    be a Stream; once the script is exhausted every request gets 200 with
+    ``completion()``.
+    """
+    
+    def __init__(self):
+        self.script = deque()
+        self.requests: List[Dict[str, Any]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                with server.lock:
+                    server.requests.append({
+                        'path': self.path,
+                        'headers': dict(self.headers),
+                        'body': body,
+                        'client': self.client_address
+                    })
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                    status, payload, headers, delay = server.script.popleft() if server.script else (200, completion(), {}, 0)
+                try:
+                    if delay:
+                        time.sleep(delay)
+                    if isinstance(payload, Stream):
+                        self.send_stream(payload)
+                        return
+                    data = json.dumps(payload).encode()
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(data)))
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    with server.lock:
+                        server.in_flight -= 1
+                        
+            def send_stream(self, stream):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                self.close_connection = True
+                for event in stream.events:
+                    self.wfile.write(f"data: {json.dumps(event)}\n\n".encode())
+                    self.wfile.flush()
+                    if stream.interval:
+                        time.sleep(stream.interval)
+                if stream.done:
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    
+            def log_message(self, *args):
+                pass
+                
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+        
+    def respond(self, status: int = 200, body: Optional[Dict[str, Any]] = None,
+                headers: Optional[Dict[str, str]] = None, delay: float = 0) -> None:
+        """Queue the response for the next request."""
+        self.script.append((status, completion() if body is None else body, headers or {}, delay))
+        
+    def __enter__(self) -> 'FakeLLMServer':
+        self.thread.start()
+        return self
+        
+    def __exit__(self, *exc) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
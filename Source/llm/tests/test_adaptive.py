@@ -0,0 +1,127 @@
+import asyncio
+import json
+import pytest
+from ...findings.models import Finding
+from ...prompt.prompt_builder import PromptBuilder
+from ..adaptive import AdaptiveExecutor, SafeSizes
+from ..backend import BaseBackend, ReviewResult, raise_for_status
+from ..dispatch import DispatchEngine
+from ..errors import ContextLengthError
+
+RULES = [{'id': 'SEC-001', 'description': 'No eval'}]
+
+class SizeLimitedBackend(BaseBackend):
+    """Reviews prompts up to max_chars, times out (or overflows) above it."""
+    
+    provider = 'fake'
+    
+    def __init__(self, max_chars, overflow=False):
+        super().__init__('fake-model')
+        self.max_chars = max_chars
+        self.overflow = overflow
+        self.sizes = []
+        
+    async def review(self, prompt):
+        self.sizes.append(len(prompt.user))
+        if len(prompt.user) > self.max_chars:
+            if self.overflow:
+                raise ContextLengthError('maximum context length exceeded', status=400)
+            await asyncio.sleep(10)
+        line = int(prompt.user.split('| line_', 1)[1].split(' ', 1)[0])
+        return ReviewResult(findings=[Finding('a.py', line, 'SEC-001', 'eval', 'error')], tokens_prompt=10)
+        
+def file_context(lines):
+    return {'file': 'a.py', 'language': 'python',
+            'full_content': ''.join(f"line_{i} = {i}\n" for i in range(1, lines + 1))}
+            
+def review(executor, backend, context):
+    return asyncio.run(executor.review(backend, context, RULES))
+    
+def test_timeouts_split_until_pieces_fit():
+    backend = SizeLimitedBackend(max_chars=600)
+    executor = AdaptiveExecutor(DispatchEngine(timeout=0.05), PromptBuilder(), min_lines=10)
+    
+    result = review(executor, backend, file_context(80))
+    
+    assert [f.line for f in result.findings] == [1, 21, 41, 61]
+    assert result.tokens_prompt == 40
+    stats = executor.stats()
+    assert (stats['splits'], stats['unreviewed']) == (3, 0)
+    assert stats['safe_sizes'] == {}
+    assert executor.sizes.limit(backend) is not None
+    
+def test_learned_size_presplits_later_units():
+    backend = SizeLimitedBackend(max_chars=600, overflow=True)
+    executor = AdaptiveExecutor(DispatchEngine(), PromptBuilder(), min_lines=10)
+    review(executor, backend, file_context(80))
+    failures = len([size for size in backend.sizes if size > backend.max_chars])
+    backend.sizes.clear()
+    
+    result = review(executor, backend, file_context(80))
+    
+    assert len(result.findings) == 4
+    assert all(size <= backend.max_chars for size in backend.sizes)
+    assert failures == 3
+    assert executor.stats()['presplits'] > 0
+    
+def test_piece_failing_at_minimum_size_is_reported():
+    backend = SizeLimitedBackend(max_chars=10, overflow=True)
+    executor = AdaptiveExecutor(DispatchEngine(), PromptBuilder(), min_lines=20)
+    
+    result = review(executor, backend, file_context(30))
+    
+    assert [(f.rule_id, f.line, f.severity, f.message) for f in result.findings] == [
+        ('LLM-CONTEXT-LENGTH', 1, 'info', 'LLM context length exceeded')
+    ]
+    assert executor.stats()['unreviewed'] == 1
+    
+def test_safe_sizes_persist(tmp_path):
+    path = str(tmp_path / 'sizes.json')
+    backend = SizeLimitedBackend(max_chars=0)
+    sizes = SafeSizes(path)
+    sizes.record_overflow(backend, 1000)
+    sizes.record_overflow(backend, 2000)
+    
+    assert json.loads(open(path).read()) == {'fake:fake-model': 700}
+    reloaded = SafeSizes(path)
+    assert reloaded.limit(backend) == 700
+    reloaded.record_success(backend, 900)
+    assert SafeSizes(path).limit(backend) == 900
+    
+def test_timeouts_set_only_a_temporary_limit():
+    now = [0.0]
+    backend = SizeLimitedBackend(max_chars=0)
+    sizes = SafeSizes(timeout_repeats=2, timeout_ttl=60, clock=lambda: now[0])
+    
+    sizes.record_timeout(backend, 1000)
+    assert sizes.limit(backend) is None
+    sizes.record_timeout(backend, 2000)
+    assert sizes.limit(backend) == 700
+    assert sizes.to_dict() == {}
+    
+    now[0] = 61
+    assert sizes.limit(backend) is None
+    
+def test_limit_recovers_through_probes():
+    backend = SizeLimitedBackend(max_chars=10 ** 6)
+    sizes = SafeSizes(probe_every=2)
+    sizes.record_overflow(backend, 300)
+    executor = AdaptiveExecutor(DispatchEngine(), PromptBuilder(), sizes, min_lines=10)
+    
+    review(executor, backend, file_context(40))
+    assert backend.sizes and max(backend.sizes) < 600
+    backend.sizes.clear()
+    review(executor, backend, file_context(40))
+    
+    assert len(backend.sizes) == 1
+    assert sizes.limit(backend) > 210
+    assert executor.stats()['probes'] == 1
+    
+@pytest.mark.parametrize('status,body', [
+    (413, 'Request Entity Too Large'),
+    (400, '{"error": {"message": "This model\'s maximum context length is 8192 tokens"}}')
+])
+def test_context_overflow_is_recognised(status, body):
+    with pytest.raises(ContextLengthError) as info:
+        raise_for_status('openai', status, {}, body)
+    assert info.value.retryable is False
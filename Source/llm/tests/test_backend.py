@@ -0,0 +1,66 @@
+import asyncio
+import time
+import pytest
+from ..backend import parse_findings, parse_retry_after, raise_for_status
+from ..errors import BackendError, RateLimitError
+from ..rate_limit import TokenBucket
+
+def test_parse_findings_variants():
+    raw = '[{"file": "a.py", "line": "4", "rule_id": "R1", "message": "m", "severity": "ERROR"}]'
+    
+    assert parse_findings(raw)[0].line == 4
+    assert parse_findings(raw)[0].severity == 'error'
+    assert len(parse_findings(f"Here you go:\n```json\n{raw}\n```")) == 1
+    assert len(parse_findings('{"findings": ' + raw + '}')) == 1
+    assert parse_findings('[]') == []
+    
+def test_parse_findings_skips_malformed_entries():
+    findings = parse_findings('[{"file": "a.py", "line": 1}, {"file": "a.py", "line": 2, "rule_id": "R", "message": "m", "severity": "odd"}]')
+    
+    assert [(f.line, f.severity) for f in findings] == [(2, 'warning')]
+    
+def test_parse_findings_rejects_prose():
+    with pytest.raises(BackendError):
+        parse_findings('No issues found.')
+        
+def test_raise_for_status():
+    raise_for_status('openai', 200, {}, '')
+    with pytest.raises(RateLimitError) as info:
+        raise_for_status('openai', 429, {'retry-after': '7'}, 'slow down')
+    assert info.value.retry_after == 7.0
+    with pytest.raises(BackendError) as info:
+        raise_for_status('openai', 502, {}, 'bad gateway')
+    assert info.value.retryable
+    
+def test_parse_retry_after():
+    assert parse_retry_after('2.5') == 2.5
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    
+def test_token_bucket_waits_for_refill():
+    async def main():
+        bucket = TokenBucket(per_minute=600, capacity=2)
+        start = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        return time.monotonic() - start
+        
+    # Two from the full bucket, then 0.1 s per token at 10/s
+    assert 0.15 <= asyncio.run(main()) < 0.5
+    
+def test_token_bucket_caps_oversized_and_charges_debt():
+    async def main():
+        bucket = TokenBucket(per_minute=6000, capacity=10)
+        await bucket.acquire(50)
+        bucket.consume(10)
+        start = time.monotonic()
+        await bucket.acquire(1)
+        return time.monotonic() - start
+        
+    # 11 tokens short at 100/s
+    assert asyncio.run(main()) >= 0.09
+    
+def test_token_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(0)
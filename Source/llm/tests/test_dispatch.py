@@ -0,0 +1,184 @@
+import asyncio
+import random
+import time
+import pytest
+from ...cache.response_cache import ResponseCache
+from ...findings.models import CostSummary
+from ...prompt.prompt_builder import Prompt
+from ..backend import ReviewResult
+from ..claude import ClaudeBackend
+from ..dispatch import DispatchEngine, ProviderLimits
+from ..errors import BackendError, BackendTimeoutError, RateLimitError
+from ..local import LocalBackend
+from .fake_llm_server import FakeLLMServer
+
+PROMPT = Prompt(prefix_id='rules', prefix='Review against the rules.', user='x = 1', prefix_tokens=10)
+
+@pytest.fixture
+def server():
+    with FakeLLMServer() as fake:
+        yield fake
+        
+def run(engine, server, prompts=(PROMPT,)):
+    async def main():
+        backend = LocalBackend(server.url)
+        try:
+            return await engine.review_all([(backend, prompt) for prompt in prompts])
+        finally:
+            await backend.aclose()
+    return asyncio.run(main())
+    
+def test_local_backend_parses_findings(server):
+    result, = run(DispatchEngine(), server)
+    
+    assert [f.rule_id for f in result.findings] == ['SEC-001']
+    assert (result.tokens_prompt, result.tokens_completion, result.cost_usd) == (100, 20, 0.0)
+    request = server.requests[0]
+    assert request['path'] == '/v1/chat/completions'
+    assert request['body']['cache_prompt'] is True
+    assert request['body']['messages'][0] == {'role': 'system', 'content': PROMPT.prefix}
+    
+def test_retry_after_is_honoured(server):
+    server.respond(429, {'error': 'slow down'}, {'Retry-After': '0.3'})
+    engine = DispatchEngine(backoff_base=0.01)
+    
+    start = time.monotonic()
+    result, = run(engine, server)
+    
+    assert time.monotonic() - start >= 0.3
+    assert len(result.findings) == 1
+    stats = engine.stats()['local']
+    assert (stats['attempts'], stats['retries'], stats['rate_limited']) == (2, 1, 1)
+    
+def test_server_errors_retry_until_max_attempts(server):
+    for _ in range(3):
+        server.respond(503, {'error': 'overloaded'})
+    engine = DispatchEngine(max_attempts=3, backoff_base=0.01)
+    
+    error, = run(engine, server)
+    
+    assert isinstance(error, BackendError) and error.status == 503
+    assert len(server.requests) == 3
+    assert engine.stats()['local']['failures'] == 1
+    
+def test_client_errors_are_not_retried(server):
+    server.respond(400, {'error': 'bad request'})
+    
+    error, = run(DispatchEngine(backoff_base=0.01), server)
+    
+    assert error.status == 400 and not error.retryable
+    assert len(server.requests) == 1
+    
+def test_timeout_cancels_request_and_frees_slot(server):
+    server.respond(delay=1.0)
+    engine = DispatchEngine(limits={'local': ProviderLimits(concurrency=1)}, timeout=0.2, max_attempts=1)
+    
+    start = time.monotonic()
+    error, result = run(engine, server, [PROMPT, PROMPT])
+    
+    assert isinstance(error, BackendTimeoutError)
+    assert len(result.findings) == 1
+    assert time.monotonic() - start < 0.9
+    assert engine.stats()['local']['timeouts'] == 1
+    
+def test_concurrency_is_bounded_per_provider(server):
+    for _ in range(6):
+        server.respond(delay=0.1)
+    engine = DispatchEngine(limits={'local': ProviderLimits(concurrency=2)})
+    
+    results = run(engine, server, [PROMPT] * 6)
+    
+    assert all(len(result.findings) == 1 for result in results)
+    assert server.max_in_flight == 2
+    
+def test_requests_per_minute_limit(server):
+    engine = DispatchEngine(limits={'local': ProviderLimits(concurrency=8, requests_per_minute=300)})
+    engine._provider('local').requests.tokens = 1
+    
+    start = time.monotonic()
+    run(engine, server, [PROMPT] * 3)
+    
+    # One request is in the bucket; the other two wait 0.2 s each at 5/s
+    assert time.monotonic() - start >= 0.35
+    
+def test_backoff_is_jittered_and_capped():
+    engine = DispatchEngine(backoff_base=1.0, backoff_max=4.0, rng=random.Random(7))
+    
+    delays = [engine.backoff(attempt) for attempt in range(1, 6) for _ in range(20)]
+    
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert len(set(delays)) == len(delays)
+    assert all(2.0 <= engine.backoff(1, retry_after=2.0) <= 3.0 for _ in range(20))
+    
+def test_from_config():
+    engine = DispatchEngine.from_config({
+        'timeout_sec': 20,
+        'max_attempts': 5,
+        'limits': {'openai': {'concurrency': 16, 'rpm': 500, 'tpm': 30000}}
+    })
+    
+    assert (engine.timeout, engine.max_attempts) == (20.0, 5)
+    assert engine.limits['openai'] == ProviderLimits(concurrency=16, requests_per_minute=500, tokens_per_minute=30000)
+    
+def test_rate_limit_error_pauses_provider():
+    class Backend:
+        provider = 'fake'
+        calls = []
+        
+        async def review(self, prompt):
+            self.calls.append(time.monotonic())
+            if len(self.calls) == 1:
+                raise RateLimitError('429', retry_after=0.3)
+            return ReviewResult()
+            
+    async def main():
+        engine = DispatchEngine(backoff_base=0.01, rng=random.Random(1))
+        backend = Backend()
+        first = asyncio.create_task(engine.review(backend, PROMPT))
+        await asyncio.sleep(0.05)
+        second = await engine.review(backend, PROMPT)
+        return await first, second, backend.calls
+        
+    first, second, calls = asyncio.run(main())
+    
+    assert first == second == ReviewResult()
+    # The second request waited out the first one's Retry-After
+    assert calls[1] - calls[0] >= 0.25
+    
+def test_response_cache_replays_identical_requests(server, tmp_path):
+    server.respond(503, {'error': 'flaky'})
+    path = str(tmp_path / 'responses.sqlite')
+    other = Prompt(prefix_id='rules', prefix=PROMPT.prefix, user='y = 2', prefix_tokens=10)
+    
+    engine = DispatchEngine(max_attempts=1, cache=ResponseCache(path))
+    first = run(engine, server, [PROMPT]) + run(engine, server, [other])
+    engine = DispatchEngine(max_attempts=1, cache=ResponseCache(path))
+    second = run(engine, server, [PROMPT, other])
+    
+    # The failed request was not cached; the successful one is not sent again
+    assert isinstance(first[0], BackendError) and not first[1].from_cache
+    assert not second[0].from_cache and second[1].from_cache
+    assert second[1].findings == first[1].findings
+    assert len(server.requests) == 3
+    assert engine.stats()['local']['cache_hits'] == 1
+    
+    summary = CostSummary(provider='local', model='local')
+    for result in second:
+        summary.add(result.tokens_prompt, result.tokens_completion, result.cost_usd, result.from_cache)
+    assert (summary.requests, summary.cached_responses) == (2, 1)
+    assert (summary.tokens_prompt, summary.tokens_saved) == (100, 120)
+    
+def test_response_cache_separates_endpoints_and_options(tmp_path):
+    with FakeLLMServer() as first, FakeLLMServer() as second:
+        engine = DispatchEngine(max_attempts=1, cache=ResponseCache(str(tmp_path / 'responses.sqlite')))
+        run(engine, first)
+        run(engine, second)
+        run(engine, first)
+        
+    assert (len(first.requests), len(second.requests)) == (1, 1)
+    assert engine.stats()['local']['cache_hits'] == 1
+    
+    short = ClaudeBackend('claude-3-haiku', api_key='k')
+    long = ClaudeBackend('claude-3-haiku', api_key='k', max_tokens=8192)
+    assert short.request_options(PROMPT) != long.request_options(PROMPT)
+    assert 'messages' not in short.request_options(PROMPT) and 'system' not in short.request_options(PROMPT)
@@ -0,0 +1,151 @@
+import asyncio
+import time
+import pytest
+from ...prompt.prompt_builder import Prompt
+from ..dispatch import DispatchEngine
+from ..errors import BackendError
+from ..factory import BackendFactory
+from ..hedging import Hedger, HedgePolicy
+from ..latency import LatencyTracker
+from ..local import LocalBackend
+from ..openai import OpenAIBackend
+from .fake_llm_server import FakeLLMServer, completion
+
+PROMPT = Prompt(prefix_id='rules', prefix='Review against the rules.', user='x = 1', prefix_tokens=10)
+
+@pytest.fixture
+def servers():
+    with FakeLLMServer() as primary, FakeLLMServer() as secondary:
+        yield primary, secondary
+        
+def run(servers, policy, prompts=(PROMPT,), engine=None):
+    primary, secondary = servers
+    engine = engine or DispatchEngine(max_attempts=1)
+    
+    async def main():
+        backends = [LocalBackend(primary.url), OpenAIBackend('gpt-4o', base_url=secondary.url)]
+        hedger = Hedger(engine, backends, policy)
+        try:
+            return await hedger.review_all(prompts), hedger.stats()
+        finally:
+            for backend in backends:
+                await backend.aclose()
+    return asyncio.run(main())
+    
+def test_slow_primary_is_hedged_and_cancelled(servers):
+    primary, secondary = servers
+    primary.respond(delay=1.5)
+    secondary.respond(body=completion([]))
+    
+    start = time.monotonic()
+    (result,), stats = run(servers, HedgePolicy(default_delay=0.1))
+    
+    assert time.monotonic() - start < 1.0
+    assert result.findings == []
+    assert (stats['hedged'], stats['hedge_wins'], stats['cancelled']) == (1, 1, 1)
+    assert stats['wins'] == {'openai': 1}
+    
+def test_fast_primary_is_not_hedged(servers):
+    (result,), stats = run(servers, HedgePolicy(default_delay=0.5))
+    
+    assert len(result.findings) == 1
+    assert (stats['hedged'], stats['wins']) == (0, {'local': 1})
+    assert len(servers[1].requests) == 0
+    
+def test_hedged_original_can_still_win(servers):
+    primary, secondary = servers
+    primary.respond(delay=0.2)
+    secondary.respond(delay=1.5)
+    
+    (result,), stats = run(servers, HedgePolicy(default_delay=0.05))
+    
+    assert (stats['hedged'], stats['hedge_wins'], stats['wins']) == (1, 0, {'local': 1})
+    
+def test_failed_hedge_does_not_restart_the_hedge_timer(servers):
+    primary, secondary = servers
+    primary.respond(delay=2.0)
+    secondary.respond(400, {'error': 'bad model'}, delay=0.25)
+    
+    with FakeLLMServer() as third:
+        third.respond(body=completion([]))
+        
+        async def main():
+            backends = [LocalBackend(primary.url), OpenAIBackend('gpt-4o', base_url=secondary.url), LocalBackend(third.url)]
+            hedger = Hedger(DispatchEngine(max_attempts=1), backends, HedgePolicy(default_delay=0.3, max_parallel=3))
+            try:
+                start = time.monotonic()
+                result = await hedger.review(PROMPT)
+                return result, time.monotonic() - start, hedger.stats()
+            finally:
+                for backend in backends:
+                    await backend.aclose()
+                    
+        result, elapsed, stats = asyncio.run(main())
+        
+    # Hedged at 0.3s, failed at 0.55s: the next hedge is already due, not at 0.85s
+    assert result.findings == []
+    assert elapsed < 0.75
+    assert stats['hedged'] == 2
+    
+def test_errors_fail_over_in_order(servers):
+    primary, secondary = servers
+    primary.respond(400, {'error': 'bad model'})
+    
+    (result,), stats = run(servers, None)
+    
+    assert len(result.findings) == 1
+    assert (stats['failovers'], stats['wins']) == (1, {'openai': 1})
+    
+def test_all_backends_failing_returns_last_error(servers):
+    primary, secondary = servers
+    primary.respond(400, {'error': 'bad model'})
+    secondary.respond(401, {'error': 'bad key'})
+    
+    (error,), stats = run(servers, HedgePolicy())
+    
+    assert isinstance(error, BackendError) and error.status == 401
+    assert stats['failures'] == 1
+    
+def test_hedge_delay_follows_latency_percentile():
+    engine = DispatchEngine()
+    backend = LocalBackend('http://127.0.0.1:1')
+    hedger = Hedger(engine, [backend], HedgePolicy(percentile=90, min_samples=10, default_delay=3.0))
+    
+    assert hedger.hedge_delay(backend) == 3.0
+    for i in range(1, 11):
+        engine.latency.record('local', i / 10)
+    assert hedger.hedge_delay(backend) == 0.9
+    
+def test_latency_percentiles():
+    tracker = LatencyTracker(window=100)
+    for i in range(1, 201):
+        tracker.record('openai', float(i))
+        
+    assert tracker.summary() == {'openai': {'count': 100, 'p50': 150.0, 'p95': 195.0, 'p99': 199.0}}
+    assert tracker.percentile('google', 50) is None
+    
+def test_engine_reports_latency(servers):
+    engine = DispatchEngine(max_attempts=1)
+    run(servers, None, [PROMPT] * 3, engine=engine)
+    
+    latency = engine.stats()['local']['latency']
+    assert latency['count'] == 3
+    assert 0 < latency['p50'] <= latency['p99'] < 1.0
+    
+def test_from_config():
+    class Env:
+        def get_api_key(self, provider):
+            return 'http://127.0.0.1:8080' if provider == 'LLAMA' else 'key'
+            
+    factory = BackendFactory(env=Env())
+    hedger = Hedger.from_config(DispatchEngine(), factory, {
+        'provider': 'local',
+        'failover': [{'provider': 'anthropic', 'model': 'claude-3-haiku'}, {'provider': 'openai'}],
+        'hedge': {'percentile': 90, 'default_delay_sec': 2, 'min_delay_sec': 0.5}
+    })
+    
+    assert [(b.provider, b.model) for b in hedger.backends] == [
+        ('local', 'local'), ('anthropic', 'claude-3-haiku'), ('openai', 'gpt-4o')
+    ]
+    assert (hedger.policy.percentile, hedger.policy.default_delay, hedger.policy.min_delay) == (90.0, 2.0, 0.5)
+    asyncio.run(factory.aclose())
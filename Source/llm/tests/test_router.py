@@ -0,0 +1,115 @@
+import asyncio
+import pytest
+from ...prompt.prompt_builder import PromptBuilder
+from ..dispatch import DispatchEngine
+from ..factory import BackendFactory
+from ..router import ModelRouter, Route, unit_features
+from .fake_llm_server import FakeLLMServer, completion
+
+STYLE = [{'id': 'STYLE-001', 'severity': 'warning'}]
+SECURITY = [{'id': 'SEC-001', 'severity': 'error'}, {'id': 'STYLE-001', 'severity': 'warning'}]
+
+def diff_context(file_path, hunks=1, lines=2):
+    after = ''.join(f"x{i} = {i}\n" for i in range(lines))
+    return {
+        'file': file_path,
+        'language': None,
+        'changes': {'hunks': [{'start_line': 10 * i + 1, 'before': '', 'after': after} for i in range(hunks)]}
+    }
+    
+@pytest.fixture
+def servers():
+    with FakeLLMServer() as small, FakeLLMServer() as large:
+        yield small, large
+        
+def make_router(servers, routes=None, engine=None):
+    small, large = servers
+    routes = routes or [
+        Route('security', 'local', 'large', large.url, rules=['SEC-*']),
+        Route('small-diffs', 'local', 'small', small.url, max_hunks=2, max_changed_lines=20, max_severity='warning')
+    ]
+    default = Route('default', 'local', 'large', large.url)
+    return ModelRouter(engine or DispatchEngine(max_attempts=1), PromptBuilder(), BackendFactory(), routes, default)
+    
+def run(router, items):
+    async def main():
+        try:
+            return await router.review_all(items)
+        finally:
+            await router.factory.aclose()
+    return asyncio.run(main())
+    
+def test_unit_features():
+    features = unit_features(diff_context('src/app.py', hunks=3, lines=4), SECURITY)
+    
+    assert features.languages == ('python',)
+    assert (features.hunks, features.changed_lines) == (3, 12)
+    assert features.severity == 'error'
+    
+    whole_file = unit_features({'file': 'a.go', 'language': 'go', 'full_content': 'a\nb\nc\n'}, [{'id': 'X'}])
+    assert (whole_file.hunks, whole_file.changed_lines, whole_file.severity) == (0, 3, 'warning')
+    
+def test_units_follow_first_matching_route(servers):
+    small, large = servers
+    router = make_router(servers)
+    
+    results = run(router, [
+        (diff_context('a.py'), STYLE),
+        (diff_context('b.py'), SECURITY),
+        (diff_context('c.py', hunks=5), STYLE)
+    ])
+    
+    assert all(not isinstance(result, Exception) for result in results)
+    assert len(small.requests) == 1 and len(large.requests) == 2
+    assert 'a.py' in small.requests[0]['body']['messages'][1]['content']
+    stats = router.stats()
+    assert {name: s['units'] for name, s in stats.items()} == {'small-diffs': 1, 'security': 1, 'default': 1}
+    assert stats['security']['cost']['tokens_prompt'] == 100
+    assert stats['small-diffs']['latency']['count'] == 1
+    
+def test_languages_condition(servers):
+    router = make_router(servers, routes=[Route('go', 'local', 'small', servers[0].url, languages=['go'])])
+    
+    assert router.route(diff_context('main.go'), STYLE).name == 'go'
+    assert router.route(diff_context('main.py'), STYLE).name == 'default'
+    
+def test_failed_route_falls_back_to_default(servers):
+    small, large = servers
+    small.respond(500, {'error': 'overloaded'})
+    router = make_router(servers)
+    
+    result, = run(router, [(diff_context('a.py'), STYLE)])
+    
+    assert [f.rule_id for f in result.findings] == ['SEC-001']
+    stats = router.stats()
+    assert (stats['small-diffs']['fallbacks'], stats['small-diffs']['failures']) == (1, 1)
+    assert stats['default']['units'] == 1
+    
+def test_route_from_config():
+    route = Route.from_config({
+        'name': 'small-diffs',
+        'provider': 'openai',
+        'model': 'gpt-4o-mini',
+        'when': {'max_hunks': 2, 'max_changed_lines': 40, 'max_severity': 'warning'}
+    })
+    
+    assert (route.model, route.max_hunks, route.max_severity) == ('gpt-4o-mini', 2, 'warning')
+    with pytest.raises(ValueError):
+        Route.from_config({'provider': 'openai', 'when': {'max_files': 1}})
+    with pytest.raises(ValueError):
+        Route.from_config({'provider': 'openai', 'when': {'min_severity': 'critical'}})
+    with pytest.raises(ValueError):
+        Route.from_config({'provider': 'mystery'})
+        
+def test_route_from_config_validates_entries():
+    route = Route.from_config({'name': 'py', 'provider': 'openai', 'when': {'languages': 'python', 'rules': 'SEC-*'}})
+    
+    assert (route.languages, route.rules) == (['python'], ['SEC-*'])
+    with pytest.raises(ValueError, match="Unknown keys in route py: languages"):
+        Route.from_config({'name': 'py', 'provider': 'openai', 'languages': ['python']})
+    with pytest.raises(ValueError, match="Route py: 'when'"):
+        Route.from_config({'name': 'py', 'provider': 'openai', 'when': [['languages', 'python']]})
+    with pytest.raises(ValueError, match="Route py: max_hunks"):
+        Route.from_config({'name': 'py', 'provider': 'openai', 'when': {'max_hunks': 'two'}})
+    with pytest.raises(ValueError, match="Route py: rules"):
+        Route.from_config({'name': 'py', 'provider': 'openai', 'when': {'rules': [1]}})
@@ -0,0 +1,165 @@
+import asyncio
+import json
+import time
+import pytest
+from ...prompt.prompt_builder import Prompt
+from ..backend import BaseBackend, ReviewResult
+from ..claude import ClaudeBackend
+from ..dispatch import DispatchEngine
+from ..errors import BackendError
+from ..gemini import GeminiBackend
+from ..local import LocalBackend
+from ..streaming import FindingStreamParser
+from .fake_llm_server import FakeLLMServer, Stream, chunks
+
+PROMPT = Prompt(prefix_id='rules', prefix='Review against the rules.', user='x = 1', prefix_tokens=10)
+FINDINGS = [
+    {'file': 'a.py', 'line': i, 'rule_id': 'R1', 'message': f'issue {i} with "quotes" and {{braces}}', 'severity': 'info'}
+    for i in range(1, 4)
+]
+TEXT = json.dumps(FINDINGS)
+
+@pytest.fixture
+def server():
+    with FakeLLMServer() as fake:
+        yield fake
+        
+def stream_review(server, engine=None, backend_class=LocalBackend, **kwargs):
+    engine = engine or DispatchEngine(max_attempts=1)
+    received = []
+    
+    async def main():
+        backend = backend_class(base_url=server.url, **kwargs)
+        try:
+            return await engine.review_stream(backend, PROMPT, lambda finding: received.append((time.monotonic(), finding)))
+        finally:
+            await backend.aclose()
+    return asyncio.run(main()), received, engine
+    
+def test_parser_emits_each_object_when_it_closes():
+    parser = FindingStreamParser()
+    text = f"Here are the findings:\n```json\n{{\"findings\": {TEXT}}}\n```"
+    
+    emitted = [(i, finding.line) for i in range(len(text)) for finding in parser.feed(text[i])]
+    
+    assert [line for _, line in emitted] == [1, 2, 3]
+    assert emitted[0][0] == text.index('}, {')
+    assert parser.complete and parser.count == 3
+    
+def test_parser_drops_unfinished_object():
+    parser = FindingStreamParser()
+    
+    findings = parser.feed(TEXT[:TEXT.index('issue 2')])
+    
+    assert [f.line for f in findings] == [1]
+    assert not parser.complete
+    
+def test_parser_skips_brackets_in_prose_and_fence_line():
+    parser = FindingStreamParser()
+    text = f"Findings per [rules]:\n```json [x]\n{TEXT}\n```"
+    
+    findings = [finding for char in text for finding in parser.feed(char)]
+    
+    assert [f.line for f in findings] == [1, 2, 3]
+    assert parser.complete
+    
+def test_empty_streamed_array_falls_back_to_whole_reply(server):
+    text = f"No issues in [] so far, but:\n```json\n{TEXT}\n```"
+    server.respond(body=Stream(chunks(text)))
+    
+    result, received, _ = stream_review(server)
+    
+    assert [f.line for f in result.findings] == [1, 2, 3]
+    assert [f for _, f in received] == result.findings
+    
+def test_streamed_findings_arrive_before_the_reply_ends(server):
+    server.respond(body=Stream(chunks(TEXT), interval=0.02))
+    
+    result, received, engine = stream_review(server)
+    
+    assert [f.line for f in result.findings] == [1, 2, 3]
+    assert [f for _, f in received] == result.findings
+    assert received[-1][0] - received[0][0] > 0.1
+    assert (result.tokens_prompt, result.tokens_completion, result.truncated) == (100, 20, False)
+    assert 0 < result.time_to_first_finding < 1.0
+    assert engine.stats()['local']['time_to_first_finding']['count'] == 1
+    assert server.requests[0]['body']['stream'] is True
+    
+def test_cut_off_stream_keeps_partial_findings(server):
+    server.respond(body=Stream(chunks(TEXT[:TEXT.index('issue 3')], usage=False), done=False))
+    
+    result, received, engine = stream_review(server, DispatchEngine(max_attempts=3))
+    
+    assert [f.line for f in result.findings] == [1, 2]
+    assert result.truncated
+    assert len(server.requests) == 1
+    assert engine.stats()['local']['truncated'] == 1
+    
+def test_timeout_keeps_partial_findings(server):
+    server.respond(body=Stream(chunks(TEXT, size=130, usage=False), interval=0.3))
+    
+    start = time.monotonic()
+    result, received, _ = stream_review(server, DispatchEngine(timeout=0.5, max_attempts=1))
+    
+    assert time.monotonic() - start < 1.0
+    assert result.truncated and 1 <= len(result.findings) < 3
+    
+def test_stream_failing_before_first_finding_is_retried(server):
+    server.respond(503, {'error': 'overloaded'})
+    server.respond(body=Stream(chunks(TEXT[:5], usage=False), done=False))
+    server.respond(body=Stream(chunks(TEXT)))
+    
+    result, received, engine = stream_review(server, DispatchEngine(max_attempts=3, backoff_base=0.01))
+    
+    assert len(result.findings) == 3 and not result.truncated
+    assert [f.line for _, f in received] == [1, 2, 3]
+    assert engine.stats()['local']['retries'] == 2
+    
+def test_claude_stream_events(server):
+    events = [
+        {'type': 'message_start', 'message': {'usage': {'input_tokens': 40, 'cache_read_input_tokens': 900, 'output_tokens': 1}}},
+        {'type': 'content_block_start', 'index': 0, 'content_block': {'type': 'text', 'text': ''}},
+        *({'type': 'content_block_delta', 'index': 0, 'delta': {'type': 'text_delta', 'text': TEXT[i:i + 30]}}
+          for i in range(0, len(TEXT), 30)),
+        {'type': 'message_delta', 'delta': {'stop_reason': 'end_turn'}, 'usage': {'output_tokens': 75}},
+        {'type': 'message_stop'}
+    ]
+    server.respond(body=Stream(events, done=False))
+    
+    result, _, _ = stream_review(server, backend_class=ClaudeBackend, model='claude-3-haiku')
+    
+    assert len(result.findings) == 3
+    assert (result.tokens_prompt, result.tokens_completion, result.cached_tokens) == (940, 75, 900)
+    assert result.cost_usd == pytest.approx((40 * 0.25 + 900 * 0.025 + 75 * 1.25) / 1_000_000)
+    
+def test_claude_stream_error_event(server):
+    server.respond(body=Stream([{'type': 'error', 'error': {'type': 'invalid_request_error', 'message': 'nope'}}], done=False))
+    
+    with pytest.raises(BackendError, match='nope'):
+        stream_review(server, backend_class=ClaudeBackend, model='claude-3-haiku')
+        
+def test_gemini_stream_endpoint(server):
+    events = [
+        {'candidates': [{'content': {'parts': [{'text': TEXT[:50]}]}}]},
+        {'candidates': [{'content': {'parts': [{'text': TEXT[50:]}]}}],
+         'usageMetadata': {'promptTokenCount': 300, 'candidatesTokenCount': 60}}
+    ]
+    server.respond(body=Stream(events, done=False))
+    
+    result, _, _ = stream_review(server, backend_class=GeminiBackend, model='gemini-1.5-pro-latest')
+    
+    assert server.requests[0]['path'] == '/v1beta/models/gemini-1.5-pro-latest:streamGenerateContent?alt=sse'
+    assert 'stream' not in server.requests[0]['body']
+    assert (len(result.findings), result.tokens_prompt) == (3, 300)
+    
+def test_non_streaming_backend_emits_at_end():
+    class Backend(BaseBackend):
+        provider = 'fake'
+        
+        async def review(self, prompt):
+            return ReviewResult(findings=[FindingStreamParser().feed(TEXT)[0]])
+            
+    received = []
+    result = asyncio.run(DispatchEngine().review_stream(Backend('m'), PROMPT, received.append))
+    
+    assert received == result.findings and len(received) == 1
@@ -0,0 +1,145 @@
+import asyncio
+import pytest
+from ...prompt.prompt_builder import Prompt
+from ..claude import ClaudeBackend
+from ..factory import BackendFactory
+from ..gemini import GeminiBackend
+from ..local import LocalBackend
+from ..openai import OpenAIBackend
+from ..transport import TransportPool, TransportConfig
+from .fake_llm_server import FakeLLMServer
+
+PROMPT = Prompt(prefix_id='rules', prefix='Review against the rules.', user='x = 1', prefix_tokens=10)
+FINDINGS_TEXT = '[{"file": "a.py", "line": 1, "rule_id": "R1", "message": "m", "severity": "info"}]'
+
+@pytest.fixture
+def server():
+    with FakeLLMServer() as fake:
+        yield fake
+        
+def test_sequential_requests_reuse_one_connection(server):
+    async def main():
+        async with TransportPool(TransportConfig(http2=False)) as pool:
+            backend = LocalBackend(server.url, client=pool.client(server.url))
+            for _ in range(10):
+                await backend.review(PROMPT)
+            return pool.stats()[server.url]
+            
+    stats = asyncio.run(main())
+    
+    assert stats['requests'] == 10
+    assert stats['connections'] == 1
+    assert stats['reuse_rate'] == 0.9
+    assert stats['http_versions'] == {'HTTP/1.1': 10}
+    assert len({request['client'] for request in server.requests}) == 1
+    
+def test_pool_limits_bound_connections(server):
+    for _ in range(8):
+        server.respond(delay=0.05)
+        
+    async def main():
+        async with TransportPool(TransportConfig(max_connections=2, http2=False)) as pool:
+            backend = LocalBackend(server.url, client=pool.client(server.url))
+            await asyncio.gather(*(backend.review(PROMPT) for _ in range(8)))
+            return pool.stats()[server.url]
+            
+    stats = asyncio.run(main())
+    
+    assert stats['requests'] == 8
+    assert stats['connections'] <= 2
+    assert server.max_in_flight <= 2
+    
+def test_one_client_per_endpoint():
+    async def main():
+        async with TransportPool(TransportConfig(http2=False)) as pool:
+            first = pool.client('https://API.example.com/v1/chat')
+            assert pool.client('https://api.example.com/v1/messages') is first
+            assert pool.client('https://api.example.com:8443') is not first
+            
+    asyncio.run(main())
+    with pytest.raises(ValueError):
+        TransportPool(TransportConfig(http2=False)).client('localhost:8080')
+        
+def test_transport_config_from_config():
+    config = TransportConfig.from_config({'max_connections': 50, 'read_timeout': 20})
+    
+    assert (config.max_connections, config.read_timeout) == (50, 20)
+    with pytest.raises(ValueError):
+        TransportConfig.from_config({'max_conections': 50})
+        
+def review(server, backend_class, body, **kwargs):
+    server.respond(body=body)
+    
+    async def main():
+        backend = backend_class(base_url=server.url, **kwargs)
+        try:
+            return await backend.review(PROMPT)
+        finally:
+            await backend.aclose()
+    return asyncio.run(main()), server.requests[-1]
+    
+def test_openai_backend(server):
+    body = {
+        'choices': [{'message': {'content': FINDINGS_TEXT}}],
+        'usage': {'prompt_tokens': 1000, 'completion_tokens': 100, 'prompt_tokens_details': {'cached_tokens': 800}}
+    }
+    result, request = review(server, OpenAIBackend, body, model='gpt-4o', api_key='sk-test')
+    
+    assert request['path'] == '/v1/chat/completions'
+    assert request['headers']['Authorization'] == 'Bearer sk-test'
+    assert (result.tokens_prompt, result.cached_tokens) == (1000, 800)
+    assert result.cost_usd == pytest.approx(0.0035)
+    
+def test_claude_backend(server):
+    body = {
+        'content': [{'type': 'text', 'text': FINDINGS_TEXT}],
+        'usage': {'input_tokens': 50, 'cache_read_input_tokens': 900, 'cache_creation_input_tokens': 200, 'output_tokens': 40}
+    }
+    result, request = review(server, ClaudeBackend, body, model='claude-3-haiku', api_key='ak-test')
+    
+    assert request['path'] == '/v1/messages'
+    assert request['headers']['x-api-key'] == 'ak-test'
+    assert request['body']['system'][0]['cache_control'] == {'type': 'ephemeral'}
+    assert request['body']['messages'] == [{'role': 'user', 'content': PROMPT.user}]
+    assert (result.tokens_prompt, result.tokens_completion, result.cached_tokens) == (1150, 40, 900)
+    # Reads at 0.1x and writes at 1.25x the $0.25/M input price, output at $1.25/M
+    assert result.cost_usd == pytest.approx((50 * 0.25 + 900 * 0.025 + 200 * 0.3125 + 40 * 1.25) / 1_000_000)
+    assert result.findings[0].rule_id == 'R1'
+    
+def test_gemini_backend(server):
+    body = {
+        'candidates': [{'content': {'parts': [{'text': FINDINGS_TEXT}]}}],
+        'usageMetadata': {'promptTokenCount': 300, 'candidatesTokenCount': 30}
+    }
+    result, request = review(server, GeminiBackend, body, model='gemini-1.5-pro-latest', api_key='gk-test')
+    
+    assert request['path'] == '/v1beta/models/gemini-1.5-pro-latest:generateContent'
+    assert request['headers']['x-goog-api-key'] == 'gk-test'
+    assert request['body']['systemInstruction'] == {'parts': [{'text': PROMPT.prefix}]}
+    assert (result.tokens_prompt, result.tokens_completion, result.cached_tokens) == (300, 30, None)
+    
+class Env:
+    def get_api_key(self, provider):
+        return {'OPENAI': 'sk-test', 'ANTHROPIC': 'ak-test', 'LLAMA': 'http://127.0.0.1:8080'}.get(provider) or \
+            pytest.fail(f"unexpected key lookup: {provider}")
+            
+def test_factory_shares_pool_clients():
+    async def main():
+        factory = BackendFactory(env=Env(), pool=TransportPool(TransportConfig(http2=False)))
+        try:
+            openai = factory.create('openai')
+            proxied = factory.create('openai', model='gpt-4o-mini', base_url='https://api.openai.com/proxy')
+            claude = factory.create('anthropic')
+            local = factory.create('local')
+            
+            assert (openai.model, openai.api_key) == ('gpt-4o', 'sk-test')
+            assert proxied._client is openai._client
+            assert claude._client is not openai._client
+            assert local.base_url == 'http://127.0.0.1:8080'
+            assert len(factory.pool.stats()) == 3
+            with pytest.raises(ValueError):
+                factory.create('mistral')
+        finally:
+            await factory.aclose()
+            
+    asyncio.run(main())
@@ -0,0 +1,158 @@
+"""
+Pooled keep-alive HTTP clients shared by the LLM back-ends.
+"""
+
+import importlib.util
+import threading
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+import httpx
+
+# HTTP/2 needs the optional 'h2' package (pip install httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+@dataclass
+class TransportConfig:
+    """Pool limits and timeouts for each endpoint's client."""
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 60.0  # seconds an idle connection is kept open
+    connect_timeout: float = 5.0
+    read_timeout: float = 60.0
+    write_timeout: float = 10.0
+    pool_timeout: float = 30.0      # seconds to wait for a free connection
+    http2: Optional[bool] = None    # None: use HTTP/2 if 'h2' is installed
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'TransportConfig':
+        """Build a config from the llm.http section of codereview.yaml."""
+        unknown = set(config) - set(cls.__dataclass_fields__)
+        if unknown:
+            raise ValueError(f"Unknown llm.http options: {', '.join(sorted(unknown))}")
+        return cls(**config)
+        
+class ConnectionStats:
+    """Requests served per connection of one endpoint's pool."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.per_connection: Dict[str, int] = {}
+        self.http_versions: Dict[str, int] = {}
+        
+    def record(self, connection: Optional[str], http_version: str) -> None:
+        """Count a response served over a connection (its local address)."""
+        with self._lock:
+            self.requests += 1
+            if connection is not None:
+                self.per_connection[connection] = self.per_connection.get(connection, 0) + 1
+            self.http_versions[http_version] = self.http_versions.get(http_version, 0) + 1
+            
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary for the report."""
+        with self._lock:
+            connections = len(self.per_connection)
+            reused = self.requests - connections
+            return {
+                'requests': self.requests,
+                'connections': connections,
+                'reused_requests': reused,
+                'reuse_rate': reused / self.requests if self.requests else 0.0,
+                'max_requests_per_connection': max(self.per_connection.values(), default=0),
+                'http_versions': dict(self.http_versions)
+            }
+            
+class _CountingTransport(httpx.AsyncHTTPTransport):
+    """Transport that records which pooled connection served each response."""
+    
+    def __init__(self, stats: ConnectionStats, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = stats
+        
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await super().handle_async_request(request)
+        stream = response.extensions.get('network_stream')
+        address = stream.get_extra_info('client_addr') if stream is not None else None
+        connection = f"{address[0]}:{address[1]}" if address else None
+        self.stats.record(connection, response.extensions.get('http_version', b'').decode() or 'unknown')
+        return response
+        
+class TransportPool:
+    """
+    One pooled ``httpx.AsyncClient`` per endpoint, shared by all back-ends.
+    
+    Connections are kept alive between requests, so TCP and TLS setup is
+    paid once per connection rather than once per call. HTTP/2 is offered
+    when 'h2' is installed and used if the server negotiates it, letting many
+    requests share a single connection.
+    """
+    
+    def __init__(self, config: Optional[TransportConfig] = None):
+        """
+        Initialize the pool.
+        
+        Args:
+            config: Limits and timeouts applied to every endpoint's client
+        """
+        self.config = config or TransportConfig()
+        self.http2 = self.config.http2 is not False and HTTP2_AVAILABLE
+        if self.config.http2 and not HTTP2_AVAILABLE:
+            print("Warning: HTTP/2 requested but 'h2' is not installed; using HTTP/1.1")
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._stats: Dict[str, ConnectionStats] = {}
+        
+    @staticmethod
+    def origin(url: str) -> str:
+        """Endpoint key of a URL: scheme://host[:port]."""
+        parts = urlsplit(url)
+        if not parts.scheme or not parts.netloc:
+            raise ValueError(f"Invalid endpoint URL: {url}")
+        return f"{parts.scheme}://{parts.netloc}".lower()
+        
+    def client(self, url: str) -> httpx.AsyncClient:
+        """
+        Get the shared client for the endpoint of url, creating it on first use.
+        
+        The client belongs to the pool; close it with ``aclose()``.
+        """
+        origin = self.origin(url)
+        if origin not in self._clients:
+            config = self.config
+            stats = ConnectionStats()
+            transport = _CountingTransport(
+                stats,
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=config.max_connections,
+                    max_keepalive_connections=config.max_keepalive_connections,
+                    keepalive_expiry=config.keepalive_expiry
+                )
+            )
+            self._stats[origin] = stats
+            self._clients[origin] = httpx.AsyncClient(
+                transport=transport,
+                timeout=httpx.Timeout(
+                    connect=config.connect_timeout,
+                    read=config.read_timeout,
+                    write=config.write_timeout,
+                    pool=config.pool_timeout
+                )
+            )
+        return self._clients[origin]
+        
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return connection reuse statistics per endpoint."""
+        return {origin: stats.to_dict() for origin, stats in self._stats.items()}
+        
+    async def aclose(self) -> None:
+        """Close every client and its pooled connections."""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+        
+    async def __aenter__(self) -> 'TransportPool':
+        return self
+        
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
@@ -0,0 +1,14 @@
+"""
+Prompt package for code review.
+Renders contexts and rules into LLM prompts with a cache-friendly layout.
+"""
+
+from .prompt_builder import Prompt, PromptBuilder, PrefixCacheStats, render_context, PROMPT_VERSION
+
+__all__ = [
+    'Prompt',
+    'PromptBuilder',
+    'PrefixCacheStats',
+    'render_context',
+    'PROMPT_VERSION',
+]
@@ -0,0 +1,212 @@
+"""
+Prompt construction with a byte-stable rules prefix per rule set.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Any, List, Tuple, Callable, Iterable, Optional
+from ..cache.review_cache import canonical_json, ruleset_digest
+from ..context.windowing import estimate_tokens
+
+# Bump whenever the rendered prompt changes, so cached reviews are invalidated
+PROMPT_VERSION = '1'
+
+SYSTEM_PROMPT = (
+    "You are an expert code reviewer.\n"
+    "Review the code in the user message against the rules below. "
+    "List any violations as a JSON array of objects with keys: "
+    "file, line, rule_id, message, severity. Reply with [] if there are none."
+)
+
+@dataclass(frozen=True)
+class Prompt:
+    """
+    A rendered prompt split into a cacheable prefix and a per-request suffix.
+    
+    ``prefix`` is identical, byte for byte, for every request reviewed against
+    the same rule set, so provider-side prompt caches and llama.cpp's KV cache
+    can reuse it.
+    """
+    prefix_id: str
+    prefix: str
+    user: str
+    prefix_tokens: int = 0
+    
+    def messages(self) -> List[Dict[str, str]]:
+        """Chat messages with the stable prefix first."""
+        return [
+            {'role': 'system', 'content': self.prefix},
+            {'role': 'user', 'content': self.user}
+        ]
+        
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert prompt to dictionary format."""
+        return {'prefix_id': self.prefix_id, 'messages': self.messages()}
+        
+class PromptBuilder:
+    """Renders contexts into prompts whose rules prefix is canonical and reused."""
+    
+    def __init__(self, system_prompt: str = SYSTEM_PROMPT, estimator: Callable[[str], int] = estimate_tokens):
+        """
+        Initialize the builder.
+        
+        Args:
+            system_prompt: Instructions placed before the rules
+            estimator: Token counter used to size prefixes for the stats
+        """
+        self.system_prompt = system_prompt
+        self.estimator = estimator
+        self._prefixes: Dict[str, Tuple[str, int]] = {}
+        
+    def prefix(self, rules: List[Dict[str, Any]]) -> Tuple[str, str]:
+        """
+        Render the prefix for a rule set.
+        
+        Rules are ordered by id and serialized with sorted keys, so the same
+        set of rules always gives the same bytes whatever order it was
+        resolved in. Prefixes are rendered once per rule set.
+        
+        Returns:
+            (prefix_id, prefix text)
+        """
+        prefix_id = ruleset_digest(rules)
+        if prefix_id not in self._prefixes:
+            ordered = sorted(rules, key=lambda rule: str(rule.get('id', '')))
+            lines = [self.system_prompt, '', '<RULES>']
+            lines.extend(canonical_json(rule) for rule in ordered)
+            lines.append('</RULES>')
+            text = '\n'.join(lines)
+            self._prefixes[prefix_id] = (text, self.estimator(text))
+        return prefix_id, self._prefixes[prefix_id][0]
+        
+    def build(self, context: Dict[str, Any], rules: List[Dict[str, Any]]) -> Prompt:
+        """
+        Build the prompt for a context reviewed against rules.
+        
+        Args:
+            context: Context from one of the context builders
+            rules: Rule definitions resolved for the context's path
+            
+        Returns:
+            Prompt with the shared prefix and the rendered code
+        """
+        prefix_id, prefix = self.prefix(rules)
+        return Prompt(
+            prefix_id=prefix_id,
+            prefix=prefix,
+            user=render_context(context),
+            prefix_tokens=self._prefixes[prefix_id][1]
+        )
+        
+    def build_grouped(self, items: Iterable[Tuple[Dict[str, Any], List[Dict[str, Any]]]]) -> List[Prompt]:
+        """
+        Build prompts for (context, rules) pairs, grouped by rule set.
+        
+        Prompts sharing a prefix are returned consecutively, so they are
+        dispatched while the provider still has the prefix cached. Groups keep
+        the order of their first item and items keep their order within a group.
+        """
+        groups: Dict[str, List[Prompt]] = {}
+        for context, rules in items:
+            prompt = self.build(context, rules)
+            groups.setdefault(prompt.prefix_id, []).append(prompt)
+        return [prompt for group in groups.values() for prompt in group]
+        
+def _numbered(content: str, first_line: int = 1) -> str:
+    """Prefix each line with its 1-based line number."""
+    return '\n'.join(f"{number:>5} | {line}" for number, line in enumerate(content.splitlines(), first_line))
+    
+def _render_file(file_path: str, language: str, body: str) -> str:
+    return f'<FILE path="{file_path}" language="{language}">\n<CODE_SNIPPET>\n{body}\n</CODE_SNIPPET>\n</FILE>'
+    
+def render_context(context: Dict[str, Any]) -> str:
+    """
+    Render a context as the user message of a prompt.
+    
+    Code is shown with line numbers so findings can refer to them; windows
+    and diff hunks keep their position in the file.
+    """
+    if context.get('review_type') == 'directory':
+        return '\n'.join(
+            _render_file(f['file'], f['language'], _numbered(f['content'], f.get('start_line', 1)))
+            for f in context['files']
+        )
+        
+    sections = []
+    if context.get('summary'):
+        sections.append(context['summary'].rstrip('\n'))
+    changes = context.get('changes')
+    if changes:
+        for hunk in changes['hunks']:
+            header = f"@@ line {hunk['start_line']} @@"
+            before = ''.join(f"-{line}\n" for line in (hunk.get('before') or '').splitlines())
+            after = ''.join(f"+{line}\n" for line in (hunk.get('after') or '').splitlines())
+            sections.append(f"{header}\n{before}{after}".rstrip('\n'))
+    if 'windows' in context:
+        for window in context['windows']:
+            header = f"Lines {window['start_line']}-{window['end_line']}"
+            if window.get('scope'):
+                header += f" (in line {window['scope_line']}: {window['scope'].strip()})"
+            sections.append(f"{header}\n{_numbered(window['content'], window['start_line'])}")
+    elif context.get('full_content') is not None:
+        sections.append(_numbered(context['full_content']))
+    return _render_file(context['file'], context.get('language', 'text'), '\n\n'.join(sections))
+    
+class PrefixCacheStats:
+    """
+    Tracks how often dispatched prompts reuse an already-sent prefix.
+    
+    A request is counted as a hit when its prefix was sent before within the
+    provider's cache lifetime. Providers that report cached input tokens can
+    pass them to ``record``; their total is reported next to the estimate.
+    """
+    
+    def __init__(self, ttl: float = 300.0):
+        """
+        Args:
+            ttl: Seconds a provider keeps a prefix cached after its last use
+        """
+        self.ttl = ttl
+        self._last_sent: Dict[str, float] = {}
+        self.requests = 0
+        self.hits = 0
+        self.prefix_tokens = 0
+        self.reused_tokens = 0
+        self.reported_cached_tokens: Optional[int] = None
+        
+    def record(self, prompt: Prompt, sent_at: float, cached_tokens: Optional[int] = None) -> bool:
+        """
+        Record a dispatched prompt.
+        
+        Args:
+            prompt: Prompt that was sent
+            sent_at: Monotonic send time in seconds
+            cached_tokens: Cached input tokens reported by the provider, if any
+            
+        Returns:
+            True if the prefix was expected to be cached
+        """
+        last = self._last_sent.get(prompt.prefix_id)
+        hit = last is not None and sent_at - last <= self.ttl
+        self._last_sent[prompt.prefix_id] = sent_at
+        self.requests += 1
+        self.prefix_tokens += prompt.prefix_tokens
+        if hit:
+            self.hits += 1
+            self.reused_tokens += prompt.prefix_tokens
+        if cached_tokens is not None:
+            self.reported_cached_tokens = (self.reported_cached_tokens or 0) + cached_tokens
+        return hit
+        
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary for the report."""
+        result = {
+            'requests': self.requests,
+            'prefixes': len(self._last_sent),
+            'hits': self.hits,
+            'hit_rate': self.hits / self.requests if self.requests else 0.0,
+            'prefix_tokens': self.prefix_tokens,
+            'reused_prefix_tokens': self.reused_tokens
+        }
+        if self.reported_cached_tokens is not None:
+            result['reported_cached_tokens'] = self.reported_cached_tokens
+        return result
@@ -0,0 +1,81 @@
+from ..prompt_builder import PromptBuilder, PrefixCacheStats, render_context
+
+SEC = {'id': 'SEC-001', 'name': 'No Hardcoded Secrets', 'severity': 'error'}
+STYLE = {'severity': 'warning', 'name': 'Line length', 'id': 'STYLE-001'}
+
+def file_context(path, content='x = 1\n'):
+    return {'file': path, 'language': 'python', 'review_type': 'file', 'full_content': content}
+    
+def test_prefix_is_byte_identical_regardless_of_rule_order():
+    builder = PromptBuilder()
+    first = builder.build(file_context('a.py'), [SEC, STYLE])
+    second = builder.build(file_context('b.py'), [dict(reversed(list(STYLE.items()))), SEC])
+    
+    assert first.prefix_id == second.prefix_id
+    assert first.prefix == second.prefix
+    assert first.prefix.index('SEC-001') < first.prefix.index('STYLE-001')
+    assert first.user != second.user
+    
+def test_messages_put_prefix_first():
+    prompt = PromptBuilder().build(file_context('a.py'), [SEC])
+    messages = prompt.messages()
+    
+    assert messages[0] == {'role': 'system', 'content': prompt.prefix}
+    assert messages[1]['role'] == 'user'
+    assert '<RULES>' in prompt.prefix and '<RULES>' not in prompt.user
+    
+def test_build_grouped_keeps_rule_sets_together():
+    builder = PromptBuilder()
+    items = [
+        (file_context('a.py'), [SEC]),
+        (file_context('b.py'), [STYLE]),
+        (file_context('c.py'), [SEC]),
+        (file_context('d.py'), [STYLE, SEC]),
+        (file_context('e.py'), [STYLE])
+    ]
+    prompts = builder.build_grouped(items)
+    
+    files = [p.user.split('"')[1] for p in prompts]
+    assert files == ['a.py', 'c.py', 'b.py', 'e.py', 'd.py']
+    
+def test_render_numbers_lines_and_windows():
+    assert '    1 | x = 1' in render_context(file_context('a.py'))
+    
+    rendered = render_context({
+        'file': 'a.py',
+        'language': 'python',
+        'changes': {'type': 'diff', 'hunks': [{'start_line': 12, 'before': 'old()\n', 'after': 'new()\n'}]},
+        'windows': [{'start_line': 10, 'end_line': 11, 'content': '    a\n    b\n', 'scope': 'def f():', 'scope_line': 3}]
+    })
+    assert '@@ line 12 @@\n-old()\n+new()' in rendered
+    assert 'Lines 10-11 (in line 3: def f():)' in rendered
+    assert '   11 |     b' in rendered
+    
+def test_render_directory_context():
+    rendered = render_context({
+        'review_type': 'directory',
+        'files': [
+            {'file': 'a.py', 'language': 'python', 'content': 'a = 1\n'},
+            {'file': 'b.py', 'language': 'python', 'content': 'b = 2\n', 'start_line': 40}
+        ]
+    })
+    assert rendered.count('<FILE ') == 2
+    assert '   40 | b = 2' in rendered
+    
+def test_prefix_cache_stats():
+    builder = PromptBuilder()
+    stats = PrefixCacheStats(ttl=60)
+    sec_a = builder.build(file_context('a.py'), [SEC])
+    sec_b = builder.build(file_context('b.py'), [SEC])
+    style = builder.build(file_context('c.py'), [STYLE])
+    
+    assert stats.record(sec_a, sent_at=0) is False
+    assert stats.record(sec_b, sent_at=10) is True
+    assert stats.record(style, sent_at=20) is False
+    assert stats.record(sec_a, sent_at=200) is False  # expired
+    
+    summary = stats.to_dict()
+    assert summary['requests'] == 4
+    assert summary['hits'] == 1
+    assert summary['hit_rate'] == 0.25
+    assert summary['reused_prefix_tokens'] == sec_b.prefix_tokens > 0
@@ -0,0 +1,85 @@
+"""
+Calibration benchmark for TokenEstimator against recorded token counts.
+
+Recordings are JSON lines with the real prompt token count reported by a
+provider for a piece of text, e.g. taken from a response's usage field:
+    {"provider": "anthropic", "model": "claude-sonnet", "tokens": 1834, "path": "src/main.py"}
+    {"provider": "openai", "model": "gpt-4o", "tokens": 512, "text": "def main(): ..."}
+    
+Run from the repository root:
+    python -m Source.utils.bench_token_estimator recordings.jsonl
+"""
+
+import argparse
+import json
+import time
+from collections import defaultdict
+from typing import Dict, Any, List, Tuple
+from .token_estimator import TokenEstimator
+
+def load_recordings(path: str) -> List[Dict[str, Any]]:
+    """Read recordings, resolving `path` entries to their file text."""
+    recordings = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if 'text' not in record:
+                with open(record['path'], 'r', encoding='utf-8', errors='replace') as source:
+                    record['text'] = source.read()
+            if not record.get('tokens'):
+                raise ValueError(f"Recording on line {line_number} has no token count")
+            recordings.append(record)
+    return recordings
+    
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+    
+def evaluate(records: List[Dict[str, Any]], estimator: TokenEstimator) -> Dict[str, Any]:
+    """Compare estimates with recorded counts and time cold and memoized counting."""
+    start = time.perf_counter()
+    estimates = [estimator.count(r['text']) for r in records]
+    cold_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for r in records:
+        estimator.count(r['text'])
+    warm_time = time.perf_counter() - start
+    
+    errors = [abs(estimate - r['tokens']) / r['tokens'] for estimate, r in zip(estimates, records)]
+    chars = sum(len(r['text']) for r in records)
+    tokens = sum(r['tokens'] for r in records)
+    return {
+        'samples': len(records),
+        'tokenizer': estimator.tokenizer.name,
+        'fitted_chars_per_token': chars / tokens,
+        'mean_error': sum(errors) / len(errors),
+        'p95_error': percentile(errors, 0.95),
+        'bias': sum(estimates) / tokens - 1,
+        'cold_time': cold_time,
+        'warm_time': warm_time
+    }
+    
+def main():
+    parser = argparse.ArgumentParser(description='Calibrate token estimates against recorded counts')
+    parser.add_argument('recordings', help='JSON lines file of recorded token counts')
+    args = parser.parse_args()
+    
+    groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = defaultdict(list)
+    for record in load_recordings(args.recordings):
+        groups[(record['provider'], record.get('model') or '')].append(record)
+        
+    for (provider, model), records in sorted(groups.items()):
+        result = evaluate(records, TokenEstimator(provider, model or None))
+        print(f"{provider} {model}".strip())
+        print(f"  Samples:          {result['samples']} ({result['tokenizer']})")
+        print(f"  Mean error:       {result['mean_error']:.1%} (p95 {result['p95_error']:.1%})")
+        print(f"  Bias:             {result['bias']:+.1%}")
+        print(f"  Fitted ratio:     {result['fitted_chars_per_token']:.2f} chars/token")
+        print(f"  Cold / memoized:  {result['cold_time'] * 1000:.1f}ms / {result['warm_time'] * 1000:.1f}ms")
+        
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,29 @@
+"""Content digests shared by the collector, caches and dedup stages."""
+
+import hashlib
+
+DIGEST_SIZE = 16
+
+def digest_bytes(data) -> str:
+    """
+    Compute the content digest of raw bytes.
+    
+    Args:
+        data: bytes or any buffer (e.g. an mmap)
+        
+    Returns:
+        str: Hex blake2b digest
+    """
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).hexdigest()
+
+def digest_text(text: str) -> str:
+    """
+    Compute the content digest of text, encoded as UTF-8.
+    
+    Args:
+        text: Text to hash
+        
+    Returns:
+        str: Hex blake2b digest
+    """
+    return digest_bytes(text.encode('utf-8'))
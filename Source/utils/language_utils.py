@@ -1,107 +1,276 @@
 """Utility functions for language detection and mapping."""
 
-LANGUAGE_MAP = {
+import re
+from functools import lru_cache
+from typing import Optional, Union
+
+DEFAULT_LANGUAGE = 'text'
+
+# File extension (lowercase, without the dot) -> language
+EXTENSIONS = {
     # Python
     'py': 'python',
-    '.py': 'python',
+    'pyi': 'python',
+    'pyw': 'python',
     
     # JavaScript/TypeScript
     'js': 'javascript',
-    '.js': 'javascript',
+    'mjs': 'javascript',
+    'cjs': 'javascript',
+    'jsx': 'javascript',
     'ts': 'typescript',
-    '.ts': 'typescript',
+    'mts': 'typescript',
+    'cts': 'typescript',
+    'tsx': 'typescript',
     
     # Java
     'java': 'java',
-    '.java': 'java',
     
     # C/C++
-    'cpp': 'cpp',
-    '.cpp': 'cpp',
     'c': 'c',
-    '.c': 'c',
+    'cpp': 'cpp',
+    'cc': 'cpp',
+    'cxx': 'cpp',
+    'hpp': 'cpp',
+    'hh': 'cpp',
+    'hxx': 'cpp',
     'h': 'cpp',
-    '.h': 'c',
     
     # C#
     'cs': 'csharp',
-    '.cs': 'csharp',
+    
+    # Objective-C
+    'm': 'objective-c',
+    'mm': 'objective-c',
     
     # Go
     'go': 'go',
-    '.go': 'go',
     
     # Rust
     'rs': 'rust',
-    '.rs': 'rust',
     
     # Ruby
     'rb': 'ruby',
-    '.rb': 'ruby',
+    'rake': 'ruby',
+    'gemspec': 'ruby',
     
     # PHP
     'php': 'php',
-    '.php': 'php',
     
     # Swift
     'swift': 'swift',
-    '.swift': 'swift',
     
     # Kotlin
     'kt': 'kotlin',
-    '.kt': 'kotlin',
+    'kts': 'kotlin',
     
     # Scala
     'scala': 'scala',
-    '.scala': 'scala',
+    
+    # Other languages
+    'dart': 'dart',
+    'lua': 'lua',
+    'pl': 'perl',
+    'pm': 'perl',
+    'r': 'r',
+    'groovy': 'groovy',
+    'gradle': 'groovy',
+    'sql': 'sql',
     
     # Shell
     'sh': 'shell',
-    '.sh': 'shell',
     'bash': 'shell',
-    '.bash': 'shell',
     'zsh': 'shell',
-    '.zsh': 'shell',
+    'ps1': 'powershell',
     
     # Web
     'html': 'html',
-    '.html': 'html',
+    'htm': 'html',
     'css': 'css',
-    '.css': 'css',
+    'scss': 'scss',
+    'vue': 'vue',
     
     # Data formats
     'json': 'json',
-    '.json': 'json',
     'yaml': 'yaml',
-    '.yaml': 'yaml',
     'yml': 'yaml',
-    '.yml': 'yaml',
+    'toml': 'toml',
+    'xml': 'xml',
+    'proto': 'protobuf',
     
     # Documentation
     'md': 'markdown',
-    '.md': 'markdown',
-    'txt': 'text',
-    '.txt': 'text'
+    'txt': 'text'
 }
 
-def get_language_from_extension(file_path: str) -> str:
+# Exact file names (lowercase) that identify a language without an extension
+FILENAMES = {
+    'dockerfile': 'dockerfile',
+    'containerfile': 'dockerfile',
+    'makefile': 'makefile',
+    'gnumakefile': 'makefile',
+    'cmakelists.txt': 'cmake',
+    'gemfile': 'ruby',
+    'rakefile': 'ruby',
+    'podfile': 'ruby',
+    'vagrantfile': 'ruby',
+    'jenkinsfile': 'groovy',
+    '.bashrc': 'shell',
+    '.bash_profile': 'shell',
+    '.zshrc': 'shell',
+    '.profile': 'shell'
+}
+
+# File name prefixes for variants such as Dockerfile.dev
+FILENAME_PREFIXES = (
+    ('dockerfile.', 'dockerfile'),
+    ('makefile.', 'makefile')
+)
+
+# Interpreter (without version suffix) named in a shebang -> language
+INTERPRETERS = {
+    'python': 'python',
+    'node': 'javascript',
+    'deno': 'typescript',
+    'ts-node': 'typescript',
+    'sh': 'shell',
+    'bash': 'shell',
+    'zsh': 'shell',
+    'dash': 'shell',
+    'ksh': 'shell',
+    'ruby': 'ruby',
+    'perl': 'perl',
+    'php': 'php',
+    'lua': 'lua',
+    'swift': 'swift',
+    'pwsh': 'powershell'
+}
+
+# Vim filetype / Emacs mode names that differ from our language names
+MODELINE_ALIASES = {
+    'sh': 'shell',
+    'bash': 'shell',
+    'zsh': 'shell',
+    'js': 'javascript',
+    'ts': 'typescript',
+    'c++': 'cpp',
+    'cs': 'csharp',
+    'objc': 'objective-c',
+    'make': 'makefile',
+    'yml': 'yaml',
+    'py': 'python',
+    'rb': 'ruby'
+}
+
+LANGUAGES = frozenset(EXTENSIONS.values()) | frozenset(FILENAMES.values()) | frozenset(INTERPRETERS.values())
+
+# Modelines are looked for in this many lines at the start of the file
+MODELINE_LINES = 5
+SNIFF_CHARS = 1024
+
+_SHEBANG = re.compile(r'^#!\s*(\S+)(.*)$')
+_VIM_MODELINE = re.compile(r'\b(?:vim?|ex):.*?\b(?:ft|filetype|syntax)=([\w+-]+)')
+_EMACS_MODELINE = re.compile(r'-\*-\s*(?:.*?mode:\s*)?([\w+-]+)\s*(?:;.*?)?-\*-', re.IGNORECASE)
+
+@lru_cache(maxsize=8192)
+def _language_for_name(name: str) -> Optional[str]:
+    """Look up a lowercase file name in the filename and extension indexes."""
+    language = FILENAMES.get(name)
+    if language is not None:
+        return language
+    for prefix, prefix_language in FILENAME_PREFIXES:
+        if name.startswith(prefix):
+            return prefix_language
+    base, dot, ext = name.rpartition('.')
+    if not dot or not base:
+        return None
+    return EXTENSIONS.get(ext)
+    
+def language_from_path(file_path: str) -> Optional[str]:
     """
-    Determine the programming language from a file path.
+    Detect a language from a file path alone.
+    
+    Only the file name matters, so results are memoized per name.
     
     Args:
         file_path: Path to the file
         
+    Returns:
+        str: The detected language, or None if the name is not recognised
+    """
+    name = file_path.rsplit('/', 1)[-1].rsplit('\\', 1)[-1]
+    return _language_for_name(name.lower())
+    
+def _normalize(name: str) -> Optional[str]:
+    """Map a Vim or Emacs modeline name to a known language."""
+    name = name.lower()
+    name = MODELINE_ALIASES.get(name, name)
+    return name if name in LANGUAGES else None
+    
+def language_from_content(head: Union[str, bytes]) -> Optional[str]:
+    """
+    Detect a language from the start of a file's content.
+    
+    Recognises shebang lines (``#!/usr/bin/env python3``) and Vim or Emacs
+    modelines in the first few lines.
+    
+    Args:
+        head: The first bytes or characters of the file; only the first
+            ``SNIFF_CHARS`` are inspected
+            
+    Returns:
+        str: The detected language, or None
+    """
+    if isinstance(head, (bytes, bytearray, memoryview)):
+        head = bytes(head[:SNIFF_CHARS]).decode('utf-8', errors='ignore')
+    else:
+        head = head[:SNIFF_CHARS]
+    lines = head.splitlines()[:MODELINE_LINES]
+    if not lines:
+        return None
+        
+    shebang = _SHEBANG.match(lines[0])
+    if shebang:
+        interpreter, args = shebang.group(1).rsplit('/', 1)[-1], shebang.group(2).split()
+        if interpreter == 'env':
+            args = [arg for arg in args if not arg.startswith('-') and '=' not in arg]
+            interpreter = args[0] if args else ''
+        language = INTERPRETERS.get(re.sub(r'[\d.]+$', '', interpreter))
+        if language is not None:
+            return language
+            
+    for line in lines:
+        match = _VIM_MODELINE.search(line) or _EMACS_MODELINE.search(line)
+        if match:
+            language = _normalize(match.group(1))
+            if language is not None:
+                return language
+    return None
+    
+def detect_language(file_path: str, head: Union[str, bytes, None] = None) -> str:
+    """
+    Detect the language of a file from its name and, if that fails, its content.
+    
+    Args:
+        file_path: Path to the file
+        head: The first bytes or characters of the file, if already loaded
+        
     Returns:
         str: The detected language or 'text' if unknown
     """
-    # Try with the full extension first
-    ext = file_path.split('.')[-1].lower()
-    if ext in LANGUAGE_MAP:
-        return LANGUAGE_MAP[ext]
+    language = language_from_path(file_path)
+    if language is None and head:
+        language = language_from_content(head)
+    return language or DEFAULT_LANGUAGE
     
-    # Try with dot prefix
-    dot_ext = f'.{ext}'
-    if dot_ext in LANGUAGE_MAP:
-        return LANGUAGE_MAP[dot_ext]
+def get_language_from_extension(file_path: str) -> str:
+    """
+    Determine the programming language from a file path.
     
-    return 'text' 
\ No newline at end of file
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        str: The detected language or 'text' if unknown
+    """
+    return language_from_path(file_path) or DEFAULT_LANGUAGE
\ No newline at end of file
@@ -1,5 +1,5 @@
 import pytest
-from ..language_utils import get_language_from_extension
+from ..language_utils import get_language_from_extension, detect_language, language_from_path, language_from_content, _language_for_name
 
 def test_get_language_from_extension():
     # Test various file extensions
@@ -25,4 +25,41 @@ def test_get_language_from_extension():
     # Test shell script variations
     assert get_language_from_extension('script.sh') == 'shell'
     assert get_language_from_extension('script.bash') == 'shell'
-    assert get_language_from_extension('script.zsh') == 'shell' 
\ No newline at end of file
+    assert get_language_from_extension('script.zsh') == 'shell'
+    
+def test_header_files_keep_cpp_mapping():
+    assert get_language_from_extension('include/util.h') == 'cpp'
+    assert get_language_from_extension('include/util.hpp') == 'cpp'
+    
+def test_dots_in_directory_names_are_ignored():
+    assert get_language_from_extension('build.v2/README') == 'text'
+    assert get_language_from_extension('pkg.d/main.go') == 'go'
+    
+def test_exact_filenames():
+    assert detect_language('Dockerfile') == 'dockerfile'
+    assert detect_language('deploy/Dockerfile.prod') == 'dockerfile'
+    assert detect_language('Makefile') == 'makefile'
+    assert detect_language('src/CMakeLists.txt') == 'cmake'
+    assert detect_language('Gemfile') == 'ruby'
+    assert detect_language('.bashrc') == 'shell'
+    assert detect_language('.gitignore') == 'text'
+    
+def test_shebang_detection():
+    assert detect_language('bin/tool', b'#!/usr/bin/env python3\nprint(1)\n') == 'python'
+    assert detect_language('bin/run', '#!/bin/bash\nset -e\n') == 'shell'
+    assert detect_language('bin/serve', '#!/usr/bin/env -S node --harmony\n') == 'javascript'
+    assert detect_language('bin/other', '#!/usr/bin/env unknown\n') == 'text'
+    
+def test_modeline_detection():
+    assert language_from_content('# vim: set ft=ruby :\n') == 'ruby'
+    assert language_from_content('/* -*- mode: c++ -*- */\n') == 'cpp'
+    assert language_from_content('# -*- coding: utf-8 -*-\n') is None
+    
+def test_extension_wins_over_content():
+    assert detect_language('script.rb', '#!/usr/bin/env python\n') == 'ruby'
+    
+def test_path_lookups_are_memoized():
+    language_from_path('a/b/memo_test.py')
+    before = _language_for_name.cache_info().hits
+    language_from_path('c/d/memo_test.py')
+    assert _language_for_name.cache_info().hits == before + 1
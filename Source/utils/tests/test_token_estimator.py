@@ -0,0 +1,85 @@
+import json
+import pytest
+from ...collector.models import FileContent
+from ...context.request_planner import RequestPlanner
+from ..token_estimator import TokenEstimator, RatioTokenizer, get_tokenizer, MIN_MEMO_LENGTH
+from ..bench_token_estimator import load_recordings, evaluate
+
+class CountingTokenizer:
+    """Whitespace tokenizer that records how often it was called."""
+    name = 'counting'
+    parallel = False
+    
+    def __init__(self):
+        self.calls = 0
+        
+    def count(self, text):
+        self.calls += 1
+        return len(text.split())
+        
+def test_ratio_tokenizer():
+    assert RatioTokenizer(4.0).count('x' * 10) == 3
+    assert RatioTokenizer(3.5).count('') == 0
+    with pytest.raises(ValueError):
+        RatioTokenizer(0)
+        
+def test_unknown_provider_falls_back_to_ratio():
+    assert get_tokenizer('somebody').count('x' * 8) == 2
+    
+def test_counts_memoized_by_content():
+    tokenizer = CountingTokenizer()
+    estimator = TokenEstimator(tokenizer=tokenizer)
+    text = 'word ' * MIN_MEMO_LENGTH
+    
+    assert estimator.count(text) == MIN_MEMO_LENGTH
+    assert estimator.count(text) == MIN_MEMO_LENGTH
+    assert tokenizer.calls == 1
+    assert estimator.stats() == {'hits': 1, 'misses': 1, 'entries': 1}
+    
+def test_short_strings_are_not_memoized():
+    estimator = TokenEstimator(tokenizer=CountingTokenizer())
+    estimator('a b c')
+    
+    assert estimator.stats()['entries'] == 0
+    
+def test_memo_is_bounded():
+    estimator = TokenEstimator(tokenizer=CountingTokenizer(), max_entries=2)
+    for i in range(5):
+        estimator.count(f"text {i}", digest=str(i))
+        
+    assert estimator.stats()['entries'] == 2
+    
+def test_count_files_reuses_digests():
+    tokenizer = CountingTokenizer()
+    estimator = TokenEstimator(tokenizer=tokenizer)
+    files = [FileContent(path=f"f{i}.py", content='a b ' * i, metadata={'digest': f"d{i}"}) for i in range(1, 6)]
+    
+    assert estimator.count_files(files) == {f"f{i}.py": 2 * i for i in range(1, 6)}
+    assert estimator.count_files(files, workers=1)['f3.py'] == 6
+    assert tokenizer.calls == 5
+    
+def test_planner_uses_estimator():
+    tokenizer = CountingTokenizer()
+    estimator = TokenEstimator(tokenizer=tokenizer)
+    files = [FileContent(path='a.py', content='one two three', metadata={'digest': 'abc'})]
+    
+    plan = RequestPlanner(token_budget=100, file_overhead=1, estimator=estimator).plan(files)
+    RequestPlanner(token_budget=100, file_overhead=1, estimator=estimator).plan(files)
+    
+    assert plan.requests[0].tokens == 4
+    assert tokenizer.calls == 1
+    
+def test_calibration_reports_error_and_ratio(tmp_path):
+    source = tmp_path / 'sample.py'
+    source.write_text('x' * 400)
+    recordings = tmp_path / 'recordings.jsonl'
+    recordings.write_text('\n'.join([
+        json.dumps({'provider': 'local', 'tokens': 100, 'path': str(source)}),
+        json.dumps({'provider': 'local', 'tokens': 50, 'text': 'y' * 200})
+    ]))
+    
+    result = evaluate(load_recordings(str(recordings)), TokenEstimator(tokenizer=RatioTokenizer(4.0)))
+    
+    assert result['samples'] == 2
+    assert result['fitted_chars_per_token'] == 4.0
+    assert result['mean_error'] == 0
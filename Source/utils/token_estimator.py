@@ -0,0 +1,199 @@
+"""
+Offline token estimation with per-content memoization.
+"""
+
+import math
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Iterable
+from .hashing import digest_text
+
+try:
+    import tiktoken
+except ImportError:  # optional: exact counts for OpenAI models
+    tiktoken = None
+    
+# Characters per token used when no exact tokenizer is available. These are
+# starting points; fit your own with `python -m Source.utils.bench_token_estimator`.
+DEFAULT_CHARS_PER_TOKEN = {
+    'openai': 4.0,
+    'anthropic': 3.5,
+    'google': 4.0,
+    'local': 3.5
+}
+FALLBACK_CHARS_PER_TOKEN = 4.0
+
+# Strings shorter than this are counted directly; hashing them costs about as much
+MIN_MEMO_LENGTH = 256
+
+class RatioTokenizer:
+    """Estimates tokens from a calibrated characters-per-token ratio."""
+    
+    parallel = False  # too cheap to be worth a thread pool
+    
+    def __init__(self, chars_per_token: float = FALLBACK_CHARS_PER_TOKEN):
+        if chars_per_token <= 0:
+            raise ValueError("chars_per_token must be positive")
+        self.chars_per_token = chars_per_token
+        self.name = f"ratio:{chars_per_token:g}"
+        
+    def count(self, text: str) -> int:
+        """Estimate the token count of text."""
+        return math.ceil(len(text) / self.chars_per_token)
+        
+class TiktokenTokenizer:
+    """Exact token counts from a tiktoken encoding."""
+    
+    parallel = True  # encoding releases the GIL
+    
+    def __init__(self, encoding_name: str = 'o200k_base'):
+        """
+        Args:
+            encoding_name: tiktoken encoding, e.g. "o200k_base" or "cl100k_base"
+            
+        Raises:
+            RuntimeError: If tiktoken is not installed
+        """
+        if tiktoken is None:
+            raise RuntimeError("tiktoken is not installed")
+        self._encoding = tiktoken.get_encoding(encoding_name)
+        self.name = f"tiktoken:{encoding_name}"
+        
+    def count(self, text: str) -> int:
+        """Count the tokens of text."""
+        return len(self._encoding.encode(text, disallowed_special=()))
+        
+def get_tokenizer(provider: str, model: Optional[str] = None):
+    """
+    Pick the best available offline tokenizer for a provider.
+    
+    OpenAI models use tiktoken when it is installed; everything else uses the
+    provider's characters-per-token ratio.
+    
+    Args:
+        provider: openai, anthropic, google or local
+        model: Provider-specific model name
+        
+    Returns:
+        Tokenizer with a ``count(text)`` method and a ``name``
+    """
+    if provider == 'openai' and tiktoken is not None:
+        legacy = model is not None and (model.startswith('gpt-4-') or model in ('gpt-4', 'gpt-3.5-turbo'))
+        return TiktokenTokenizer('cl100k_base' if legacy else 'o200k_base')
+    return RatioTokenizer(DEFAULT_CHARS_PER_TOKEN.get(provider, FALLBACK_CHARS_PER_TOKEN))
+    
+class TokenEstimator:
+    """
+    Counts tokens locally, memoized by content digest.
+    
+    Instances are callable, so they can be passed wherever an
+    ``estimator(text) -> int`` is expected (windowing, request planning).
+    """
+    
+    def __init__(self, provider: str = 'openai', model: Optional[str] = None,
+                 tokenizer=None, max_entries: int = 100000):
+        """
+        Initialize the estimator.
+        
+        Args:
+            provider: Provider whose tokenizer to use
+            model: Provider-specific model name
+            tokenizer: Explicit tokenizer, overriding provider/model
+            max_entries: Memoized counts kept (least recently used are dropped)
+        """
+        self.tokenizer = tokenizer or get_tokenizer(provider, model)
+        self.max_entries = max_entries
+        self._memo: 'OrderedDict[str, int]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        
+    def __call__(self, text: str) -> int:
+        return self.count(text)
+        
+    def count(self, text: str, digest: Optional[str] = None) -> int:
+        """
+        Count the tokens of text.
+        
+        Args:
+            text: Text to count
+            digest: Content digest of text if already known (e.g. from FileLoader)
+            
+        Returns:
+            Token count
+        """
+        if digest is None:
+            if len(text) < MIN_MEMO_LENGTH:
+                return self.tokenizer.count(text)
+            digest = digest_text(text)
+            
+        cached = self._lookup(digest)
+        if cached is not None:
+            return cached
+        tokens = self.tokenizer.count(text)
+        self._store(digest, tokens)
+        return tokens
+        
+    def count_file(self, file_content) -> int:
+        """Count the tokens of a FileContent, reusing its metadata digest."""
+        return self.count(file_content.content, file_content.metadata.get('digest'))
+        
+    def count_files(self, files: Iterable, workers: int = 4) -> Dict[str, int]:
+        """
+        Count tokens for many files at once.
+        
+        Memoized files are answered without tokenizing; the rest are
+        tokenized on a thread pool if the tokenizer benefits from one.
+        
+        Args:
+            files: FileContent objects
+            workers: Threads used for files that aren't memoized
+            
+        Returns:
+            Dict mapping each file path to its token count
+        """
+        counts: Dict[str, int] = {}
+        pending = []
+        for file_content in files:
+            digest = file_content.metadata.get('digest') or digest_text(file_content.content)
+            cached = self._lookup(digest)
+            if cached is not None:
+                counts[file_content.path] = cached
+            else:
+                pending.append((file_content, digest))
+                
+        if pending:
+            texts = [file_content.content for file_content, _ in pending]
+            if workers > 1 and len(pending) > 1 and self.tokenizer.parallel:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    results: List[int] = list(executor.map(self.tokenizer.count, texts))
+            else:
+                results = [self.tokenizer.count(text) for text in texts]
+            for (file_content, digest), tokens in zip(pending, results):
+                self._store(digest, tokens)
+                counts[file_content.path] = tokens
+        return counts
+        
+    def _lookup(self, digest: str) -> Optional[int]:
+        """Return a memoized count and mark it recently used."""
+        with self._lock:
+            tokens = self._memo.get(digest)
+            if tokens is None:
+                self.misses += 1
+                return None
+            self._memo.move_to_end(digest)
+            self.hits += 1
+            return tokens
+            
+    def _store(self, digest: str, tokens: int) -> None:
+        """Memoize a count, evicting the least recently used beyond max_entries."""
+        with self._lock:
+            self._memo[digest] = tokens
+            self._memo.move_to_end(digest)
+            while len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+                
+    def stats(self) -> Dict[str, int]:
+        """Return memo hit/miss counts and size."""
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._memo)}